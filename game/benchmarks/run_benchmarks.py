@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试
+在无头模式下用固定随机种子运行各压测场景，统计真实 update_game / render_game
+每步和每帧的耗时，结果写入JSON，便于不同版本之间对比。
+
+用法：python benchmarks/run_benchmarks.py [--ticks 300] [--seed 1234] [--enemy-store] [--output 文件] [场景名...]
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import platform
+import argparse
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from core.game_enhanced import Game, USE_ENEMY_STORE
+from utils.profiler import FrameProfiler
+from benchmarks.scenarios import SCENARIOS
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def summarize(stats):
+    """把 FrameProfiler.stats() 转成 {阶段名: 统计} 的字典（毫秒）"""
+    return {
+        name: {"samples": count, "mean": round(mean, 4), "p50": round(p50, 4),
+               "p95": round(p95, 4), "p99": round(p99, 4)}
+        for name, count, mean, p50, p95, p99 in stats
+    }
+
+
+def run_scenario(name, ticks=300, seed=1234, use_enemy_store=USE_ENEMY_STORE):
+    """运行一个场景，返回统计结果"""
+    scenario = SCENARIOS[name]
+    random.seed(seed)
+    game = Game(headless=True, use_enemy_store=use_enemy_store)
+    game.initialize_game()
+    game.game_state_mode = "playing"
+
+    started = time.perf_counter_ns()
+    scenario["setup"](game)
+    setup_ms = (time.perf_counter_ns() - started) / 1e6
+
+    # 复用帧分析器：既记录每步/每帧总耗时，也记录各子系统的耗时
+    game.profiler = FrameProfiler(enabled=True, window=ticks)
+    profiler = game.profiler
+    controller = scenario["controller"]
+    for tick in range(ticks):
+        controller(game, tick)
+        with profiler.section("tick"):
+            game.step()
+        with profiler.section("frame"):
+            game.render_game()
+
+    stages = summarize(profiler.stats())
+    return {
+        "description": scenario["description"],
+        "enemy_store": game.enemy_store is not None,
+        "ai_lod": dict(game.ai_scheduler.totals),
+        "setup_ms": round(setup_ms, 4),
+        "ticks": ticks,
+        "enemies": len(game.enemies),
+        "projectiles": len(game.player.projectiles),
+        "ms_per_tick": stages.pop("tick"),
+        "ms_per_frame": stages.pop("frame"),
+        "stages": stages,
+    }
+
+
+def run_benchmarks(names=None, ticks=300, seed=1234, use_enemy_store=USE_ENEMY_STORE):
+    """运行指定场景（默认全部），返回完整结果"""
+    results = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "seed": seed,
+        "scenarios": {},
+    }
+    for name in names or SCENARIOS:
+        result = run_scenario(name, ticks, seed, use_enemy_store)
+        results["scenarios"][name] = result
+        print(f"{name:<16} 每步 {result['ms_per_tick']['mean']:8.3f} ms (p95 {result['ms_per_tick']['p95']:8.3f})  "
+              f"每帧 {result['ms_per_frame']['mean']:8.3f} ms (p95 {result['ms_per_frame']['p95']:8.3f})  "
+              f"准备 {result['setup_ms']:9.1f} ms")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="无头性能基准测试")
+    parser.add_argument("scenarios", nargs="*", help="要运行的场景，默认全部：" + ", ".join(SCENARIOS))
+    parser.add_argument("--ticks", type=int, default=300, help="每个场景模拟的步数")
+    parser.add_argument("--seed", type=int, default=1234, help="随机种子")
+    parser.add_argument("--enemy-store", action="store_true", help="使用敌人列存储（NumPy向量化AI，不经过AI细节层次调度）")
+    parser.add_argument("--output", help="结果JSON路径，默认写到 benchmarks/results/ 下")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"未知场景: {', '.join(unknown)}")
+
+    results = run_benchmarks(args.scenarios, args.ticks, args.seed, True if args.enemy_store else USE_ENEMY_STORE)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, time.strftime("bench_%Y%m%d_%H%M%S.json"))
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
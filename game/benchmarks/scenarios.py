@@ -0,0 +1,99 @@
+import sys
+import os
+import random
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.enemy_spawner import EnemySpawner
+from systems.equipment import EquipmentSystem
+from systems.skill_system import SkillSystem
+
+
+def keep_player_alive(game):
+    """压测中玩家不会死亡，保证每个场景都跑满步数"""
+    game.player.hp = game.player.max_hp = 10 ** 9
+
+
+def replace_enemies(game, enemies):
+    """用新生成的敌人替换当前敌人"""
+    for enemy in game.enemies[:]:
+        game.remove_enemy(enemy)
+    game.add_enemies(enemies)
+
+
+def setup_enemies(count):
+    """生成count个敌人的场景"""
+    def setup(game):
+        keep_player_alive(game)
+        replace_enemies(game, EnemySpawner.spawn_enemies(
+            game.game_map, count=count, player_pos=(game.player.x, game.player.y), clock=game.sim_clock))
+    return setup
+
+
+def setup_fireball_spam(game):
+    """20个敌人，玩家每步向随机方向释放火球"""
+    setup_enemies(20)(game)
+
+
+def fireball_controller(game, tick):
+    """每步无视冷却和魔法值释放5个火球"""
+    keep_player_alive(game)
+    player = game.player
+    for _ in range(5):
+        player.mp = player.max_mp
+        SkillSystem.reset_cooldowns(player)
+        target = (random.randint(0, 800), random.randint(0, 576))
+        SkillSystem.cast_skill(player, "fireball", target)
+
+
+def setup_full_inventory(game):
+    """背包放满32格（30件装备和两种消耗品）并打开"""
+    keep_player_alive(game)
+    equipment_ids = list(EquipmentSystem.get_all_equipment())
+    game.player.inventory.load([f"装备_{equipment_ids[i % len(equipment_ids)]}" for i in range(30)])
+    game.player.inventory.add("血瓶", 5)
+    game.player.inventory.add("Gold", 5)
+    game.inventory_ui.is_open = True
+
+
+def setup_wave_50(game):
+    """清空敌人，第一步就会生成第50波"""
+    keep_player_alive(game)
+    replace_enemies(game, [])
+    game.game_state.wave_number = 49
+
+
+# 场景名 -> 说明、准备函数、每步控制函数
+SCENARIOS = {
+    "enemies_10": {
+        "description": "EnemySpawner生成10个敌人",
+        "setup": setup_enemies(10),
+        "controller": lambda game, tick: keep_player_alive(game),
+    },
+    "enemies_100": {
+        "description": "EnemySpawner生成100个敌人",
+        "setup": setup_enemies(100),
+        "controller": lambda game, tick: keep_player_alive(game),
+    },
+    "enemies_1000": {
+        "description": "EnemySpawner生成1000个敌人",
+        "setup": setup_enemies(1000),
+        "controller": lambda game, tick: keep_player_alive(game),
+    },
+    "fireball_spam": {
+        "description": "20个敌人，每步释放5个火球",
+        "setup": setup_fireball_spam,
+        "controller": fireball_controller,
+    },
+    "inventory_full": {
+        "description": "背包放满32格并打开",
+        "setup": setup_full_inventory,
+        "controller": lambda game, tick: keep_player_alive(game),
+    },
+    "wave_50": {
+        "description": "从第50波开始刷新敌人",
+        "setup": setup_wave_50,
+        "controller": lambda game, tick: keep_player_alive(game),
+    },
+}
@@ -38,7 +38,7 @@ class BattleSystem:
             enemy_damage = BattleSystem.calculate_damage(enemy.attack_power)
             
             # 计算玩家的有效防御力
-            player_defense = player.get_effective_defense() if hasattr(player, 'get_effective_defense') else 0
+            player_defense = player.get_effective_defense()
             final_damage = max(1, enemy_damage - player_defense)
             
             player.hp -= final_damage
@@ -0,0 +1,79 @@
+import pygame
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.timers import TimerHeap
+
+
+class GameClock:
+    """游戏时钟
+
+    冷却、增益、回复等所有计时都从这里读取时间。
+    实时模式以 pygame.time.get_ticks() 为基准，按时间倍率流逝；虚拟模式的时间只由
+    advance() 推进，无头模拟可以用它以远超实时的速度运行。两种模式都可以暂停，
+    暂停期间时间不流逝，冷却也不会在后台结束。
+    时钟持有一个计时器堆，冷却、增益等计时器到期时由 advance() 或 run_timers() 触发。
+    """
+
+    def __init__(self, virtual=False, time_scale=1.0):
+        self.virtual = virtual
+        self.paused = False
+        self._time_scale = time_scale
+        self._game_ms = 0.0  # 上次重定基准时的游戏时间
+        self._real_base = 0 if virtual else pygame.time.get_ticks()  # 对应的真实时间
+        self.timers = TimerHeap(self)
+
+    def _now(self):
+        """当前游戏时间（毫秒，浮点）"""
+        if self.virtual or self.paused:
+            return self._game_ms
+        return self._game_ms + (pygame.time.get_ticks() - self._real_base) * self._time_scale
+
+    def _rebase(self):
+        """把已流逝的时间结算到基准里，之后的时间按新设置计算"""
+        self._game_ms = self._now()
+        if not self.virtual:
+            self._real_base = pygame.time.get_ticks()
+
+    def get_ticks(self):
+        """当前游戏时间（毫秒）"""
+        return int(round(self._now()))
+
+    def advance(self, ms):
+        """让时间前进ms毫秒（乘以时间倍率）并触发到期的计时器，暂停时无效"""
+        if not self.paused:
+            self._game_ms += ms * self._time_scale
+            self.timers.run_due()
+
+    def run_timers(self):
+        """触发到期的计时器（实时模式下时间不经过 advance，由更新逻辑调用）"""
+        return self.timers.run_due()
+
+    def pause(self):
+        """暂停计时"""
+        if not self.paused:
+            self._rebase()
+            self.paused = True
+
+    def resume(self):
+        """继续计时"""
+        if self.paused:
+            self.paused = False
+            self._rebase()
+
+    @property
+    def time_scale(self):
+        """时间倍率"""
+        return self._time_scale
+
+    @time_scale.setter
+    def time_scale(self, value):
+        self._rebase()
+        self._time_scale = value
+
+
+# 未注入时钟的实体（独立测试脚本等）共用的实时时钟
+DEFAULT_CLOCK = GameClock()
@@ -6,34 +6,71 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.map import GameMap
+from utils.spatial_hash import SpatialHash
 from entities.player import Player
-from entities.enemy import Enemy
-from entities.item import Item
-from ui.hud import draw_hud, draw_game_info
+from entities.projectiles import OWNER_ENEMY
+from entities.enemy import Enemy, ENEMY_POOL
+from entities.item import Item, ITEM_POOL
+from utils.pool import swap_remove
+from ui.hud import HUD
 from core.battle import BattleSystem
 from core.game_state import GameState
+from core.timestep import FixedTimestep
+from core.clock import GameClock
+from core.input_source import KeyboardInput, ScriptedInput
+from utils.profiler import FrameProfiler
 from ui.font_manager import FontManager
 from systems.skill_system import SkillSystem
 from systems.equipment import EquipmentSystem, LootSystem
 from systems.save_system import SaveSystem, GameMenu
 from systems.inventory import InventoryUI
+from systems.ai_scheduler import AIScheduler
 from entities.enemy_spawner import EnemySpawner
+from entities.enemy_store import EnemyStore, np
 
 # 游戏配置
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60  # 渲染帧率上限，0为不限制
+SIMULATION_HZ = 60  # 模拟频率，所有移动速度都以每个模拟步计算
+PROFILE_CSV = "profile_stats.csv"  # 退出时导出的性能统计
+USE_ENEMY_STORE = False  # 敌人列存储（可选）：默认关闭，逐个更新敌人并使用AI细节层次调度；True启用（需要NumPy），None为安装了NumPy时启用
+AI_LOD_INTERVAL = 4  # 远处巡逻的敌人每隔几步完整更新一次AI，1为每步都更新
+AI_BUDGET_MS = None  # 每步远处敌人AI更新的时间预算（毫秒），None为不限
 
 class Game:
     """主游戏类"""
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("艾诺迪亚风格 RPG - 完整版")
+    def __init__(self, headless=False, use_enemy_store=USE_ENEMY_STORE):
+        self.headless = headless
+        if headless:
+            # 无头模式：不创建窗口、不扫描系统字体，画面绘制到离屏Surface上，
+            # 时间由虚拟时钟推进，输入由脚本提供
+            pygame.font.init()
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.font = pygame.font.Font(None, 20)
+            self.input = ScriptedInput()
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("艾诺迪亚风格 RPG - 完整版")
+            self.font = FontManager.get_chinese_font(20)
+            self.input = KeyboardInput()
+        # 模拟时钟只随模拟步前进：暂停或停在菜单时冷却不会在后台结束，
+        # 无头模式下则可以快进
+        self.sim_clock = GameClock(virtual=True)
         self.clock = pygame.time.Clock()
-        self.font = FontManager.get_chinese_font(20)
+        self.timestep = FixedTimestep(SIMULATION_HZ)
+        self.interpolate = False  # 是否在两个模拟步之间插值渲染位置
+        self.previous_positions = {}  # 上一个模拟步的位置，插值用
+        self.profiler = FrameProfiler()  # F3开关分段耗时叠加层
+        self.dirty_rendering = True  # 脏矩形渲染，False时每帧整屏重绘
+        self.needs_full_redraw = True  # 下一帧是否必须整屏重绘
+        self.entity_draws = []  # 上一帧绘制的 (实体, 绘制区域)
+        self._background = None  # 黑底加地图的背景层，脏矩形渲染时用来擦除
+        self._background_key = None
         self.game_state_mode = "menu"  # menu, playing, paused
         self.menu = GameMenu(self.screen, self.font)
+        self.hud = HUD(self.font)  # 保留模式HUD，控件只在数值变化时重绘
         
         # 游戏实体
         self.game_map = None
@@ -43,20 +80,41 @@ class Game:
         self.game_state = None
         self.inventory_ui = None
         
+        # 空间索引：敌人和地面物品按格子登记（投射物按所在点查询敌人索引）
+        self.enemy_index = SpatialHash()
+        self.item_index = SpatialHash()
+        
+        # 敌人列存储：AI距离和状态切换对所有敌人向量化计算
+        if use_enemy_store is None:
+            use_enemy_store = np is not None
+        self.enemy_store = EnemyStore() if use_enemy_store else None
+        # 逐个更新敌人时的AI细节层次调度（列存储一次更新所有敌人，不需要调度）
+        self.ai_scheduler = AIScheduler(interval=AI_LOD_INTERVAL, budget_ms=AI_BUDGET_MS)
+        
     def initialize_game(self, load_save=False):
         """初始化游戏"""
         self.game_map = GameMap()
-        self.player = Player(x=SCREEN_WIDTH//2, y=SCREEN_HEIGHT//2)
+        self.needs_full_redraw = True
+        self.sim_clock.timers.clear()  # 上一局的冷却和增益计时作废
+        self.player = Player(x=SCREEN_WIDTH//2, y=SCREEN_HEIGHT//2, clock=self.sim_clock)
+        self.player.input = self.input
+        
+        self.enemy_index.clear()
+        self.item_index.clear()
+        self.ai_scheduler.clear()
+        if self.enemy_store is not None:
+            self.enemy_store.clear()
         
         # 使用智能生成系统生成敌人
-        self.enemies = EnemySpawner.spawn_enemies(self.game_map, count=2, player_pos=(self.player.x, self.player.y))
+        self.enemies = []
+        self.add_enemies(EnemySpawner.spawn_enemies(self.game_map, count=2, player_pos=(self.player.x, self.player.y), clock=self.sim_clock))
         
         # 生成物品到安全位置
         self.items = []
         item_types = ["Gold", "血瓶", "Gold", "血瓶", "Gold"]
         for item_type in item_types:
             item = Item.create_safe_item(item_type, self.game_map, self.items)
-            self.items.append(item)
+            self.add_item(item)
         
         # 给玩家一些初始装备用于测试
         if not load_save:
@@ -68,7 +126,7 @@ class Game:
                 "血瓶"
             ])
         
-        self.game_state = GameState()
+        self.game_state = GameState(clock=self.sim_clock)
         
         # 创建背包界面
         self.inventory_ui = InventoryUI(self.screen, self.font)
@@ -80,29 +138,79 @@ class Game:
                 # 清理物品和敌人，重新生成
                 self.items.clear()
                 self.enemies.clear()
-                
+                self.item_index.clear()
+                self.enemy_index.clear()
+                self.ai_scheduler.clear()
+                if self.enemy_store is not None:
+                    self.enemy_store.clear()
+    
+    def add_enemies(self, enemies):
+        """加入敌人并登记到空间索引
+
+        启用列存储时换成存储中的视图，传入的敌人对象复制后归还对象池。
+        """
+        for enemy in enemies:
+            if self.enemy_store is not None:
+                template, enemy = enemy, self.enemy_store.add(enemy)
+                ENEMY_POOL.release(template)
+            enemy.list_index = len(self.enemies)
+            self.enemies.append(enemy)
+            self.enemy_index.insert(enemy, enemy.get_rect())
+    
+    def remove_enemy(self, enemy):
+        """O(1) 移除敌人及其空间索引，敌人对象回收复用，之后不能再使用"""
+        moved = swap_remove(self.enemies, enemy.list_index)
+        if moved is not None:
+            moved.list_index = enemy.list_index
+        self.enemy_index.remove(enemy)
+        self.ai_scheduler.forget(enemy)
+        if self.enemy_store is not None:
+            self.enemy_store.remove(enemy, recycle=True)
+        else:
+            ENEMY_POOL.release(enemy)
+    
+    def add_item(self, item):
+        """加入地面物品并登记到空间索引"""
+        item.list_index = len(self.items)
+        self.items.append(item)
+        self.item_index.insert(item, item.get_rect())
+    
+    def remove_item(self, item):
+        """O(1) 移除地面物品及其空间索引，物品对象回收复用"""
+        moved = swap_remove(self.items, item.list_index)
+        if moved is not None:
+            moved.list_index = item.list_index
+        self.item_index.remove(item)
+        ITEM_POOL.release(item)
+    
     def handle_menu_events(self):
         """处理菜单事件"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
             
             action = self.menu.handle_input(event)
             if action:
                 self.process_menu_action(action)
     
+    def quit(self):
+        """退出游戏，开启过性能分析时导出统计"""
+        self.profiler.dump_csv(PROFILE_CSV)
+        pygame.quit()
+        sys.exit()
+    
     def process_menu_action(self, action):
         """处理菜单操作"""
         if action == "start_new_game":
             self.initialize_game(load_save=False)
+            self.timestep.reset()
             self.game_state_mode = "playing"
         elif action == "continue_game":
             self.initialize_game(load_save=True)
+            self.timestep.reset()
             self.game_state_mode = "playing"
         elif action == "exit_game":
-            pygame.quit()
-            sys.exit()
+            self.quit()
         elif action == "resume_game":
             self.game_state_mode = "playing"
         elif action == "save_game":
@@ -120,8 +228,7 @@ class Game:
         """处理游戏事件"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     # ESC键暂停游戏
@@ -143,7 +250,7 @@ class Game:
                 # 技能快捷键
                 elif event.key == pygame.K_q:
                     # Q键 - 火球术
-                    mouse_pos = pygame.mouse.get_pos()
+                    mouse_pos = self.input.get_mouse_pos()
                     if SkillSystem.cast_skill(self.player, "fireball", mouse_pos):
                         self.game_state.add_battle_message("火球术！")
                 elif event.key == pygame.K_e:
@@ -154,6 +261,9 @@ class Game:
                     # R键 - 护盾术
                     if SkillSystem.cast_skill(self.player, "shield"):
                         self.game_state.add_battle_message("护盾术！")
+                # 性能分析叠加层
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle()
                 # 保存游戏
                 elif event.key == pygame.K_F5:
                     if SaveSystem.save_game(self.player, self.game_state):
@@ -168,7 +278,7 @@ class Game:
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1 and not self.inventory_ui.is_open:  # 左键点击且背包未打开
                     # 普通攻击
-                    mouse_pos = pygame.mouse.get_pos()
+                    mouse_pos = self.input.get_mouse_pos()
                     self.handle_player_attack(mouse_pos)
                 elif self.inventory_ui.is_open:
                     # 背包打开时处理背包鼠标事件
@@ -184,13 +294,12 @@ class Game:
 
     def update_game(self):
         """更新游戏状态"""
-        # 物品拾取检测
-        for item in self.items[:]:
-            if self.player.get_rect().colliderect(item.get_rect()):
-                result = self.player.pick_up(item)
-                if result and isinstance(result, str):
-                    self.game_state.add_battle_message(result)
-                self.items.remove(item)
+        # 物品拾取检测（只查询玩家所在格子附近的物品）
+        for item in self.item_index.query_rect(self.player.get_rect()):
+            result = self.player.pick_up(item)
+            if result and isinstance(result, str):
+                self.game_state.add_battle_message(result)
+            self.remove_item(item)
         
         # 更新玩家 - 传入game_map进行墙体碰撞检测
         self.player.update(self.game_map)
@@ -203,49 +312,87 @@ class Game:
         # 检查波次完成
         if self.game_state.check_wave_complete(self.enemies):
             new_enemies = self.game_state.spawn_new_wave(self.game_map, (self.player.x, self.player.y))
-            self.enemies.extend(new_enemies)
+            self.add_enemies(new_enemies)
             self.game_state.add_battle_message(f"第 {self.game_state.wave_number} 波开始！")
         
         # 更新游戏状态
         self.game_state.update_messages()
         
         # 战斗逻辑
-        self.handle_combat()
+        with self.profiler.section("handle_combat"):
+            self.handle_combat()
 
     def handle_combat(self):
         """处理战斗逻辑"""
-        # 处理玩家投射物与敌人的碰撞
-        for projectile in self.player.projectiles[:]:
-            for enemy in self.enemies:
-                if enemy.get_rect().collidepoint(projectile["x"], projectile["y"]):
-                    # 投射物击中敌人
-                    enemy.hp -= projectile["damage"]
-                    self.player.projectiles.remove(projectile)
-                    self.game_state.add_battle_message(f"火球术击中敌人，造成{projectile['damage']}点伤害！")
-                    
-                    if not enemy.is_alive():
-                        self.handle_enemy_death(enemy)
-                    break
+        # 处理投射物命中
+        if self.player.projectiles:
+            self.handle_projectile_hits()
         
         # 处理敌人AI更新和攻击
+        if self.enemy_store is not None:
+            self.update_enemies_from_store()
+            return
+        # 远处巡逻的敌人由LOD调度器隔几步更新一次，其余步外推移动
+        self.ai_scheduler.update(self.enemies, self.player, self.game_map)
         for enemy in self.enemies[:]:
-            enemy.update(self.player, self.game_map)  # 传入game_map进行墙体碰撞检测
+            self.enemy_index.update(enemy, enemy.get_rect())
             
             # 检查敌人是否可以攻击玩家（近距离攻击，不是碰撞攻击）
             distance = enemy.distance_to_player(self.player)
-            if distance <= 40 and enemy.can_attack():  # 近距离攻击
-                # 敌人攻击玩家
-                damage = enemy.attack_damage
-                self.player.hp -= damage
-                self.game_state.add_battle_message(f"敌人攻击你，造成{damage}点伤害！")
-                enemy.last_attack_time = pygame.time.get_ticks()
-                
-                # 检查玩家是否死亡
-                if not self.player.is_alive():
-                    self.game_state.add_battle_message("玩家被击败，游戏结束")
-                    self.game_state.state = "game_over"
-                    self.game_state_mode = "menu"
-                    self.menu.menu_state = "main"
+            self.enemy_try_attack(enemy, distance)
+
+    def handle_projectile_hits(self):
+        """玩家的投射物命中敌人，敌人的投射物命中玩家，命中的投射物一起移除"""
+        projectiles = self.player.projectiles
+        hit_rows = []
+        killed = set()  # 本步已被击杀的敌人，命中它们的其余投射物继续飞行
+        for enemy, row in projectiles.collide_enemies(self.enemy_index):
+            # 每个投射物只命中列表中第一个碰到的敌人
+            if enemy in killed or (hit_rows and hit_rows[-1] == row):
+                continue
+            enemy.hp -= projectiles.damage[row]
+            hit_rows.append(row)
+            self.game_state.add_battle_message(projectiles.hit_message(row))
+            
+            if not enemy.is_alive():
+                killed.add(enemy)
+                self.handle_enemy_death(enemy)
+        
+        for row in projectiles.collide_rect(self.player.get_rect(), OWNER_ENEMY):
+            hit_rows.append(row)
+            self.damage_player(projectiles.damage[row], f"敌人的投射物击中你，造成{projectiles.damage[row]}点伤害！")
+        projectiles.remove_rows(hit_rows)
+
+    def update_enemies_from_store(self):
+        """列存储版的敌人更新：距离、状态切换和移动对所有敌人一次完成"""
+        store = self.enemy_store
+        store.update(self.player, self.game_map)
+        for enemy in self.enemies:
+            self.enemy_index.update(enemy, enemy.get_rect())
+        
+        distances = store.distances_to(self.player.x, self.player.y)
+        for enemy in self.enemies[:]:
+            self.enemy_try_attack(enemy, distances[enemy._index])
+
+    def enemy_try_attack(self, enemy, distance):
+        """敌人在攻击距离内且冷却结束时攻击玩家"""
+        if distance <= 40 and enemy.can_attack():  # 近距离攻击
+            # 敌人攻击玩家
+            damage = enemy.attack_damage
+            enemy.last_attack_time = self.sim_clock.get_ticks()
+            self.damage_player(damage, f"敌人攻击你，造成{damage}点伤害！")
+
+    def damage_player(self, damage, message):
+        """玩家受到伤害，生命耗尽时游戏结束"""
+        self.player.hp -= damage
+        self.game_state.add_battle_message(message)
+        
+        # 检查玩家是否死亡
+        if not self.player.is_alive():
+            self.game_state.add_battle_message("玩家被击败，游戏结束")
+            self.game_state.state = "game_over"
+            self.game_state_mode = "menu"
+            self.menu.menu_state = "main"
 
     def handle_enemy_death(self, enemy):
         """处理敌人死亡"""
@@ -260,63 +407,191 @@ class Game:
                 self.game_state.add_battle_message(f"获得 {loot_item['name']}！")
             elif loot_item["type"] == "equipment":
                 # 创建装备物品
-                equipment_item = Item(name=f"装备_{loot_item['id']}", x=enemy.x, y=enemy.y)
-                equipment_item.equipment_id = loot_item["id"]
-                self.items.append(equipment_item)
+                equipment_item = ITEM_POOL.acquire(f"装备_{loot_item['id']}", enemy.x, enemy.y, equipment_id=loot_item["id"])
+                self.add_item(equipment_item)
                 self.game_state.add_battle_message("掉落装备！")
         
         self.game_state.add_battle_message("敌人被击败！")
         self.game_state.enemies_killed += 1
         self.player.gain_exp(enemy.exp_reward)
-        self.enemies.remove(enemy)
+        self.remove_enemy(enemy)
 
     def render(self):
         """渲染游戏画面"""
         if self.game_state_mode == "menu":
             self.menu.draw_main_menu()
+            self.needs_full_redraw = True
         elif self.game_state_mode == "paused":
             # 先绘制游戏画面
             self.render_game()
             # 再绘制暂停菜单
             self.menu.draw_pause_menu()
+            self.needs_full_redraw = True
         elif self.game_state_mode == "playing":
             self.render_game()
     
     def render_game(self):
-        """渲染游戏画面"""
-        self.screen.fill((0, 0, 0))
-        self.game_map.draw(self.screen)
-        
-        for item in self.items:
-            item.draw(self.screen)
-        
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
+        """渲染游戏画面
+
+        游戏进行中且画面上只有地图、实体和HUD时走脏矩形渲染；背包、性能叠加层或
+        暂停菜单覆盖全屏时整屏重绘。
+        """
+        map_changed = self._background_key != (id(self.game_map), self.game_map.version)
+        if (self.dirty_rendering and not self.needs_full_redraw and not map_changed and self.game_state_mode == "playing"
+                and not self.inventory_ui.is_open and not self.profiler.overlay_visible):
+            rects = self.render_game_dirty()
+            if not self.headless:
+                pygame.display.update(rects)
+            return
         
-        self.player.draw(self.screen)
-        draw_hud(self.screen, self.player, self.font)
-        draw_game_info(self.screen, self.game_state, self.font)
+        self.screen.blit(self.get_background(), (0, 0))
+        self.entity_draws = self.draw_entities()
+        with self.profiler.section("draw_hud"):
+            self.hud.draw(self.screen, self.player, self.game_state)
         
         # 绘制背包界面（如果打开）
-        self.inventory_ui.draw(self.player)
+        with self.profiler.section("inventory_ui"):
+            self.inventory_ui.draw(self.player)
         
-        # 只在游戏模式下调用display.flip()
-        if self.game_state_mode == "playing":
+        self.profiler.draw_overlay(self.screen, self.font)
+        # 整屏覆盖的界面关闭后，需要整屏重绘一次才能切回脏矩形渲染
+        self.needs_full_redraw = (self.inventory_ui.is_open or self.profiler.overlay_visible
+                                  or self.game_state_mode != "playing")
+        
+        # 只在游戏模式下调用display.flip()，无头模式没有窗口
+        if self.game_state_mode == "playing" and not self.headless:
             pygame.display.flip()
 
+    def draw_entities(self):
+        """按物品、敌人、玩家的顺序绘制实体，返回 (实体, 绘制区域) 列表"""
+        screen = self.screen
+        drawn = [(item, item.draw(screen)) for item in self.items]
+        drawn.extend((enemy, enemy.draw(screen)) for enemy in self.enemies)
+        drawn.extend((self.player, rect) for rect in self.player.draw(screen))
+        return drawn
+
+    def get_background(self):
+        """黑底加地图的整屏背景层，地图改变时重建"""
+        key = (id(self.game_map), self.game_map.version)
+        if self._background is None or self._background_key != key:
+            self._background = pygame.Surface(self.screen.get_size())
+            self._background.fill((0, 0, 0))
+            self.game_map.draw(self._background)
+            self._background_key = key
+        return self._background
+
+    def render_game_dirty(self):
+        """脏矩形渲染，返回需要提交到屏幕的矩形列表
+
+        只在上一帧实体所在的区域和变化的HUD控件下恢复背景，重画所有实体，
+        再重贴与改动区域重叠的HUD控件。结果与整屏重绘逐像素相同。
+        """
+        screen = self.screen
+        background = self.get_background()
+        
+        # 擦除上一帧的实体和变化控件的旧画面
+        widgets = self.hud.active_widgets(self.game_state)
+        changed = [widget for widget in widgets if widget.refresh(self.player, self.game_state, self.font)]
+        screen_rect = screen.get_rect()
+        dirty = [rect.clip(screen_rect) for _, rect in self.entity_draws]
+        dirty.extend(widget.rect for widget in changed if widget.rect)
+        for rect in dirty:
+            screen.blit(background, rect, rect)
+        
+        # 重画所有实体（不透明、可重复绘制）
+        self.entity_draws = self.draw_entities()
+        touched = dirty + [rect.clip(screen_rect) for _, rect in self.entity_draws]
+        
+        # 控件在最上层：与改动区域重叠的控件恢复其下的背景和实体后重贴，
+        # 避免半透明文字边缘重复叠加
+        for widget in widgets:
+            area = pygame.Rect(widget.pos, widget.surface.get_size()).clip(screen_rect)
+            if widget not in changed and area.collidelist(touched) < 0:
+                continue
+            screen.blit(background, area, area)
+            screen.set_clip(area)
+            drawn = set()
+            for entity, rect in self.entity_draws:
+                if id(entity) not in drawn and rect.colliderect(area):
+                    drawn.add(id(entity))
+                    entity.draw(screen)
+            screen.set_clip(None)
+            touched.append(widget.blit(screen))
+        return touched
+
     def run(self):
-        """运行游戏主循环"""
+        """运行游戏主循环：模拟按固定步长推进，渲染按机器能力进行"""
         while True:
+            frame_ms = self.clock.tick(FPS)
             if self.game_state_mode == "menu":
                 self.handle_menu_events()
             elif self.game_state_mode == "paused":
                 self.handle_menu_events()
             elif self.game_state_mode == "playing":
-                self.handle_game_events()
-                self.update_game()
+                with self.profiler.section("events"):
+                    self.handle_game_events()
+                for _ in range(self.timestep.advance(frame_ms)):
+                    if self.interpolate:
+                        self.record_positions()
+                    self.step()
+                    if self.game_state_mode != "playing":
+                        break
             
+            with self.profiler.section("render"):
+                if self.interpolate and self.game_state_mode != "menu":
+                    self.render_interpolated()
+                else:
+                    self.render()
+
+    def step(self):
+        """推进一个模拟步：先推进时钟，再更新游戏逻辑"""
+        self.sim_clock.advance(self.timestep.step_ms)
+        with self.profiler.section("update_game"):
+            self.update_game()
+
+    def run_headless(self, ticks, controller=None, render=False):
+        """无头运行指定步数，返回实际运行的步数
+
+        controller(game, tick) 在每一步之前调用，可以通过 game.input 按键，
+        或直接调用 cast_skill、handle_player_attack 等操作代替玩家输入。
+        玩家死亡时提前结束。
+        """
+        if self.player is None:
+            self.initialize_game()
+        self.game_state_mode = "playing"
+        for tick in range(ticks):
+            if controller:
+                controller(self, tick)
+            self.step()
+            if render:
+                self.render_game()
+            if self.game_state_mode != "playing":
+                return tick + 1
+        return ticks
+
+    def record_positions(self):
+        """记录玩家和敌人在本模拟步之前的位置"""
+        self.previous_positions = {id(self.player): (self.player.x, self.player.y)}
+        for enemy in self.enemies:
+            self.previous_positions[id(enemy)] = (enemy.x, enemy.y)
+
+    def render_interpolated(self):
+        """按插值后的位置渲染，渲染结束后恢复真实位置"""
+        alpha = self.timestep.alpha
+        moved = []
+        for entity in [self.player] + self.enemies:
+            previous = self.previous_positions.get(id(entity))
+            if previous is None:
+                continue
+            moved.append((entity, entity.x, entity.y))
+            entity.x = previous[0] + (entity.x - previous[0]) * alpha
+            entity.y = previous[1] + (entity.y - previous[1]) * alpha
+        try:
             self.render()
-            self.clock.tick(FPS)
+        finally:
+            for entity, x, y in moved:
+                entity.x = x
+                entity.y = y
 
     def handle_player_attack(self, mouse_pos):
         """处理玩家普通攻击"""
@@ -330,23 +605,21 @@ class Game:
             self.game_state.add_battle_message("目标太远了！")
             return
         
-        # 检查是否击中敌人
-        for enemy in self.enemies[:]:
-            enemy_rect = enemy.get_rect()
-            if enemy_rect.collidepoint(mouse_pos):
-                # 计算攻击伤害
-                base_damage = getattr(self.player, 'attack_power', 20)
-                equipment_bonus = getattr(self.player, 'attack', 0) - 20  # 装备加成
-                total_damage = base_damage + equipment_bonus
-                
-                # 攻击敌人
-                enemy.hp -= total_damage
-                self.game_state.add_battle_message(f"攻击敌人，造成{total_damage}点伤害！")
-                
-                # 检查敌人是否死亡
-                if not enemy.is_alive():
-                    self.handle_enemy_death(enemy)
-                return
+        # 检查是否击中敌人（只查询点击位置所在格子）
+        for enemy in self.enemy_index.query_point(mouse_pos[0], mouse_pos[1]):
+            # 计算攻击伤害
+            base_damage = self.player.attack_power
+            equipment_bonus = self.player.attack - 20  # 装备加成
+            total_damage = base_damage + equipment_bonus
+            
+            # 攻击敌人
+            enemy.hp -= total_damage
+            self.game_state.add_battle_message(f"攻击敌人，造成{total_damage}点伤害！")
+            
+            # 检查敌人是否死亡
+            if not enemy.is_alive():
+                self.handle_enemy_death(enemy)
+            return
         
         # 没有击中敌人
         self.game_state.add_battle_message("攻击落空！")
@@ -1,9 +1,17 @@
 import pygame
 import random
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.clock import DEFAULT_CLOCK
 
 class GameState:
     """游戏状态管理"""
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock or DEFAULT_CLOCK  # 游戏时钟，消息计时从这里读取时间
         self.state = "playing"  # playing, paused, game_over
         self.battle_messages = []
         self.message_timer = 0
@@ -13,14 +21,14 @@ class GameState:
     def add_battle_message(self, message):
         """添加战斗信息"""
         self.battle_messages.append(message)
-        self.message_timer = pygame.time.get_ticks()
+        self.message_timer = self.clock.get_ticks()
         # 限制消息数量，避免内存占用过多
         if len(self.battle_messages) > 10:
             self.battle_messages.pop(0)
         
     def update_messages(self):
         """更新消息显示"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time - self.message_timer > 3000:  # 3秒后清除消息
             self.battle_messages.clear()
             
@@ -51,17 +59,17 @@ class GameState:
             
             # 使用智能生成系统生成敌人
             new_enemies = []
-            avoid_positions = [player_pos] if player_pos else []
+            avoid_positions = EnemySpawner.build_avoid_index([player_pos] if player_pos else [])
             
             for enemy_type in enemy_types:
-                enemy = EnemySpawner.spawn_enemy(game_map, enemy_type, avoid_positions)
+                enemy = EnemySpawner.spawn_enemy(game_map, enemy_type, avoid_positions, self.clock)
                 new_enemies.append(enemy)
-                avoid_positions.append((enemy.x, enemy.y))
+                EnemySpawner.add_avoid_position(avoid_positions, (enemy.x, enemy.y))
             
             return new_enemies
         else:
             # 后备方案：使用旧的生成方式
-            from entities.enemy import Enemy
+            from entities.enemy import ENEMY_POOL
             new_enemies = []
             enemy_count = 2 + self.wave_number  # 每波增加敌人数量
             
@@ -77,6 +85,6 @@ class GameState:
                 else:
                     enemy_type = "basic"
                 
-                new_enemies.append(Enemy(x, y, enemy_type))
+                new_enemies.append(ENEMY_POOL.acquire(x, y, enemy_type, clock=self.clock))
                 
             return new_enemies
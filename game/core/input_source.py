@@ -0,0 +1,51 @@
+import pygame
+
+
+class KeyboardInput:
+    """读取真实键盘和鼠标的输入源"""
+
+    def get_pressed(self):
+        """当前按下的按键状态"""
+        return pygame.key.get_pressed()
+
+    def get_mouse_pos(self):
+        """当前鼠标位置"""
+        return pygame.mouse.get_pos()
+
+
+class ScriptedInput:
+    """由脚本或AI控制的输入源，用于无头模拟和自动化测试"""
+
+    def __init__(self):
+        self.held_keys = set()
+        self.mouse_pos = (0, 0)
+
+    def press(self, key):
+        """按住按键"""
+        self.held_keys.add(key)
+
+    def release(self, key):
+        """松开按键"""
+        self.held_keys.discard(key)
+
+    def release_all(self):
+        """松开所有按键"""
+        self.held_keys.clear()
+
+    def get_pressed(self):
+        """当前按下的按键状态，支持 keys[pygame.K_a] 形式的查询"""
+        return _KeyState(self.held_keys)
+
+    def get_mouse_pos(self):
+        """当前鼠标位置"""
+        return self.mouse_pos
+
+
+class _KeyState:
+    """与 pygame.key.get_pressed() 返回值用法相同的按键状态"""
+
+    def __init__(self, held_keys):
+        self.held_keys = held_keys
+
+    def __getitem__(self, key):
+        return key in self.held_keys
@@ -0,0 +1,77 @@
+import heapq
+
+
+class TimerHeap:
+    """按到期时间排列的计时器（最小堆）
+
+    每个计时器有一个键（如 (玩家, "skill", "fireball")），可以附带到期回调。
+    run_due() 只弹出已经到期的计时器，每帧的开销与到期的计时器数量相关，而不是与
+    实体数量相关；remaining() 通过键直接查询剩余时间。重新设置或取消计时器时堆里
+    的旧条目不立即删除，弹出时按序号识别并跳过。
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.heap = []  # (到期时间, 序号, 键)
+        self.timers = {}  # 键 -> (到期时间, 序号, 回调)
+        self.counter = 0  # 递增序号，区分同一个键的新旧条目
+        self.fired = 0  # 累计触发的计时器数
+
+    def __len__(self):
+        return len(self.timers)
+
+    def __contains__(self, key):
+        return key in self.timers
+
+    def schedule(self, key, delay_ms, callback=None):
+        """delay_ms 毫秒后到期，同一个键已有计时器时替换它"""
+        self.schedule_at(key, self.clock.get_ticks() + delay_ms, callback)
+
+    def schedule_at(self, key, expiry, callback=None):
+        """在游戏时间 expiry 到期"""
+        self.counter += 1
+        self.timers[key] = (expiry, self.counter, callback)
+        heapq.heappush(self.heap, (expiry, self.counter, key))
+        # 旧条目太多时重建堆
+        if len(self.heap) > 2 * len(self.timers) + 64:
+            self.heap = [(expiry, seq, key) for key, (expiry, seq, _) in self.timers.items()]
+            heapq.heapify(self.heap)
+
+    def cancel(self, key):
+        """取消计时器，返回是否存在"""
+        return self.timers.pop(key, None) is not None
+
+    def remaining(self, key):
+        """距离到期的毫秒数，没有计时器或已到期时为0"""
+        entry = self.timers.get(key)
+        if entry is None:
+            return 0
+        return max(0, entry[0] - self.clock.get_ticks())
+
+    def pending(self, key):
+        """计时器是否还未到期"""
+        return self.remaining(key) > 0
+
+    def run_due(self):
+        """触发所有已到期的计时器，返回触发的数量"""
+        heap = self.heap
+        if not heap:
+            return 0
+        now = self.clock.get_ticks()
+        fired = 0
+        while heap and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            entry = self.timers.get(key)
+            if entry is None or entry[1] != seq:
+                continue  # 已取消或被重新设置
+            del self.timers[key]
+            fired += 1
+            if entry[2] is not None:
+                entry[2]()
+        self.fired += fired
+        return fired
+
+    def clear(self):
+        """移除所有计时器"""
+        self.heap.clear()
+        self.timers.clear()
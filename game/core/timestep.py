@@ -0,0 +1,34 @@
+class FixedTimestep:
+    """固定步长模拟的时间累加器
+
+    每帧把真实经过的时间（乘以时间倍率）累加起来，按固定步长切出若干个模拟步，
+    剩余不足一步的部分留到下一帧，并作为渲染插值的比例。
+    """
+
+    def __init__(self, step_hz=60, max_steps=5, time_scale=1.0):
+        self.step_ms = 1000.0 / step_hz  # 每个模拟步的时长（毫秒）
+        self.max_steps = max_steps  # 每帧最多模拟的步数，防止卡顿后越追越慢
+        self.time_scale = time_scale  # 时间倍率，0为暂停，2为两倍速
+        self.accumulator = 0.0
+
+    def advance(self, frame_ms):
+        """累加一帧的时间，返回本帧需要执行的模拟步数"""
+        self.accumulator += frame_ms * self.time_scale
+        # 加一点容差，避免浮点误差让恰好一步的时间少算一步
+        steps = int((self.accumulator + 1e-6) // self.step_ms)
+        if steps > self.max_steps:
+            # 落后太多时丢弃多余的时间，而不是一直追赶
+            steps = self.max_steps
+            self.accumulator %= self.step_ms
+        else:
+            self.accumulator = max(0.0, self.accumulator - steps * self.step_ms)
+        return steps
+
+    @property
+    def alpha(self):
+        """当前时刻在两个模拟步之间的位置（0~1），用于插值渲染"""
+        return self.accumulator / self.step_ms
+
+    def reset(self):
+        """清空累加的时间"""
+        self.accumulator = 0.0
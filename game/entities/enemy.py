@@ -1,25 +1,54 @@
 import pygame
 import random
 import math
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.clock import DEFAULT_CLOCK
+from utils.pool import ObjectPool
+
+# 各类型敌人的攻击冷却（毫秒），未列出的类型使用 DEFAULT_ATTACK_COOLDOWN
+ATTACK_COOLDOWNS = {"basic": 1500, "elite": 1200, "boss": 1000}
+DEFAULT_ATTACK_COOLDOWN = 1500
+# 各类型敌人的碰撞箱尺寸 (宽, 高)，未列出的类型使用 DEFAULT_ENEMY_SIZE
+ENEMY_SIZES = {"boss": (35, 35)}
+DEFAULT_ENEMY_SIZE = (28, 28)
+# 巡逻范围：巡逻时离巡逻中心的横纵距离都小于该值
+PATROL_RADIUS = 80
 
 class Enemy:
     """敌人类，随机移动并可被玩家触发战斗"""
-    SPEED = 2
-    COLOR = (255, 0, 0)
 
-    def __init__(self, x, y, enemy_type="basic"):
+    __slots__ = (
+        "x", "y", "width", "height", "direction", "enemy_type", "last_attack_time", "ai_state",
+        "player_last_seen", "patrol_center", "path", "path_index", "path_goal", "sight_range",
+        "chase_range", "clock", "hp", "max_hp", "attack_power", "attack_damage", "exp_reward",
+        "level", "COLOR", "SPEED", "attack_cooldown", "list_index",
+    )
+
+    def __init__(self, x, y, enemy_type="basic", clock=None):
         self.x = x
         self.y = y
-        self.width = 28
-        self.height = 28
+        self.width, self.height = ENEMY_SIZES.get(enemy_type, DEFAULT_ENEMY_SIZE)
         self.direction = random.choice(['left', 'right', 'up', 'down'])
         self.enemy_type = enemy_type
         self.last_attack_time = 0  # 上次攻击时间，用于攻击冷却
         self.ai_state = "patrol"  # AI状态：patrol, chase, attack
         self.player_last_seen = None  # 玩家最后被看到的位置
         self.patrol_center = (x, y)  # 巡逻中心点
+        self.path = ()  # 返回巡逻中心的路点（格子）
+        self.path_index = 0  # 下一个路点在path中的位置
+        self.path_goal = None  # 当前路径的终点格子
         self.sight_range = 100  # 视野范围
         self.chase_range = 150  # 追击范围
+        self.clock = clock or DEFAULT_CLOCK  # 游戏时钟，攻击冷却从这里读取时间
+        self.COLOR = (255, 0, 0)  # 颜色，精英和Boss在下面改为更深的红色
+        self.SPEED = 2  # 移动速度
+        self.attack_cooldown = ATTACK_COOLDOWNS.get(enemy_type, DEFAULT_ATTACK_COOLDOWN)  # 攻击冷却（毫秒）
+        self.list_index = -1  # 在 Game.enemies 中的位置，交换删除用
         
         # 根据敌人类型设置属性
         self.setup_enemy_stats()
@@ -51,8 +80,6 @@ class Enemy:
             self.level = 3
             self.COLOR = (100, 0, 0)  # 暗红色
             self.SPEED = 2.5
-            self.width = 35
-            self.height = 35
 
     def is_alive(self):
         """判断敌人是否存活"""
@@ -76,9 +103,11 @@ class Enemy:
 
     def update_ai(self, player, game_map=None):
         """更新AI状态"""
-        distance = self.distance_to_player(player)
-        
-        # 状态转换逻辑
+        self.update_ai_state(player, self.distance_to_player(player))
+        self.perform_ai(player, game_map)
+
+    def update_ai_state(self, player, distance):
+        """根据到玩家的距离切换AI状态"""
         if distance <= self.sight_range:
             self.player_last_seen = (player.x, player.y)
             if distance <= 40:  # 攻击距离
@@ -90,8 +119,9 @@ class Enemy:
         else:
             self.ai_state = "patrol"
             self.player_last_seen = None
-        
-        # 执行AI行为
+
+    def perform_ai(self, player, game_map=None):
+        """执行当前AI状态对应的行为"""
         if self.ai_state == "patrol":
             self.patrol(game_map)
         elif self.ai_state == "chase":
@@ -138,8 +168,8 @@ class Enemy:
         
         # 在巡逻范围内且没有碰撞时移动
         if (can_move and 
-            abs(new_x - self.patrol_center[0]) < 80 and 
-            abs(new_y - self.patrol_center[1]) < 80):
+            abs(new_x - self.patrol_center[0]) < PATROL_RADIUS and 
+            abs(new_y - self.patrol_center[1]) < PATROL_RADIUS):
             self.x = new_x
             self.y = new_y
         else:
@@ -147,16 +177,54 @@ class Enemy:
             if random.random() < 0.3:  # 30%概率改变方向
                 self.direction = random.choice(['left', 'right', 'up', 'down'])
             else:
-                # 向巡逻中心移动
-                self.move_towards_target(self.patrol_center[0], self.patrol_center[1], game_map)
+                # 沿寻路结果返回巡逻中心
+                self.return_to_post(game_map)
         
         # 保持在屏幕范围内
         self.x = max(self.width//2, min(800 - self.width//2, self.x))
         self.y = max(self.height//2, min(600 - self.height//2, self.y))
 
+    def return_to_post(self, game_map=None):
+        """沿A*路径返回巡逻中心，路径来自寻路服务的缓存"""
+        target_x, target_y = self.patrol_center
+        if not game_map:
+            self.move_towards_target(target_x, target_y, game_map)
+            return
+        
+        pathfinder = game_map.pathfinder
+        current = pathfinder.cell_of(self.x, self.y)
+        goal = pathfinder.cell_of(target_x, target_y)
+        
+        # 到达当前路点后前进到下一个
+        if self.path_index < len(self.path) and current == self.path[self.path_index]:
+            self.path_index += 1
+        
+        # 终点改变、偏离路径或走完路径时重新获取路径
+        previous = self.path[self.path_index - 1] if self.path_index > 0 else None
+        on_path = self.path_index < len(self.path) and (
+            current == previous or abs(current[0] - self.path[self.path_index][0]) + abs(current[1] - self.path[self.path_index][1]) == 1)
+        if self.path_goal != goal or not on_path:
+            self.path = pathfinder.find_path(current, goal) or ()
+            self.path_index = 0
+            self.path_goal = goal
+        
+        if self.path_index < len(self.path):
+            target_x, target_y = pathfinder.cell_center(self.path[self.path_index])
+        self.move_towards_target(target_x, target_y, game_map)
+    
     def chase_player(self, player, game_map=None):
         """追击玩家"""
         target_x, target_y = self.player_last_seen if self.player_last_seen else (player.x, player.y)
+        
+        if game_map and self.distance_to_player(player) <= self.sight_range:
+            # 看得到玩家时沿共用流场走向玩家，玩家没换格子时不会重新计算；
+            # 看不到时仍走向玩家最后出现的位置
+            flow_field = game_map.flow_field
+            flow_field.update(player.x, player.y)
+            waypoint = flow_field.next_step(self.x, self.y)
+            if waypoint:
+                target_x, target_y = waypoint
+        
         self.move_towards_target(target_x, target_y, game_map)
     
     def move_towards_target(self, target_x, target_y, game_map=None):
@@ -172,7 +240,7 @@ class Enemy:
             dy /= distance
             
             # 计算移动步长
-            if hasattr(self, 'ai_state') and self.ai_state == "chase":
+            if self.ai_state == "chase":
                 speed = self.SPEED * 1.2  # 追击时稍快
             else:
                 speed = self.SPEED
@@ -182,15 +250,15 @@ class Enemy:
             new_y = self.y + dy * speed
             
             if game_map:
-                # 检查是否可以直接移动到目标位置
-                if game_map.can_move_to(new_x, new_y, self.width, self.height):
+                # 一次批量检测：直接移动、仅X轴移动、仅Y轴移动
+                can_move, can_move_x, can_move_y = game_map.can_move_to_many(
+                    (new_x, new_x, self.x), (new_y, self.y, new_y), self.width, self.height)
+                
+                if can_move:
                     self.x = new_x
                     self.y = new_y
                 else:
                     # 如果不能直接移动，尝试分别在X和Y轴上移动
-                    can_move_x = game_map.can_move_to(new_x, self.y, self.width, self.height)
-                    can_move_y = game_map.can_move_to(self.x, new_y, self.width, self.height)
-                    
                     if can_move_x and can_move_y:
                         # 优先选择移动距离更大的方向
                         if abs(dx) > abs(dy):
@@ -218,25 +286,22 @@ class Enemy:
         # 实际的攻击逻辑在主循环中处理
         pass
 
+    def time_since_attack(self):
+        """距上次攻击经过的时间（毫秒）"""
+        return self.clock.get_ticks() - self.last_attack_time
+
     def can_attack(self):
-        """检查是否可以攻击（攻击冷却）"""
-        current_time = pygame.time.get_ticks()
-        cooldown = 1500  # 基础冷却时间，增加到1.5秒
-        
-        # 根据敌人类型调整冷却时间
-        if self.enemy_type == "elite":
-            cooldown = 1200  # 精英1.2秒
-        elif self.enemy_type == "boss":
-            cooldown = 1000  # Boss1秒
-        
-        if current_time - self.last_attack_time > cooldown:
+        """检查是否可以攻击（攻击冷却），可以时记录本次攻击时间"""
+        current_time = self.clock.get_ticks()
+        if current_time - self.last_attack_time > self.attack_cooldown:
             self.last_attack_time = current_time
             return True
         return False
 
     def draw(self, surface):
+        """绘制敌人，返回绘制区域"""
         # 绘制敌人主体
-        pygame.draw.rect(
+        rect = pygame.draw.rect(
             surface,
             self.COLOR,
             pygame.Rect(self.x - self.width//2, self.y - self.height//2, self.width, self.height)
@@ -250,20 +315,14 @@ class Enemy:
             bar_y = self.y - self.height//2 - 8
             
             # 血条背景
-            pygame.draw.rect(surface, (100, 0, 0), (bar_x, bar_y, bar_width, bar_height))
+            rect.union_ip(pygame.draw.rect(surface, (100, 0, 0), (bar_x, bar_y, bar_width, bar_height)))
             # 血条
             hp_ratio = self.hp / self.max_hp
             pygame.draw.rect(surface, (255, 0, 0), (bar_x, bar_y, bar_width * hp_ratio, bar_height))
         
         # 绘制攻击冷却指示器
-        current_time = pygame.time.get_ticks()
-        cooldown = 1500  # 基础冷却时间
-        if self.enemy_type == "elite":
-            cooldown = 1200
-        elif self.enemy_type == "boss":
-            cooldown = 1000
-        
-        time_since_attack = current_time - self.last_attack_time
+        cooldown = self.attack_cooldown
+        time_since_attack = self.time_since_attack()
         if time_since_attack < cooldown:
             # 绘制冷却指示器
             cooldown_ratio = time_since_attack / cooldown
@@ -271,15 +330,16 @@ class Enemy:
             cooldown_bar_y = self.y - self.height//2 - 12
             
             # 冷却条背景
-            pygame.draw.rect(surface, (50, 50, 50), (self.x - self.width//2, cooldown_bar_y, self.width, 2))
+            rect.union_ip(pygame.draw.rect(surface, (50, 50, 50), (self.x - self.width//2, cooldown_bar_y, self.width, 2)))
             # 冷却条
             pygame.draw.rect(surface, (255, 255, 0), (self.x - self.width//2, cooldown_bar_y, cooldown_width, 2))
         
         # 绘制AI状态指示器（调试用）
         if self.ai_state == "chase":
-            pygame.draw.circle(surface, (255, 255, 0), (int(self.x), int(self.y - self.height//2 - 15)), 3)
+            rect.union_ip(pygame.draw.circle(surface, (255, 255, 0), (int(self.x), int(self.y - self.height//2 - 15)), 3))
         elif self.ai_state == "attack":
-            pygame.draw.circle(surface, (255, 0, 0), (int(self.x), int(self.y - self.height//2 - 15)), 3)
+            rect.union_ip(pygame.draw.circle(surface, (255, 0, 0), (int(self.x), int(self.y - self.height//2 - 15)), 3))
+        return rect
 
     def get_rect(self):
         return pygame.Rect(self.x - self.width//2, self.y - self.height//2, self.width, self.height)
@@ -292,11 +352,16 @@ class Enemy:
             (1, 1), (1, -1), (-1, 1), (-1, -1)  # 4个对角方向
         ]
         
-        for dx, dy in directions:
-            new_x = self.x + dx * self.SPEED
-            new_y = self.y + dy * self.SPEED
-            
-            if game_map.can_move_to(new_x, new_y, self.width, self.height):
+        xs = [self.x + dx * self.SPEED for dx, dy in directions]
+        ys = [self.y + dy * self.SPEED for dx, dy in directions]
+        
+        # 批量检测8个方向，选择第一个可走的方向
+        for new_x, new_y, can_move in zip(xs, ys, game_map.can_move_to_many(xs, ys, self.width, self.height)):
+            if can_move:
                 self.x = new_x
                 self.y = new_y
                 break
+
+
+# 敌人对象池：被击败的敌人回收后用于下一波
+ENEMY_POOL = ObjectPool(Enemy)
@@ -1,81 +1,78 @@
-import random
 import sys
 import os
 
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from entities.enemy import Enemy
+from entities.enemy import ENEMY_POOL, ENEMY_SIZES, DEFAULT_ENEMY_SIZE
+from utils.spatial_hash import SpatialHash
 
 class EnemySpawner:
     """敌人生成器"""
     
     @staticmethod
-    def find_valid_spawn_position(game_map, entity_width=28, entity_height=28, max_attempts=50):
-        """找到一个有效的生成位置（不在墙里）"""
-        for _ in range(max_attempts):
-            # 随机生成位置，避开地图边缘，确保有足够的空间
-            margin = max(entity_width, entity_height) // 2 + 5  # 额外留出5像素边距
-            x = random.randint(margin, 800 - margin)
-            y = random.randint(margin, 600 - margin)
-            
-            # 检查是否可以放置在这个位置
-            if game_map.can_move_to(x, y, entity_width, entity_height):
-                return x, y
-        
-        # 如果找不到有效位置，使用地图的安全位置查找功能
-        return game_map.find_safe_position(400, 300, entity_width, entity_height)
+    def find_valid_spawn_position(game_map, entity_width=28, entity_height=28):
+        """找到一个有效的生成位置（不在墙里），直接取自地图的可放置位置索引"""
+        return game_map.find_safe_position(entity_width, entity_height)
+    
+    @staticmethod
+    def build_avoid_index(positions):
+        """把避开位置列表登记到空间索引中"""
+        index = SpatialHash()
+        for pos in positions:
+            EnemySpawner.add_avoid_position(index, pos)
+        return index
     
     @staticmethod
-    def spawn_enemy(game_map, enemy_type="basic", avoid_positions=None):
-        """生成一个敌人，避开指定位置"""
+    def add_avoid_position(index, pos):
+        """登记一个避开位置"""
+        index.insert(pos, (int(pos[0]), int(pos[1]), 1, 1))
+    
+    @staticmethod
+    def spawn_enemy(game_map, enemy_type="basic", avoid_positions=None, clock=None):
+        """生成一个敌人，避开指定位置
+
+        avoid_positions 可以是坐标列表，也可以是 build_avoid_index 生成的空间索引。
+        """
         max_attempts = 100
         min_distance = 100  # 与避开位置的最小距离
         
-        # 创建一个临时敌人来获取正确的尺寸
-        temp_enemy = Enemy(0, 0, enemy_type)
-        enemy_width = temp_enemy.width
-        enemy_height = temp_enemy.height
+        if avoid_positions and not isinstance(avoid_positions, SpatialHash):
+            avoid_positions = EnemySpawner.build_avoid_index(avoid_positions)
+        
+        # 按类型查表得到尺寸，不需要创建临时敌人
+        enemy_width, enemy_height = ENEMY_SIZES.get(enemy_type, DEFAULT_ENEMY_SIZE)
         
         for _ in range(max_attempts):
             x, y = EnemySpawner.find_valid_spawn_position(game_map, enemy_width, enemy_height)
             
-            # 检查是否与避开位置太近
-            if avoid_positions:
-                too_close = False
-                for avoid_x, avoid_y in avoid_positions:
-                    distance = ((x - avoid_x) ** 2 + (y - avoid_y) ** 2) ** 0.5
-                    if distance < min_distance:
-                        too_close = True
-                        break
-                
-                if too_close:
-                    continue
+            # 检查是否与避开位置太近（只查询附近格子，找到一个就停止）
+            if avoid_positions and avoid_positions.any_within(x, y, min_distance):
+                continue
             
-            # 最终验证位置是否有效
-            if game_map.can_move_to(x, y, enemy_width, enemy_height):
-                return Enemy(x=x, y=y, enemy_type=enemy_type)
+            # 索引中的位置一定不在墙里，无需再次验证
+            return ENEMY_POOL.acquire(x, y, enemy_type, clock)
         
         # 如果实在找不到合适位置，使用地图的安全位置
-        safe_x, safe_y = game_map.find_safe_position(400, 300, enemy_width, enemy_height)
-        return Enemy(x=safe_x, y=safe_y, enemy_type=enemy_type)
+        safe_x, safe_y = game_map.find_safe_position(enemy_width, enemy_height)
+        return ENEMY_POOL.acquire(safe_x, safe_y, enemy_type, clock)
     
     @staticmethod
-    def spawn_enemies(game_map, count=2, player_pos=None):
+    def spawn_enemies(game_map, count=2, player_pos=None, clock=None):
         """生成多个敌人"""
         enemies = []
-        avoid_positions = [player_pos] if player_pos else []
+        avoid_positions = EnemySpawner.build_avoid_index([player_pos] if player_pos else [])
         
         for _ in range(count):
-            enemy = EnemySpawner.spawn_enemy(game_map, "basic", avoid_positions)
+            enemy = EnemySpawner.spawn_enemy(game_map, "basic", avoid_positions, clock)
             enemies.append(enemy)
             # 将新生成的敌人位置也加入避开列表
-            avoid_positions.append((enemy.x, enemy.y))
+            EnemySpawner.add_avoid_position(avoid_positions, (enemy.x, enemy.y))
         
         return enemies
     
     @staticmethod
-    def spawn_wave_enemies(game_map, wave_number, player_pos=None):
+    def spawn_wave_enemies(game_map, wave_number, player_pos=None, clock=None):
         """根据波次生成敌人"""
         # 根据波次决定敌人数量和类型
         if wave_number <= 2:
@@ -92,11 +89,11 @@ class EnemySpawner:
                 enemy_types = ["basic", "basic", "elite", "elite"]
         
         enemies = []
-        avoid_positions = [player_pos] if player_pos else []
+        avoid_positions = EnemySpawner.build_avoid_index([player_pos] if player_pos else [])
         
         for enemy_type in enemy_types:
-            enemy = EnemySpawner.spawn_enemy(game_map, enemy_type, avoid_positions)
+            enemy = EnemySpawner.spawn_enemy(game_map, enemy_type, avoid_positions, clock)
             enemies.append(enemy)
-            avoid_positions.append((enemy.x, enemy.y))
+            EnemySpawner.add_avoid_position(avoid_positions, (enemy.x, enemy.y))
         
         return enemies
@@ -0,0 +1,411 @@
+import sys
+import os
+import math
+import random
+from array import array
+
+import pygame
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.enemy import Enemy, PATROL_RADIUS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖，没有时逐个敌人计算
+    np = None
+
+
+AI_STATES = ("patrol", "chase", "attack")
+PATROL, CHASE, ATTACK = range(3)
+DIRECTIONS = ("left", "right", "up", "down")
+ATTACK_RANGE = 40  # 与 Enemy.update_ai_state 中的攻击距离一致
+
+
+def _number(value):
+    """列存储中的浮点数转回Python数值，整数值保持为int"""
+    return int(value) if value.is_integer() else value
+
+
+class EnemyStore:
+    """敌人列存储（结构体数组）
+
+    位置、血量、速度、AI状态、巡逻方向、玩家最后位置和攻击时间按列存放，
+    距离计算、AI状态切换以及追击和巡逻移动用NumPy对所有敌人一次完成。敌人对象是
+    EnemyView 视图，读写这些属性时直接访问列存储，其余代码照常使用。
+    列使用 array.array，逐个读取和Python列表一样快，向量化时用 np.frombuffer
+    零拷贝地当作NumPy数组。没有NumPy时逐个敌人调用原来的AI方法。
+    """
+
+    # 列名 -> (array类型码, NumPy类型)
+    COLUMNS = {
+        "x": ("d", "float64"),
+        "y": ("d", "float64"),
+        "hp": ("d", "float64"),
+        "speed": ("d", "float64"),
+        "state": ("b", "int8"),
+        "direction": ("b", "int8"),  # 巡逻方向，DIRECTIONS中的序号
+        "post_x": ("d", "float64"),  # 巡逻中心
+        "post_y": ("d", "float64"),
+        "last_attack": ("q", "int64"),
+        "sight_range": ("d", "float64"),
+        "chase_range": ("d", "float64"),
+        "seen": ("B", "uint8"),  # 是否记得玩家最后的位置
+        "seen_x": ("d", "float64"),
+        "seen_y": ("d", "float64"),
+        "half_width": ("d", "float64"),  # 碰撞箱半宽（width//2）
+        "half_height": ("d", "float64"),
+    }
+
+    def __init__(self, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ImportError("EnemyStore(use_numpy=True) 需要安装NumPy")
+        self.use_numpy = use_numpy
+        # 向量化巡逻使用的随机数，种子取自random，random.seed 后结果可复现
+        self.rng = np.random.default_rng(random.getrandbits(64)) if use_numpy else None
+        self.views = []  # 行号 -> 视图
+        self.free_views = []  # 回收的视图，add 时复用
+        for name, (typecode, _) in self.COLUMNS.items():
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        return len(self.views)
+
+    def column(self, name):
+        """以NumPy数组的形式访问一列（与列存储共享内存）
+
+        返回的数组只在一次计算内使用，持有期间不能增删敌人。
+        """
+        return np.frombuffer(getattr(self, name), dtype=self.COLUMNS[name][1])
+
+    def add(self, enemy):
+        """把敌人放入存储，返回代替它的视图"""
+        index = len(self.views)
+        for name in self.COLUMNS:
+            getattr(self, name).append(0)
+        self._write_row(index, enemy)
+
+        view = self.free_views.pop() if self.free_views else EnemyView.__new__(EnemyView)
+        view._store = self
+        view._index = index
+        for name in Enemy.__slots__:
+            if name not in EnemyView.COLUMN_ATTRS:
+                setattr(view, name, getattr(enemy, name))
+        self.views.append(view)
+        return view
+
+    def _write_row(self, index, enemy):
+        """把敌人的列属性写入第index行"""
+        self.x[index] = enemy.x
+        self.y[index] = enemy.y
+        self.hp[index] = enemy.hp
+        self.speed[index] = enemy.SPEED
+        self.state[index] = AI_STATES.index(enemy.ai_state)
+        self.direction[index] = DIRECTIONS.index(enemy.direction)
+        self.post_x[index], self.post_y[index] = enemy.patrol_center
+        self.last_attack[index] = enemy.last_attack_time
+        self.sight_range[index] = enemy.sight_range
+        self.chase_range[index] = enemy.chase_range
+        last_seen = enemy.player_last_seen
+        self.seen[index] = last_seen is not None
+        self.seen_x[index], self.seen_y[index] = last_seen if last_seen is not None else (0, 0)
+        self.half_width[index] = enemy.width // 2
+        self.half_height[index] = enemy.height // 2
+
+    def remove(self, view, recycle=False):
+        """移除视图（用最后一行填补空位）
+
+        默认移除后的视图改为由只含它一行的存储承载，仍可正常读写属性；
+        recycle=True 时视图留待 add 复用，调用方之后不能再使用它。
+        """
+        index = view._index
+        detached = None if recycle else EnemyStore(use_numpy=False)
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            if detached is not None:
+                getattr(detached, name).append(column[index])
+            column[index] = column[-1]
+            column.pop()
+
+        moved = self.views.pop()
+        if moved is not view:
+            self.views[index] = moved
+            moved._index = index
+
+        if detached is None:
+            self.free_views.append(view)
+            return
+        detached.views.append(view)
+        view._store = detached
+        view._index = 0
+
+    def clear(self):
+        """移除所有视图"""
+        for view in self.views[::-1]:
+            self.remove(view)
+
+    def distances_to(self, x, y):
+        """所有敌人到 (x, y) 的距离，按行号排列"""
+        if self.use_numpy:
+            dx = self.column("x") - x
+            dy = self.column("y") - y
+            return np.sqrt(dx * dx + dy * dy)
+        return [math.sqrt((ex - x) ** 2 + (ey - y) ** 2) for ex, ey in zip(self.x, self.y)]
+
+    def update(self, player, game_map):
+        """更新所有敌人的AI：状态切换后执行各状态的移动"""
+        self.update_states(player)
+        if not self.use_numpy:
+            for view in self.views[:]:
+                if view.is_alive():
+                    view.perform_ai(player, game_map)
+                else:
+                    view.patrol(game_map)
+            return
+        self.move_chasers(player, game_map)
+        self.move_patrollers(game_map)
+
+    def update_states(self, player):
+        """一次完成所有存活敌人的AI状态切换，规则与 Enemy.update_ai_state 相同
+
+        与 Enemy.update 一样，已死亡的敌人保持原来的状态。
+        """
+        px, py = player.x, player.y
+        distances = self.distances_to(px, py)
+        if not self.use_numpy:
+            for view, distance in zip(self.views, distances):
+                if view.is_alive():
+                    view.update_ai_state(player, distance)
+            return
+
+        alive = self.column("hp") > 0
+        in_sight = alive & (distances <= self.column("sight_range"))
+        seen = self.column("seen")
+        keep_chasing = alive & ~in_sight & (distances <= self.column("chase_range")) & (seen != 0)
+
+        state = self.column("state")
+        state[alive] = PATROL
+        state[keep_chasing] = CHASE
+        state[in_sight] = np.where(distances[in_sight] <= ATTACK_RANGE, ATTACK, CHASE)
+
+        self.column("seen_x")[in_sight] = px
+        self.column("seen_y")[in_sight] = py
+        seen[alive] = (in_sight | keep_chasing)[alive]
+
+    def move_chasers(self, player, game_map):
+        """向量化执行所有追击状态敌人的移动，结果与逐个调用 Enemy.chase_player 相同
+
+        四个方向都走不通的敌人仍逐个调用 try_avoid_wall。
+        """
+        chasing = np.flatnonzero((self.column("state") == CHASE) & (self.column("hp") > 0))
+        if chasing.size == 0:
+            return
+
+        tile = game_map.TILE_SIZE
+        map_width, map_height = game_map.WIDTH, game_map.HEIGHT
+        all_x = self.column("x")
+        all_y = self.column("y")
+        x = all_x[chasing]
+        y = all_y[chasing]
+        half_w = self.column("half_width")[chasing]
+        half_h = self.column("half_height")[chasing]
+
+        # 目标：看得到玩家的敌人走流场给出的下一格中心，看不到玩家或没有路点时
+        # 走向玩家最后出现的位置
+        target_x = self.column("seen_x")[chasing]
+        target_y = self.column("seen_y")[chasing]
+        px, py = player.x, player.y
+        in_sight = np.sqrt((x - px) ** 2 + (y - py) ** 2) <= self.column("sight_range")[chasing]
+        if in_sight.any():
+            flow_field = game_map.flow_field
+            flow_field.update(px, py)
+            if flow_field.next_cell:
+                grid_x = (x // tile).astype(np.intp)
+                grid_y = (y // tile).astype(np.intp)
+                inside = (grid_x >= 0) & (grid_x < map_width) & (grid_y >= 0) & (grid_y < map_height)
+                next_cell = np.asarray(flow_field.next_cell)[np.where(inside, grid_y * map_width + grid_x, 0)]
+                has_step = in_sight & inside & (next_cell >= 0)
+                target_x[has_step] = (next_cell[has_step] % map_width) * tile + tile // 2
+                target_y[has_step] = (next_cell[has_step] // map_width) * tile + tile // 2
+
+        dx = target_x - x
+        dy = target_y - y
+        distance = np.sqrt(dx * dx + dy * dy)
+        moving = distance > 0
+        safe_distance = np.where(moving, distance, 1.0)
+        dx = dx / safe_distance
+        dy = dy / safe_distance
+        speed = self.column("speed")[chasing] * 1.2  # 追击时稍快
+        new_x = np.where(moving, x + dx * speed, x)
+        new_y = np.where(moving, y + dy * speed, y)
+
+        # 直接移动、仅X轴移动、仅Y轴移动，与 move_towards_target 的选择顺序相同
+        can_move = self._can_move(game_map, new_x, new_y, half_w, half_h)
+        can_move_x = self._can_move(game_map, new_x, y, half_w, half_h)
+        can_move_y = self._can_move(game_map, x, new_y, half_w, half_h)
+        blocked = moving & ~can_move
+        prefer_x = np.abs(dx) > np.abs(dy)
+        take_x = (moving & can_move) | (blocked & can_move_x & (prefer_x | ~can_move_y))
+        take_y = (moving & can_move) | (blocked & can_move_y & (~prefer_x | ~can_move_x))
+        all_x[chasing] = np.where(take_x, new_x, x)
+        all_y[chasing] = np.where(take_y, new_y, y)
+
+        for index in chasing[blocked & ~can_move_x & ~can_move_y]:
+            self.views[index].try_avoid_wall(game_map)
+
+        self._clamp_to_screen(chasing)
+
+    def move_patrollers(self, game_map):
+        """向量化执行所有巡逻状态敌人的移动，规则与 Enemy.patrol 相同
+
+        随机数来自 self.rng。走出巡逻范围或撞墙时，30%换方向，其余敌人逐个调用
+        return_to_post 沿缓存的A*路径返回。
+        """
+        patrolling = np.flatnonzero((self.column("state") == PATROL) & (self.column("hp") > 0))
+        if patrolling.size == 0:
+            return
+
+        rng = self.rng
+        direction = self.column("direction")
+        turn = rng.random(patrolling.size) < 0.02
+        direction[patrolling[turn]] = rng.integers(0, 4, np.count_nonzero(turn))
+
+        all_x = self.column("x")
+        all_y = self.column("y")
+        x = all_x[patrolling]
+        y = all_y[patrolling]
+        heading = direction[patrolling]
+        speed = self.column("speed")[patrolling]
+        # DIRECTIONS 顺序：左、右、上、下
+        new_x = x + np.array([-1.0, 1.0, 0.0, 0.0])[heading] * speed
+        new_y = y + np.array([0.0, 0.0, -1.0, 1.0])[heading] * speed
+
+        can_move = (self._can_move(game_map, new_x, new_y,
+                                   self.column("half_width")[patrolling], self.column("half_height")[patrolling])
+                    & (np.abs(new_x - self.column("post_x")[patrolling]) < PATROL_RADIUS)
+                    & (np.abs(new_y - self.column("post_y")[patrolling]) < PATROL_RADIUS))
+        all_x[patrolling[can_move]] = new_x[can_move]
+        all_y[patrolling[can_move]] = new_y[can_move]
+
+        stuck = patrolling[~can_move]
+        turn = rng.random(stuck.size) < 0.3
+        direction[stuck[turn]] = rng.integers(0, 4, np.count_nonzero(turn))
+        for index in stuck[~turn]:
+            self.views[index].return_to_post(game_map)
+
+        self._clamp_to_screen(patrolling)
+
+    def _clamp_to_screen(self, rows):
+        """把指定行的敌人限制在屏幕范围内"""
+        half_w = self.column("half_width")[rows]
+        half_h = self.column("half_height")[rows]
+        all_x = self.column("x")
+        all_y = self.column("y")
+        all_x[rows] = np.maximum(half_w, np.minimum(800 - half_w, all_x[rows]))
+        all_y[rows] = np.maximum(half_h, np.minimum(600 - half_h, all_y[rows]))
+
+    @staticmethod
+    def _can_move(game_map, xs, ys, half_w, half_h):
+        """向量化的 GameMap.can_move_to：检查碰撞箱四个角所在的格子"""
+        tile = game_map.TILE_SIZE
+        map_width, map_height = game_map.WIDTH, game_map.HEIGHT
+        left = ((xs - half_w) // tile).astype(np.intp)
+        right = ((xs + half_w) // tile).astype(np.intp)
+        top = ((ys - half_h) // tile).astype(np.intp)
+        bottom = ((ys + half_h) // tile).astype(np.intp)
+        inside = (left >= 0) & (top >= 0) & (right < map_width) & (bottom < map_height)
+
+        walls = np.frombuffer(game_map.walls, dtype=np.uint8)
+        left = np.clip(left, 0, map_width - 1)
+        right = np.clip(right, 0, map_width - 1)
+        top_row = np.clip(top, 0, map_height - 1) * map_width
+        bottom_row = np.clip(bottom, 0, map_height - 1) * map_width
+        blocked = walls[top_row + left] | walls[top_row + right] | walls[bottom_row + left] | walls[bottom_row + right]
+        return inside & (blocked == 0)
+
+
+def _column_property(column, convert=None):
+    """把属性映射到列存储中本行的值"""
+    if convert is None:
+        def getter(self):
+            return getattr(self._store, column)[self._index]
+    else:
+        def getter(self):
+            return convert(getattr(self._store, column)[self._index])
+
+    def setter(self, value):
+        getattr(self._store, column)[self._index] = value
+
+    return property(getter, setter)
+
+
+class EnemyView(Enemy):
+    """EnemyStore中的敌人
+
+    列属性（位置、血量、速度、AI状态、巡逻方向和中心、玩家最后位置、攻击时间、视野）
+    读写列存储，其余属性和所有方法与 Enemy 相同。
+    """
+    __slots__ = ("_store", "_index")
+
+    COLUMN_ATTRS = ("x", "y", "hp", "SPEED", "ai_state", "direction", "patrol_center", "last_attack_time",
+                    "sight_range", "chase_range", "player_last_seen")
+
+    x = _column_property("x")
+    y = _column_property("y")
+    hp = _column_property("hp", _number)
+    SPEED = _column_property("speed", _number)
+    last_attack_time = _column_property("last_attack")
+    sight_range = _column_property("sight_range", _number)
+    chase_range = _column_property("chase_range", _number)
+
+    @property
+    def ai_state(self):
+        return AI_STATES[self._store.state[self._index]]
+
+    @ai_state.setter
+    def ai_state(self, value):
+        self._store.state[self._index] = AI_STATES.index(value)
+
+    @property
+    def direction(self):
+        return DIRECTIONS[self._store.direction[self._index]]
+
+    @direction.setter
+    def direction(self, value):
+        self._store.direction[self._index] = DIRECTIONS.index(value)
+
+    @property
+    def patrol_center(self):
+        store, index = self._store, self._index
+        return _number(store.post_x[index]), _number(store.post_y[index])
+
+    @patrol_center.setter
+    def patrol_center(self, value):
+        store, index = self._store, self._index
+        store.post_x[index], store.post_y[index] = value
+
+    @property
+    def player_last_seen(self):
+        store, index = self._store, self._index
+        if not store.seen[index]:
+            return None
+        return store.seen_x[index], store.seen_y[index]
+
+    @player_last_seen.setter
+    def player_last_seen(self, value):
+        store, index = self._store, self._index
+        store.seen[index] = value is not None
+        if value is not None:
+            store.seen_x[index], store.seen_y[index] = value
+
+    def get_rect(self):
+        store, index = self._store, self._index
+        return pygame.Rect(store.x[index] - self.width//2, store.y[index] - self.height//2, self.width, self.height)
+
+    def distance_to_player(self, player):
+        """计算到玩家的距离"""
+        store, index = self._store, self._index
+        return math.sqrt((store.x[index] - player.x)**2 + (store.y[index] - player.y)**2)
@@ -0,0 +1,172 @@
+EQUIPMENT_PREFIX = "装备_"
+MAX_SLOTS = 20  # 背包最大显示槽位数（拾取时检查）
+
+
+def is_stackable(name):
+    """装备每件占一个槽位，其余物品（消耗品等）叠加在一个槽位"""
+    return not name.startswith(EQUIPMENT_PREFIX)
+
+
+class Inventory:
+    """背包容器
+
+    叠加物品在 counts 中记数量，槽位按加入顺序保存在 slots（字典，保持插入顺序）中：
+    叠加物品以物品名为键，每件装备以递增序号为键。数量查询、加入、移除和容量检查
+    都是 O(1)。每次修改 version 加一，界面据此判断显示列表是否需要重新计算。
+
+    为兼容原来的字符串列表，背包仍支持 len、in、迭代、下标、append、remove 和 pop，
+    对应的"旧列表"按槽位顺序展开（叠加物品连续重复数量次），存档使用 to_list()。
+    """
+
+    __slots__ = ("counts", "slots", "equipment", "size", "version", "next_key", "_view", "_view_version")
+
+    def __init__(self, items=()):
+        self.counts = {}  # 物品名 -> 数量（装备按名称合计）
+        self.slots = {}  # 槽位键 -> 物品名，按加入顺序
+        self.equipment = {}  # 装备名 -> {槽位键: None}，按加入顺序
+        self.size = 0  # 物品总数
+        self.version = 0
+        self.next_key = 0
+        self._view = None  # 旧列表视图缓存：(物品名列表, 槽位键列表)
+        self._view_version = -1
+        for name in items:
+            self.add(name)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, name):
+        return name in self.counts
+
+    def __iter__(self):
+        return iter(self._legacy_view()[0])
+
+    def __getitem__(self, index):
+        return self._legacy_view()[0][index]
+
+    def __repr__(self):
+        return f"Inventory({self.to_list()!r})"
+
+    def count(self, name):
+        """物品数量"""
+        return self.counts.get(name, 0)
+
+    def slot_count(self):
+        """占用的槽位数"""
+        return len(self.slots)
+
+    def has_room(self, name, capacity=MAX_SLOTS):
+        """能否再放入一个物品：已有的叠加物品不占新槽位"""
+        return (is_stackable(name) and name in self.counts) or len(self.slots) < capacity
+
+    def add(self, name, count=1):
+        """加入物品"""
+        if count <= 0:
+            return
+        if is_stackable(name):
+            if name not in self.counts:
+                self.slots[name] = name
+        else:
+            instances = self.equipment.setdefault(name, {})
+            for _ in range(count):
+                key = self.next_key
+                self.next_key += 1
+                self.slots[key] = name
+                instances[key] = None
+        self.counts[name] = self.counts.get(name, 0) + count
+        self.size += count
+        self.version += 1
+
+    append = add
+
+    def extend(self, names):
+        """依次加入多个物品"""
+        for name in names:
+            self.add(name)
+
+    def remove(self, name):
+        """移除一个物品（装备移除最早加入的一件），没有时抛出 ValueError"""
+        if name not in self.counts:
+            raise ValueError(f"背包中没有 {name}")
+        if is_stackable(name):
+            self._remove_slot(name)
+        else:
+            self._remove_slot(next(iter(self.equipment[name])))
+
+    def discard(self, name):
+        """移除一个物品，返回是否移除"""
+        if name not in self.counts:
+            return False
+        self.remove(name)
+        return True
+
+    def pop(self, index=-1):
+        """移除并返回旧列表视图中第index个物品"""
+        names, keys = self._legacy_view()
+        name = names[index]
+        self._remove_slot(keys[index])
+        return name
+
+    def remove_slot(self, key):
+        """按槽位键移除一个物品（叠加物品减少一个），返回物品名"""
+        return self._remove_slot(key)
+
+    def _remove_slot(self, key):
+        name = self.slots[key]
+        remaining = self.counts[name] - 1
+        if remaining:
+            self.counts[name] = remaining
+        else:
+            del self.counts[name]
+        if is_stackable(name):
+            if not remaining:
+                del self.slots[key]
+        else:
+            del self.slots[key]
+            instances = self.equipment[name]
+            del instances[key]
+            if not instances:
+                del self.equipment[name]
+        self.size -= 1
+        self.version += 1
+        return name
+
+    def clear(self):
+        """清空背包"""
+        self.counts.clear()
+        self.slots.clear()
+        self.equipment.clear()
+        self.size = 0
+        self.version += 1
+
+    def load(self, items):
+        """用旧格式的物品名列表替换背包内容"""
+        self.clear()
+        self.extend(items)
+
+    def slot_items(self):
+        """槽位列表：[(槽位键, 物品名, 数量)]，装备的数量为1"""
+        counts = self.counts
+        return [(key, name, counts[name] if key == name else 1) for key, name in self.slots.items()]
+
+    def stack_items(self):
+        """叠加物品及其数量：((物品名, 数量), ...)，按加入顺序"""
+        counts = self.counts
+        return tuple((name, counts[name]) for key, name in self.slots.items() if key == name)
+
+    def to_list(self):
+        """旧格式的物品名列表（用于存档）"""
+        return list(self._legacy_view()[0])
+
+    def _legacy_view(self):
+        """按槽位顺序展开的旧列表及每个位置对应的槽位键，修改后第一次访问时重建"""
+        if self._view_version != self.version:
+            names, keys = [], []
+            counts = self.counts
+            for key, name in self.slots.items():
+                repeat = counts[name] if key == name else 1
+                names.extend([name] * repeat)
+                keys.extend([key] * repeat)
+            self._view = (names, keys)
+            self._view_version = self.version
+        return self._view
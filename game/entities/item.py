@@ -1,12 +1,23 @@
 import pygame
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pool import ObjectPool
 
 class Item:
     """地图上可拾取的物品"""
-    def __init__(self, name, x, y):
+    __slots__ = ("name", "x", "y", "size", "color", "equipment_id", "list_index")
+
+    def __init__(self, name, x, y, equipment_id=None):
         self.name = name
         self.x = x
         self.y = y
         self.size = 20
+        self.equipment_id = equipment_id  # 装备掉落对应的装备ID，普通物品为None
+        self.list_index = -1  # 在 Game.items 中的位置，交换删除用
         # 金币黄色
         if name == "Gold":
             self.color = (255, 215, 0)  # 金币黄色
@@ -16,17 +27,18 @@ class Item:
             self.color = (0, 255, 255)  # 其他物品青色
 
     def draw(self, surface):
+        """绘制物品，返回绘制区域"""
         if self.name == "Gold":
             # 绘制金币为圆形
-            pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.size//2)
+            return pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.size//2)
         elif self.name == "血瓶":
             # 绘制血瓶为圆形药瓶
-            pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.size//2)
+            rect = pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.size//2)
             # 添加瓶口
-            pygame.draw.circle(surface, (200, 200, 200), (int(self.x), int(self.y - self.size//3)), 3)
+            return rect.union(pygame.draw.circle(surface, (200, 200, 200), (int(self.x), int(self.y - self.size//3)), 3))
         else:
             # 绘制其他物品为方形
-            pygame.draw.rect(
+            return pygame.draw.rect(
                 surface,
                 self.color,
                 pygame.Rect(self.x - self.size//2, self.y - self.size//2, self.size, self.size)
@@ -44,13 +56,10 @@ class Item:
         item_size = 20
         safe_distance = 30  # 与其他物品的最小距离
         
-        # 尝试100次找到安全位置
-        for _ in range(100):
-            x, y = game_map.find_safe_position(0, 0, width=item_size, height=item_size)
-            
-            # 检查是否离墙体太近
-            if game_map.is_position_near_walls(x, y):
-                continue
+        # 从远离墙体的可放置位置中随机挑选（格子内随机偏移），避开其他物品
+        cells = game_map.get_spawn_cells(item_size, item_size, avoid_walls=True)
+        for _ in range(100 if cells else 0):
+            x, y = game_map.find_safe_position(item_size, item_size, avoid_walls=True)
             
             # 检查是否与现有物品重叠
             safe_position = True
@@ -61,7 +70,12 @@ class Item:
                     break
             
             if safe_position:
-                return Item(name, x, y)
+                return ITEM_POOL.acquire(name, x, y)
         
-        # 如果找不到安全位置，返回默认位置
-        return Item(name, game_map.WIDTH * game_map.TILE_SIZE // 2, game_map.HEIGHT * game_map.TILE_SIZE // 2)
+        # 如果找不到不重叠的位置，至少保证不在墙里
+        x, y = game_map.find_safe_position(item_size, item_size)
+        return ITEM_POOL.acquire(name, x, y)
+
+
+# 地面物品对象池：拾取后的物品回收后用于新的掉落
+ITEM_POOL = ObjectPool(Item)
@@ -1,10 +1,32 @@
 import pygame
+import sys
+import os
+from functools import partial
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.clock import DEFAULT_CLOCK
+from core.input_source import KeyboardInput
+from entities.projectiles import ProjectileSystem
+from entities.inventory import Inventory
 
 class Player:
-    """玩家类"""
+    """玩家类
+
+    使用 __slots__ 固定所有属性（包括装备相关的可选属性），减少每个实例的内存，
+    也避免到处用 hasattr 判断属性是否存在。
+    """
     SPEED = 4
 
-    def __init__(self, x=0, y=0):
+    __slots__ = (
+        "x", "y", "width", "height", "color", "hp", "attack_power", "_inventory", "max_hp",
+        "exp", "level", "gold", "speed_boost", "last_heal_time", "h_key_pressed", "input", "clock",
+        "mp", "max_mp", "skill_cooldowns", "projectiles", "buffs", "mp_regen_rate", "last_mp_regen",
+        "equipped", "base_attack", "base_defense", "attack", "defense",
+    )
+
+    def __init__(self, x=0, y=0, clock=None):
         self.x = x
         self.y = y
         self.width = 28
@@ -12,7 +34,7 @@ class Player:
         self.color = (0, 255, 0)
         self.hp = 100  # 玩家生命值
         self.attack_power = 20  # 玩家攻击力
-        self.inventory = []  # 玩家背包，用于存放物品名称
+        self.inventory = Inventory()  # 玩家背包（叠加计数和装备槽位）
         self.max_hp = 100  # 最大生命值
         self.exp = 0  # 经验值
         self.level = 1  # 等级
@@ -20,22 +42,41 @@ class Player:
         self.speed_boost = 0  # 速度提升
         self.last_heal_time = 0  # 上次使用血瓶的时间
         self.h_key_pressed = False  # H键按下状态
+        self.input = KeyboardInput()  # 输入源，无头模拟时替换为脚本输入
+        self.clock = clock or DEFAULT_CLOCK  # 游戏时钟，冷却、增益、回复都从这里读取时间
         
         # 技能系统相关属性
         self.mp = 100  # 魔法值
         self.max_mp = 100  # 最大魔法值
         self.skill_cooldowns = {}  # 技能冷却时间
-        self.projectiles = []  # 投射物列表
+        self.projectiles = ProjectileSystem()  # 投射物（列存储）
         self.buffs = {}  # 增益效果
         self.mp_regen_rate = 1  # 魔法恢复速度
         self.last_mp_regen = 0  # 上次魔法恢复时间
 
+        # 装备相关属性
+        self.equipped = {"weapon": None, "armor": None, "accessory": None}  # 各槽位的装备ID
+        self.base_defense = 0  # 装备提供的防御力，计入有效防御
+        self.base_attack = 20  # 背包界面计算攻击力的基准
+        self.attack = 0  # 背包界面计算出的攻击力，攻击时减去20作为装备加成
+        self.defense = 0  # 背包界面计算出的防御力
+
+    @property
+    def inventory(self):
+        """玩家背包"""
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, items):
+        """赋值旧格式的物品名列表时包装为 Inventory"""
+        self._inventory = items if isinstance(items, Inventory) else Inventory(items)
+
     def is_alive(self):
         """判断玩家是否存活"""
         return self.hp > 0
 
     def handle_input(self):
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed()
         dx = dy = 0
         current_speed = self.SPEED + self.speed_boost
         if keys[pygame.K_a]:  # A键向左
@@ -86,35 +127,39 @@ class Player:
         self.update_buffs()
 
     def update_mp_regen(self):
-        """更新魔法值恢复"""
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_mp_regen > 1000:  # 每秒恢复魔法值
-            if self.mp < self.max_mp:
-                self.mp = min(self.max_mp, self.mp + self.mp_regen_rate)
-                self.last_mp_regen = current_time
+        """更新魔法值恢复
+
+        恢复由计时器每秒触发一次；魔法值回满后计时停止，再次不满时在这里重新开始。
+        """
+        if self.mp < self.max_mp and (self, "mp_regen") not in self.clock.timers:
+            if self.clock.get_ticks() - self.last_mp_regen > 1000:  # 每秒恢复魔法值
+                self.regen_mp()
+
+    def regen_mp(self):
+        """恢复一次魔法值，未满时1秒后再次恢复"""
+        if self.mp < self.max_mp:
+            self.mp = min(self.max_mp, self.mp + self.mp_regen_rate)
+            self.last_mp_regen = self.clock.get_ticks()
+            # 与"距上次恢复超过1000毫秒"的判断一致
+            self.clock.timers.schedule((self, "mp_regen"), 1001, self.regen_mp)
 
     def update_projectiles(self):
         """更新投射物"""
-        for projectile in self.projectiles[:]:
-            # 移动投射物
-            dx = projectile["target_x"] - projectile["x"]
-            dy = projectile["target_y"] - projectile["y"]
-            distance = (dx**2 + dy**2)**0.5
-            
-            if distance > 0:
-                projectile["x"] += (dx / distance) * projectile["speed"]
-                projectile["y"] += (dy / distance) * projectile["speed"]
-            
-            # 检查是否到达目标或超出范围
-            if distance < 10 or projectile["x"] < 0 or projectile["x"] > 800 or projectile["y"] < 0 or projectile["y"] > 600:
-                self.projectiles.remove(projectile)
+        self.projectiles.update()
 
     def update_buffs(self):
-        """更新增益效果"""
-        current_time = pygame.time.get_ticks()
-        for buff_name in list(self.buffs.keys()):
-            if current_time > self.buffs[buff_name]["end_time"]:
-                del self.buffs[buff_name]
+        """更新增益效果：到期的增益由时钟的计时器移除，这里只触发到期的计时器"""
+        self.clock.run_timers()
+
+    def add_buff(self, name, buff):
+        """添加增益，buff["end_time"] 之后由计时器移除（同名增益会刷新持续时间）"""
+        self.buffs[name] = buff
+        # 增益持续到 end_time 这一毫秒，之后才过期
+        self.clock.timers.schedule_at((self, "buff", name), buff["end_time"] + 1, partial(self.expire_buff, name))
+
+    def expire_buff(self, name):
+        """移除增益"""
+        self.buffs.pop(name, None)
 
     def handle_keydown_movement(self, key, game_map=None):
         """处理按键事件驱动的移动（备用方案，解决输入法问题）"""
@@ -145,20 +190,21 @@ class Player:
         self.y = max(self.height//2, min(600 - self.height//2, self.y))
 
     def draw(self, surface):
-        pygame.draw.rect(
+        """绘制玩家、投射物和护盾，返回绘制区域的矩形列表"""
+        body = pygame.draw.rect(
             surface,
             self.color,
             pygame.Rect(self.x-self.width//2, self.y-self.height//2, self.width, self.height)
         )
+        rects = [body]
         
         # 绘制投射物
-        for projectile in self.projectiles:
-            if projectile["type"] == "fireball":
-                pygame.draw.circle(surface, (255, 100, 0), (int(projectile["x"]), int(projectile["y"])), 8)
+        rects.extend(self.projectiles.draw(surface))
         
         # 绘制护盾效果
         if "shield" in self.buffs:
-            pygame.draw.circle(surface, (0, 100, 255), (int(self.x), int(self.y)), self.width//2 + 5, 2)
+            rects[0] = body.union(pygame.draw.circle(surface, (0, 100, 255), (int(self.x), int(self.y)), self.width//2 + 5, 2))
+        return rects
 
     def get_rect(self):
         """获取玩家的矩形区域，用于碰撞检测"""
@@ -168,51 +214,37 @@ class Player:
 
     def pick_up(self, item):
         """拾取物品，并加入背包"""
-        # 检查是否是叠加物品（只有血瓶等消耗品可以叠加）
-        is_stackable = item.name in ["血瓶", "Gold"]
-        
-        # 如果不是叠加物品，或者是叠加物品但背包中没有，需要检查显示槽位
-        if not is_stackable or (is_stackable and item.name not in self.inventory):
-            # 计算显示列表长度（去重后的物品数量）
-            display_items = []
-            seen_items = set()
-            for inv_item in self.inventory:
-                if inv_item not in seen_items:
-                    display_items.append(inv_item)
-                    seen_items.add(inv_item)
-            
-            # 检查背包显示槽位是否已满
-            if len(display_items) >= 20:  # 背包最大显示容量
-                return "背包已满！"
+        # 已有的叠加物品不占新槽位，其余物品需要空闲的显示槽位
+        if not self.inventory.has_room(item.name):
+            return "背包已满！"
         
         if item.name == "Gold":
             self.gold += 10
         elif item.name == "血瓶":
             # 血瓶最多携带10个
-            potion_count = self.inventory.count("血瓶")
-            if potion_count >= 10:
+            if self.inventory.count("血瓶") >= 10:
                 return "血瓶已满！(最多10个)"
-            self.inventory.append(item.name)
+            self.inventory.add(item.name)
             return "拾取了血瓶！"
-        elif hasattr(item, 'equipment_id'):
+        elif item.equipment_id is not None:
             # 装备物品每个都占用独立槽位，不叠加
             equipment_id = item.equipment_id
-            self.inventory.append(f"装备_{equipment_id}")
+            self.inventory.add(f"装备_{equipment_id}")
             
             # 获取装备信息用于显示
             from systems.equipment import EquipmentSystem
-            equipment = EquipmentSystem.get_all_equipment().get(equipment_id)
+            equipment = EquipmentSystem.get_equipment(equipment_id)
             if equipment:
                 return f"获得了 {equipment.name}！已放入背包"
             else:
                 return "获得了装备！已放入背包"
         else:
-            self.inventory.append(item.name)
+            self.inventory.add(item.name)
             return f"拾取了 {item.name}！"
 
     def handle_special_input(self):
         """处理特殊按键（如使用物品）"""
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed()
         
         # H键使用血瓶 - 只在按下瞬间触发
         if keys[pygame.K_h] and not self.h_key_pressed:
@@ -250,7 +282,7 @@ class Player:
 
     def use_potion(self):
         """使用血瓶"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time - self.last_heal_time < 2000:  # 2秒冷却
             return False
             
@@ -268,11 +300,8 @@ class Player:
 
     def get_effective_defense(self):
         """获取有效防御力（包括护盾加成）"""
-        defense = 0
-        
         # 基础防御力
-        if hasattr(self, 'base_defense'):
-            defense += self.base_defense
+        defense = self.base_defense
         
         # 护盾加成
         if "shield" in self.buffs:
@@ -0,0 +1,193 @@
+import sys
+import os
+import math
+from array import array
+
+import pygame
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖，没有时逐个投射物计算
+    np = None
+
+
+OWNER_PLAYER, OWNER_ENEMY = 0, 1
+EXPIRE_DISTANCE = 10  # 离目标不到这个距离时消失
+
+# 投射物类型 -> 绘制参数和命中消息，新类型用 register_projectile_type 登记
+PROJECTILE_TYPES = {}
+PROJECTILE_KINDS = []  # 类型序号 -> 类型名，列存储中按序号保存类型
+
+
+def register_projectile_type(name, color, radius=8, hit_message="{name}击中目标，造成{damage}点伤害！"):
+    """登记投射物类型，返回其序号"""
+    if name not in PROJECTILE_TYPES:
+        PROJECTILE_KINDS.append(name)
+    PROJECTILE_TYPES[name] = {"color": color, "radius": radius, "hit_message": hit_message}
+    return PROJECTILE_KINDS.index(name)
+
+
+register_projectile_type("fireball", (255, 100, 0), 8, "火球术击中敌人，造成{damage}点伤害！")
+
+
+class ProjectileSystem:
+    """投射物列存储
+
+    位置、速度、剩余飞行距离、伤害、所属方和类型按列存放。投射物沿直线飞向目标，
+    速度在发射时算好，update() 用NumPy一次移动所有投射物并移除到达目标或飞出屏幕的；
+    没有NumPy时逐个计算。移除时保持其余投射物的顺序。
+
+    命中检测：玩家的投射物按所在点查询敌人空间索引（敌人碰撞箱），敌人的投射物
+    对玩家矩形做一次向量化的包含判断。
+    """
+
+    # 列名 -> (array类型码, NumPy类型)
+    COLUMNS = {
+        "x": ("d", "float64"),
+        "y": ("d", "float64"),
+        "vx": ("d", "float64"),
+        "vy": ("d", "float64"),
+        "speed": ("d", "float64"),
+        "remaining": ("d", "float64"),  # 离目标的距离
+        "damage": ("q", "int64"),
+        "owner": ("b", "int8"),  # OWNER_PLAYER 或 OWNER_ENEMY
+        "kind": ("B", "uint8"),  # PROJECTILE_KINDS 中的序号
+    }
+
+    def __init__(self, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        elif use_numpy and np is None:
+            raise ImportError("ProjectileSystem(use_numpy=True) 需要安装NumPy")
+        self.use_numpy = use_numpy
+        self.clear()
+
+    def __len__(self):
+        return len(self.kind)
+
+    def clear(self):
+        """移除所有投射物"""
+        for name, (typecode, _) in self.COLUMNS.items():
+            setattr(self, name, array(typecode))
+
+    def column(self, name):
+        """以NumPy数组的形式访问一列（与列存储共享内存，持有期间不能增删投射物）"""
+        return np.frombuffer(getattr(self, name), dtype=self.COLUMNS[name][1])
+
+    def spawn(self, kind, x, y, target_x, target_y, speed, damage, owner=OWNER_PLAYER):
+        """发射一个飞向目标点的投射物，返回其行号"""
+        dx, dy = target_x - x, target_y - y
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance > 0:
+            vx, vy = dx / distance * speed, dy / distance * speed
+        else:
+            vx = vy = 0.0
+        self.x.append(x)
+        self.y.append(y)
+        self.vx.append(vx)
+        self.vy.append(vy)
+        self.speed.append(speed)
+        self.remaining.append(distance)
+        self.damage.append(damage)
+        self.owner.append(owner)
+        self.kind.append(PROJECTILE_KINDS.index(kind))
+        return len(self.kind) - 1
+
+    def kind_name(self, row):
+        """第row个投射物的类型名"""
+        return PROJECTILE_KINDS[self.kind[row]]
+
+    def hit_message(self, row):
+        """第row个投射物的命中消息"""
+        name = self.kind_name(row)
+        return PROJECTILE_TYPES[name]["hit_message"].format(name=name, damage=self.damage[row])
+
+    def update(self):
+        """移动所有投射物一步，移除到达目标或飞出屏幕的，返回移除的数量"""
+        if not self.kind:
+            return 0
+        if not self.use_numpy:
+            return self._update_rows()
+
+        expired = self.column("remaining") < EXPIRE_DISTANCE
+        x, y = self.column("x"), self.column("y")
+        x += self.column("vx")
+        y += self.column("vy")
+        self.column("remaining")[:] -= self.column("speed")
+        dead = expired | (x < 0) | (x > 800) | (y < 0) | (y > 600)
+        del x, y
+        return self.remove_rows(np.flatnonzero(dead))
+
+    def _update_rows(self):
+        """逐个投射物更新（没有NumPy时）"""
+        xs, ys, remaining = self.x, self.y, self.remaining
+        dead = []
+        for row in range(len(xs)):
+            expired = remaining[row] < EXPIRE_DISTANCE
+            xs[row] += self.vx[row]
+            ys[row] += self.vy[row]
+            remaining[row] -= self.speed[row]
+            if expired or xs[row] < 0 or xs[row] > 800 or ys[row] < 0 or ys[row] > 600:
+                dead.append(row)
+        return self.remove_rows(dead)
+
+    def remove_rows(self, rows):
+        """移除若干行（保持其余投射物的顺序），返回移除的数量"""
+        rows = sorted(set(int(row) for row in rows))
+        if not rows:
+            return 0
+        if self.use_numpy:
+            keep = np.ones(len(self.kind), dtype=bool)
+            keep[rows] = False
+            for name, (typecode, _) in self.COLUMNS.items():
+                kept = self.column(name)[keep].tobytes()
+                setattr(self, name, array(typecode, kept))
+        else:
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                for row in reversed(rows):
+                    del column[row]
+        return len(rows)
+
+    def collide_enemies(self, enemy_index):
+        """玩家的投射物与敌人碰撞箱的命中检测
+
+        返回 (敌人, 行号) 列表，按行号和敌人在列表中的位置排序，与逐个投射物检查敌人的
+        顺序一致。一个投射物可能与多个敌人重叠，调用方只取每行的第一个命中。
+        """
+        hits = []
+        owner, xs, ys = self.owner, self.x, self.y
+        for row in range(len(owner)):
+            if owner[row] != OWNER_PLAYER:
+                continue
+            for enemy in enemy_index.query_point(int(xs[row]), int(ys[row])):
+                hits.append((row, enemy.list_index, enemy))
+        hits.sort(key=lambda hit: (hit[0], hit[1]))
+        return [(enemy, row) for row, _, enemy in hits]
+
+    def collide_rect(self, rect, owner=OWNER_ENEMY):
+        """owner 一方的投射物中落在矩形内的行号"""
+        if not self.kind:
+            return []
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        if self.use_numpy:
+            x, y = self.column("x").astype(np.int64), self.column("y").astype(np.int64)
+            inside = ((self.column("owner") == owner) & (x >= left) & (x < right)
+                      & (y >= top) & (y < bottom))
+            return np.flatnonzero(inside).tolist()
+        return [row for row in range(len(self.kind))
+                if self.owner[row] == owner and left <= int(self.x[row]) < right
+                and top <= int(self.y[row]) < bottom]
+
+    def draw(self, surface):
+        """绘制所有投射物，返回绘制区域的矩形列表"""
+        styles = [(PROJECTILE_TYPES[name]["color"], PROJECTILE_TYPES[name]["radius"]) for name in PROJECTILE_KINDS]
+        circle = pygame.draw.circle
+        rects = []
+        for x, y, kind in zip(self.x, self.y, self.kind):
+            color, radius = styles[kind]
+            rects.append(circle(surface, color, (int(x), int(y)), radius))
+        return rects
@@ -106,13 +106,15 @@ def update_game(player, enemies, items, game_state, game_map):
 def handle_combat(player, enemies, items, game_state, game_map):
     """处理战斗逻辑"""
     # 处理玩家投射物与敌人的碰撞
-    for projectile in player.projectiles[:]:
+    projectiles = player.projectiles
+    hit_rows = []
+    for row in range(len(projectiles)):
         for enemy in enemies:
-            if enemy.get_rect().collidepoint(projectile["x"], projectile["y"]):
+            if enemy.get_rect().collidepoint(projectiles.x[row], projectiles.y[row]):
                 # 投射物击中敌人
-                enemy.hp -= projectile["damage"]
-                player.projectiles.remove(projectile)
-                game_state.add_battle_message(f"火球术击中敌人，造成{projectile['damage']}点伤害！")
+                enemy.hp -= projectiles.damage[row]
+                hit_rows.append(row)
+                game_state.add_battle_message(projectiles.hit_message(row))
                 
                 if not enemy.is_alive():
                     # 敌人死亡，生成战利品
@@ -126,8 +128,7 @@ def handle_combat(player, enemies, items, game_state, game_map):
                             game_state.add_battle_message(f"获得 {loot_item['name']}！")
                         elif loot_item["type"] == "equipment":
                             # 创建装备物品
-                            equipment_item = Item(name=f"装备_{loot_item['id']}", x=enemy.x, y=enemy.y)
-                            equipment_item.equipment_id = loot_item["id"]
+                            equipment_item = Item(name=f"装备_{loot_item['id']}", x=enemy.x, y=enemy.y, equipment_id=loot_item["id"])
                             items.append(equipment_item)
                             game_state.add_battle_message("掉落装备！")
                     
@@ -136,6 +137,7 @@ def handle_combat(player, enemies, items, game_state, game_map):
                     player.gain_exp(enemy.exp_reward)
                     enemies.remove(enemy)
                 break
+    projectiles.remove_rows(hit_rows)
     
     # 处理敌人AI更新和攻击
     for enemy in enemies:
@@ -191,8 +193,8 @@ def handle_player_attack(mouse_pos, player, enemies, game_state):
         enemy_rect = enemy.get_rect()
         if enemy_rect.collidepoint(mouse_pos):
             # 计算攻击伤害
-            base_damage = getattr(player, 'attack_power', 20)
-            equipment_bonus = getattr(player, 'attack', 0) - 20  # 装备加成
+            base_damage = player.attack_power
+            equipment_bonus = player.attack - 20  # 装备加成
             total_damage = base_damage + equipment_bonus
             
             # 攻击敌人
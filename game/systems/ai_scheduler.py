@@ -0,0 +1,133 @@
+import sys
+import os
+import time
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.enemy import PATROL_RADIUS
+
+
+class AIScheduler:
+    """敌人AI细节层次（LOD）调度器
+
+    靠近玩家或不在巡逻状态的敌人每步都完整更新AI；远离玩家、只在巡逻的敌人错开
+    分组，每 interval 步轮到一次完整更新，其余步沿上次更新的位移外推。外推前检查
+    整段外推的终点能否通行：位移小于碰撞箱尺寸时，起点和终点的碰撞箱覆盖了整段
+    路径，终点可通行就说明中途不会穿墙，否则原地等待下一次更新。终点还要在巡逻
+    范围内（与 Enemy.patrol 相同），已在范围外的敌人只有朝巡逻中心靠近时才外推。
+
+    远处敌人的完整更新受每步预算限制（次数和/或毫秒），超出预算的推迟到下一步，
+    并优先处理等待最久的敌人。
+    """
+
+    COUNTERS = ("near_updates", "far_updates", "skipped", "extrapolated", "deferred")
+
+    def __init__(self, interval=4, near_margin=64, max_far_updates=None, budget_ms=None):
+        self.interval = interval  # 远处敌人每隔几步完整更新一次，1为每步都更新
+        self.near_margin = near_margin  # 视野外多远以内仍算作近处（像素）
+        self.max_far_updates = max_far_updates  # 每步最多完整更新几个远处敌人，None为不限
+        self.budget_ms = budget_ms  # 每步AI更新的时间预算（毫秒），None为不限
+        self.tick = 0
+        self.slots = {}  # 敌人 -> [下次完整更新的步数, 外推x位移, 外推y位移, 剩余外推步数]
+        self.registered = 0  # 登记过的敌人数，用于错开更新分组
+        self.last = dict.fromkeys(self.COUNTERS, 0)  # 最近一步的计数
+        self.totals = dict.fromkeys(self.COUNTERS, 0)  # 累计计数
+
+    def forget(self, enemy):
+        """移除敌人的调度信息"""
+        self.slots.pop(enemy, None)
+
+    def clear(self):
+        """清空所有调度信息和计数"""
+        self.slots.clear()
+        self.tick = 0
+        self.registered = 0
+        self.last = dict.fromkeys(self.COUNTERS, 0)
+        self.totals = dict.fromkeys(self.COUNTERS, 0)
+
+    def update(self, enemies, player, game_map):
+        """更新一步所有敌人的AI"""
+        self.tick += 1
+        tick = self.tick
+        counts = dict.fromkeys(self.COUNTERS, 0)
+        if self.interval <= 1:
+            for enemy in enemies:
+                enemy.update(player, game_map)
+            counts["near_updates"] = len(enemies)
+            self._record(counts)
+            return
+
+        started = time.perf_counter()
+        due = []
+        for enemy in enemies:
+            slot = self.slots.get(enemy)
+            if slot is None:
+                slot = self.slots[enemy] = [tick + self.registered % self.interval, 0, 0, 0]
+                self.registered += 1
+
+            distance = enemy.distance_to_player(player)
+            if (not enemy.is_alive() or enemy.ai_state != "patrol"
+                    or distance <= enemy.sight_range + self.near_margin):
+                # 近处敌人每步完整更新，下次走远时从下一步开始轮转
+                enemy.update(player, game_map)
+                slot[0], slot[3] = tick + 1, 0
+                counts["near_updates"] += 1
+            elif slot[0] <= tick:
+                due.append((slot[0], distance, enemy, slot))
+            else:
+                self._extrapolate(enemy, slot, counts)
+
+        # 等待最久的远处敌人优先更新，超出预算的推迟并继续外推
+        due.sort(key=lambda entry: entry[0])
+        for _, distance, enemy, slot in due:
+            if ((self.max_far_updates is not None and counts["far_updates"] >= self.max_far_updates)
+                    or (self.budget_ms is not None and (time.perf_counter() - started) * 1000 >= self.budget_ms)):
+                counts["deferred"] += 1
+                self._extrapolate(enemy, slot, counts)
+                continue
+
+            old_x, old_y = enemy.x, enemy.y
+            enemy.update_ai_state(player, distance)
+            enemy.perform_ai(player, game_map)
+            counts["far_updates"] += 1
+            slot[0] = tick + self.interval
+            slot[1], slot[2] = enemy.x - old_x, enemy.y - old_y
+            slot[3] = self._safe_steps(enemy, slot[1], slot[2], game_map) if enemy.ai_state == "patrol" else 0
+
+        self._record(counts)
+
+    def _extrapolate(self, enemy, slot, counts):
+        """跳过完整更新，沿上次的位移移动一步"""
+        counts["skipped"] += 1
+        if slot[3] > 0:
+            enemy.x += slot[1]
+            enemy.y += slot[2]
+            slot[3] -= 1
+            counts["extrapolated"] += 1
+
+    def _safe_steps(self, enemy, dx, dy, game_map):
+        """到下次完整更新前可以外推的步数：整段外推的终点能通行且不离开巡逻范围时为 interval-1，否则为0"""
+        steps = self.interval - 1
+        if dx == 0 and dy == 0:
+            return 0
+        if abs(dx) * steps >= enemy.width or abs(dy) * steps >= enemy.height:
+            return 0
+        end_x, end_y = enemy.x + dx * steps, enemy.y + dy * steps
+        half_w, half_h = enemy.width // 2, enemy.height // 2
+        if not (half_w <= end_x <= 800 - half_w and half_h <= end_y <= 600 - half_h):
+            return 0
+        if game_map is not None and not game_map.can_move_to(end_x, end_y, enemy.width, enemy.height):
+            return 0
+        # 巡逻范围是以巡逻中心为中心的正方形，起点和终点都在范围内时整段路径也在范围内
+        center_x, center_y = enemy.patrol_center
+        end_reach = max(abs(end_x - center_x), abs(end_y - center_y))
+        if end_reach >= PATROL_RADIUS and end_reach >= max(abs(enemy.x - center_x), abs(enemy.y - center_y)):
+            return 0
+        return steps
+
+    def _record(self, counts):
+        """保存本步计数并累加到总数"""
+        self.last = counts
+        for name, value in counts.items():
+            self.totals[name] += value
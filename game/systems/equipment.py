@@ -1,126 +1,186 @@
 import pygame
 import random
 
+try:
+    import numpy as np
+except ImportError:  # NumPy为可选依赖，没有时批量掉落逐个生成
+    np = None
+
 class Equipment:
     """装备类"""
-    def __init__(self, name, equipment_type, stats):
+    def __init__(self, name, equipment_type, stats, equipment_id=None):
+        self.id = equipment_id  # 装备ID，登记到装备表时设置
         self.name = name
         self.type = equipment_type  # "weapon", "armor", "accessory"
         self.stats = stats  # {"attack": 0, "defense": 0, "hp": 0, "mp": 0}
         self.level_requirement = stats.get("level_requirement", 1)
         self.description = stats.get("description", "")
 
+def _create_equipment():
+    """创建所有装备（只在模块导入时调用一次）"""
+    return {
+        # 武器类
+        "iron_sword": Equipment("铁剑", "weapon", {
+            "attack": 15,
+            "description": "普通的铁制剑，增加攻击力"
+        }),
+        "steel_sword": Equipment("钢剑", "weapon", {
+            "attack": 25,
+            "level_requirement": 3,
+            "description": "坚固的钢制剑，大幅增加攻击力"
+        }),
+        "silver_sword": Equipment("银剑", "weapon", {
+            "attack": 35,
+            "level_requirement": 5,
+            "description": "银制长剑，对邪恶生物有额外伤害"
+        }),
+        "magic_sword": Equipment("魔法剑", "weapon", {
+            "attack": 45,
+            "mp": 20,
+            "level_requirement": 7,
+            "description": "蕴含魔法力量的剑，增加攻击力和魔法值"
+        }),
+        "dragon_sword": Equipment("龙鳞剑", "weapon", {
+            "attack": 60,
+            "level_requirement": 10,
+            "description": "传说中的龙鳞剑，极其锋利"
+        }),
+        
+        # 护甲类
+        "leather_armor": Equipment("皮甲", "armor", {
+            "defense": 8,
+            "hp": 20,
+            "description": "轻便的皮制护甲，提供基础防护"
+        }),
+        "chain_armor": Equipment("锁甲", "armor", {
+            "defense": 15,
+            "hp": 40,
+            "level_requirement": 4,
+            "description": "金属链甲，提供更好的防护"
+        }),
+        "plate_armor": Equipment("板甲", "armor", {
+            "defense": 25,
+            "hp": 60,
+            "level_requirement": 6,
+            "description": "重型板甲，提供极佳的防护"
+        }),
+        "magic_armor": Equipment("魔法护甲", "armor", {
+            "defense": 20,
+            "hp": 50,
+            "mp": 30,
+            "level_requirement": 8,
+            "description": "魔法护甲，同时提供防护和魔法值"
+        }),
+        "dragon_armor": Equipment("龙鳞甲", "armor", {
+            "defense": 40,
+            "hp": 100,
+            "level_requirement": 12,
+            "description": "传说中的龙鳞甲，防御力极高"
+        }),
+        
+        # 饰品类
+        "basic_ring": Equipment("基础戒指", "accessory", {
+            "mp": 30,
+            "level_requirement": 2,
+            "description": "神秘的戒指，增加魔法值"
+        }),
+        "magic_ring": Equipment("魔法戒指", "accessory", {
+            "mp": 50,
+            "attack": 5,
+            "level_requirement": 4,
+            "description": "魔法戒指，增加魔法值和攻击力"
+        }),
+        "power_ring": Equipment("力量戒指", "accessory", {
+            "attack": 10,
+            "defense": 5,
+            "level_requirement": 5,
+            "description": "散发力量的戒指，全面提升属性"
+        }),
+        "wisdom_ring": Equipment("智慧戒指", "accessory", {
+            "mp": 80,
+            "level_requirement": 6,
+            "description": "智慧戒指，大幅增加魔法值"
+        }),
+        "health_amulet": Equipment("生命护符", "accessory", {
+            "hp": 80,
+            "defense": 8,
+            "level_requirement": 7,
+            "description": "生命护符，增加生命值和防御力"
+        }),
+        "master_ring": Equipment("大师戒指", "accessory", {
+            "attack": 15,
+            "defense": 10,
+            "mp": 40,
+            "level_requirement": 9,
+            "description": "大师级戒指，全面提升所有属性"
+        }),
+        "dragon_amulet": Equipment("龙之护符", "accessory", {
+            "attack": 20,
+            "defense": 15,
+            "hp": 60,
+            "mp": 60,
+            "level_requirement": 15,
+            "description": "传说中的龙之护符，极大提升所有属性"
+        })
+    }
+
+
+class EquipmentRegistry:
+    """装备表
+
+    模块导入时创建一次所有装备，按ID、槽位类型和等级要求建立索引，装备、卸下和
+    背包界面的查询都直接查字典，不再每次重新创建全部装备。
+    """
+
+    def __init__(self, equipment):
+        self.by_id = equipment  # 装备ID -> 装备
+        self.by_type = {}  # 槽位类型 -> [装备ID]
+        self.by_level = {}  # 等级要求 -> [装备ID]
+        for equipment_id, item in equipment.items():
+            item.id = equipment_id
+            self.by_type.setdefault(item.type, []).append(equipment_id)
+            self.by_level.setdefault(item.level_requirement, []).append(equipment_id)
+        self._usable = {}  # 玩家等级 -> 可以装备的装备ID（按需计算后缓存）
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, equipment_id):
+        return equipment_id in self.by_id
+
+    def get(self, equipment_id):
+        """按ID获取装备，不存在时返回None"""
+        return self.by_id.get(equipment_id)
+
+    def of_type(self, equipment_type):
+        """某个槽位类型的所有装备ID"""
+        return self.by_type.get(equipment_type, [])
+
+    def usable_at(self, level):
+        """等级要求不超过level的所有装备ID"""
+        usable = self._usable.get(level)
+        if usable is None:
+            usable = self._usable[level] = tuple(
+                equipment_id for requirement, ids in sorted(self.by_level.items())
+                if requirement <= level for equipment_id in ids)
+        return usable
+
+
+EQUIPMENT_REGISTRY = EquipmentRegistry(_create_equipment())
+
+
 class EquipmentSystem:
     """装备系统"""
     
     @staticmethod
     def get_all_equipment():
-        """获取所有装备"""
-        return {
-            # 武器类
-            "iron_sword": Equipment("铁剑", "weapon", {
-                "attack": 15,
-                "description": "普通的铁制剑，增加攻击力"
-            }),
-            "steel_sword": Equipment("钢剑", "weapon", {
-                "attack": 25,
-                "level_requirement": 3,
-                "description": "坚固的钢制剑，大幅增加攻击力"
-            }),
-            "silver_sword": Equipment("银剑", "weapon", {
-                "attack": 35,
-                "level_requirement": 5,
-                "description": "银制长剑，对邪恶生物有额外伤害"
-            }),
-            "magic_sword": Equipment("魔法剑", "weapon", {
-                "attack": 45,
-                "mp": 20,
-                "level_requirement": 7,
-                "description": "蕴含魔法力量的剑，增加攻击力和魔法值"
-            }),
-            "dragon_sword": Equipment("龙鳞剑", "weapon", {
-                "attack": 60,
-                "level_requirement": 10,
-                "description": "传说中的龙鳞剑，极其锋利"
-            }),
-            
-            # 护甲类
-            "leather_armor": Equipment("皮甲", "armor", {
-                "defense": 8,
-                "hp": 20,
-                "description": "轻便的皮制护甲，提供基础防护"
-            }),
-            "chain_armor": Equipment("锁甲", "armor", {
-                "defense": 15,
-                "hp": 40,
-                "level_requirement": 4,
-                "description": "金属链甲，提供更好的防护"
-            }),
-            "plate_armor": Equipment("板甲", "armor", {
-                "defense": 25,
-                "hp": 60,
-                "level_requirement": 6,
-                "description": "重型板甲，提供极佳的防护"
-            }),
-            "magic_armor": Equipment("魔法护甲", "armor", {
-                "defense": 20,
-                "hp": 50,
-                "mp": 30,
-                "level_requirement": 8,
-                "description": "魔法护甲，同时提供防护和魔法值"
-            }),
-            "dragon_armor": Equipment("龙鳞甲", "armor", {
-                "defense": 40,
-                "hp": 100,
-                "level_requirement": 12,
-                "description": "传说中的龙鳞甲，防御力极高"
-            }),
-            
-            # 饰品类
-            "basic_ring": Equipment("基础戒指", "accessory", {
-                "mp": 30,
-                "level_requirement": 2,
-                "description": "神秘的戒指，增加魔法值"
-            }),
-            "magic_ring": Equipment("魔法戒指", "accessory", {
-                "mp": 50,
-                "attack": 5,
-                "level_requirement": 4,
-                "description": "魔法戒指，增加魔法值和攻击力"
-            }),
-            "power_ring": Equipment("力量戒指", "accessory", {
-                "attack": 10,
-                "defense": 5,
-                "level_requirement": 5,
-                "description": "散发力量的戒指，全面提升属性"
-            }),
-            "wisdom_ring": Equipment("智慧戒指", "accessory", {
-                "mp": 80,
-                "level_requirement": 6,
-                "description": "智慧戒指，大幅增加魔法值"
-            }),
-            "health_amulet": Equipment("生命护符", "accessory", {
-                "hp": 80,
-                "defense": 8,
-                "level_requirement": 7,
-                "description": "生命护符，增加生命值和防御力"
-            }),
-            "master_ring": Equipment("大师戒指", "accessory", {
-                "attack": 15,
-                "defense": 10,
-                "mp": 40,
-                "level_requirement": 9,
-                "description": "大师级戒指，全面提升所有属性"
-            }),
-            "dragon_amulet": Equipment("龙之护符", "accessory", {
-                "attack": 20,
-                "defense": 15,
-                "hp": 60,
-                "mp": 60,
-                "level_requirement": 15,
-                "description": "传说中的龙之护符，极大提升所有属性"
-            })
-        }
+        """获取所有装备（装备表中共享的字典，不能修改）"""
+        return EQUIPMENT_REGISTRY.by_id
+    
+    @staticmethod
+    def get_equipment(equipment_id):
+        """按ID获取装备，不存在时返回None"""
+        return EQUIPMENT_REGISTRY.get(equipment_id)
     
     @staticmethod
     def can_equip(player, equipment):
@@ -130,19 +190,13 @@ class EquipmentSystem:
     @staticmethod
     def equip_item(player, equipment_id):
         """装备物品"""
-        all_equipment = EquipmentSystem.get_all_equipment()
-        if equipment_id not in all_equipment:
+        equipment = EQUIPMENT_REGISTRY.get(equipment_id)
+        if equipment is None:
             return False
-            
-        equipment = all_equipment[equipment_id]
         
         if not EquipmentSystem.can_equip(player, equipment):
             return False
         
-        # 初始化装备槽
-        if not hasattr(player, 'equipped'):
-            player.equipped = {"weapon": None, "armor": None, "accessory": None}
-        
         # 卸下旧装备
         old_equipment = player.equipped.get(equipment.type)
         if old_equipment:
@@ -156,8 +210,6 @@ class EquipmentSystem:
             if stat == "attack":
                 player.attack_power += value
             elif stat == "defense":
-                if not hasattr(player, 'base_defense'):
-                    player.base_defense = 0
                 player.base_defense += value
             elif stat == "hp":
                 player.max_hp += value
@@ -171,12 +223,11 @@ class EquipmentSystem:
     @staticmethod
     def unequip_item(player, equipment_type):
         """卸下装备"""
-        if not hasattr(player, 'equipped') or player.equipped.get(equipment_type) is None:
+        if player.equipped.get(equipment_type) is None:
             return False
         
         equipment_id = player.equipped[equipment_type]
-        all_equipment = EquipmentSystem.get_all_equipment()
-        equipment = all_equipment[equipment_id]
+        equipment = EQUIPMENT_REGISTRY.by_id[equipment_id]
         
         # 移除装备加成
         for stat, value in equipment.stats.items():
@@ -194,9 +245,107 @@ class EquipmentSystem:
         player.equipped[equipment_type] = None
         return True
 
+# 掉落分档：(敌人最低等级, 稀有度, 装备ID)，敌人等级达到后该档装备加入掉落表
+LOOT_TIERS = [
+    (1, "common", ("iron_sword", "leather_armor", "basic_ring")),
+    (3, "common", ("steel_sword", "chain_armor", "magic_ring")),
+    (5, "rare", ("silver_sword", "plate_armor", "power_ring")),
+    (7, "rare", ("magic_sword", "magic_armor", "wisdom_ring", "health_amulet")),
+    (9, "epic", ("dragon_sword", "dragon_armor", "master_ring")),
+    (15, "legendary", ("dragon_amulet",)),  # 15级传说装备
+]
+
+# 稀有度权重和单件装备权重（乘在稀有度权重上），全为1时各装备等概率
+RARITY_WEIGHTS = {"common": 1.0, "rare": 1.0, "epic": 1.0, "legendary": 1.0}
+ITEM_WEIGHTS = {}
+
+# 必定掉落：(敌人最低等级, 战利品)，敌人等级达到后每次都掉落
+GUARANTEED_DROPS = []
+
+
+class LootTable:
+    """编译后的装备掉落表
+
+    按权重用别名法（Walker alias method）抽样，每次抽样 O(1)。所有权重相同时
+    直接用 random.choice，与原来的等概率抽样消耗相同的随机数。
+    """
+
+    def __init__(self, weighted_ids, guaranteed=()):
+        self.ids = [equipment_id for equipment_id, _ in weighted_ids]
+        self.weights = [weight for _, weight in weighted_ids]
+        self.guaranteed = list(guaranteed)  # 必定掉落的战利品
+        self.uniform = len(set(self.weights)) <= 1
+        self.prob, self.alias = self._build_alias(self.weights)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _build_alias(weights):
+        """构建别名表：第i格以 prob[i] 的概率取i，否则取 alias[i]"""
+        n = len(weights)
+        total = sum(weights)
+        if n == 0 or total <= 0:
+            return [], []
+        scaled = [weight * n / total for weight in weights]
+        prob, alias = [1.0] * n, list(range(n))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less], alias[less] = scaled[less], more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        return prob, alias
+
+    def sample(self):
+        """抽取一件装备ID，掉落表为空时返回None"""
+        if not self.ids:
+            return None
+        if self.uniform:
+            return random.choice(self.ids)
+        i = int(random.random() * len(self.ids))
+        return self.ids[i] if random.random() < self.prob[i] else self.ids[self.alias[i]]
+
+
 class LootSystem:
     """战利品系统"""
     
+    _tables = {}  # 敌人等级 -> 编译后的掉落表
+    _max_level = None  # 掉落表最后一次变化的等级，reset_loot_tables 时重新计算
+    
+    @staticmethod
+    def get_loot_table(enemy_level):
+        """获取敌人等级对应的掉落表，每个等级只编译一次"""
+        # 超过最高的分档和必定掉落等级后掉落表不再变化
+        if LootSystem._max_level is None:
+            LootSystem._max_level = max([min_level for min_level, _, _ in LOOT_TIERS]
+                                        + [min_level for min_level, _ in GUARANTEED_DROPS])
+        level = min(enemy_level, LootSystem._max_level)
+        table = LootSystem._tables.get(level)
+        if table is None:
+            table = LootSystem._tables[level] = LootSystem.compile_loot_table(level)
+        return table
+    
+    @staticmethod
+    def compile_loot_table(enemy_level):
+        """按分档、稀有度权重、单件权重和必定掉落编译掉落表"""
+        weighted_ids = []
+        for min_level, rarity, equipment_ids in LOOT_TIERS:
+            if enemy_level >= min_level:
+                for equipment_id in equipment_ids:
+                    weight = RARITY_WEIGHTS[rarity] * ITEM_WEIGHTS.get(equipment_id, 1.0)
+                    if weight > 0:
+                        weighted_ids.append((equipment_id, weight))
+        guaranteed = [dict(loot) for min_level, loot in GUARANTEED_DROPS if enemy_level >= min_level]
+        return LootTable(weighted_ids, guaranteed)
+    
+    @staticmethod
+    def reset_loot_tables():
+        """修改分档、权重或必定掉落后清除已编译的掉落表"""
+        LootSystem._tables.clear()
+        LootSystem._max_level = None
+    
     @staticmethod
     def generate_loot(enemy_level):
         """根据敌人等级生成战利品"""
@@ -211,47 +360,62 @@ class LootSystem:
             loot.append({"type": "item", "name": "血瓶"})
         
         # 装备掉落 - 调整掉落率，让装备更珍贵
+        table = LootSystem.get_loot_table(enemy_level)
         equipment_drop_rate = 0.2 + (enemy_level * 0.05)  # 基础20%，每等级增加5%
         if random.random() < equipment_drop_rate:
-            # 根据敌人等级确定可掉落的装备
-            available_equipment = []
-            
-            # 1级装备
-            if enemy_level >= 1:
-                available_equipment.extend([
-                    "iron_sword", "leather_armor", "basic_ring"
-                ])
-            
-            # 3级装备
-            if enemy_level >= 3:
-                available_equipment.extend([
-                    "steel_sword", "chain_armor", "magic_ring"
-                ])
-            
-            # 5级装备
-            if enemy_level >= 5:
-                available_equipment.extend([
-                    "silver_sword", "plate_armor", "power_ring"
-                ])
-            
-            # 7级装备
-            if enemy_level >= 7:
-                available_equipment.extend([
-                    "magic_sword", "magic_armor", "wisdom_ring", "health_amulet"
-                ])
-            
-            # 9级装备
-            if enemy_level >= 9:
-                available_equipment.extend([
-                    "dragon_sword", "dragon_armor", "master_ring"
-                ])
-            
-            # 15级传说装备
-            if enemy_level >= 15:
-                available_equipment.append("dragon_amulet")
-            
-            # 随机选择一个装备
-            equipment_id = random.choice(available_equipment)
-            loot.append({"type": "equipment", "id": equipment_id})
+            # 从该等级的掉落表中抽取一个装备
+            equipment_id = table.sample()
+            if equipment_id is not None:
+                loot.append({"type": "equipment", "id": equipment_id})
         
+        # 必定掉落
+        loot.extend(dict(item) for item in table.guaranteed)
         return loot
+    
+    @staticmethod
+    def generate_loot_many(enemy_levels):
+        """批量生成战利品，返回与 enemy_levels 一一对应的战利品列表
+
+        掉落规则与 generate_loot 相同；有NumPy时一次抽取所有随机数，
+        结果与逐个调用 generate_loot 的随机序列不同。
+        """
+        enemy_levels = list(enemy_levels)
+        if np is None:
+            return [LootSystem.generate_loot(level) for level in enemy_levels]
+        
+        count = len(enemy_levels)
+        rng = np.random.default_rng(random.getrandbits(64))
+        levels = np.asarray(enemy_levels, dtype=np.int64)
+        gold = (rng.integers(5, 21, size=count) * levels).tolist()
+        potion = (rng.random(count) < 0.15).tolist()
+        equipment = (rng.random(count) < 0.2 + levels * 0.05).tolist()
+        
+        # 同一等级的装备一起用别名表抽样
+        equipment_ids = [None] * count
+        rows_by_level = {}
+        for row, level in enumerate(enemy_levels):
+            if equipment[row]:
+                rows_by_level.setdefault(level, []).append(row)
+        for level, rows in rows_by_level.items():
+            table = LootSystem.get_loot_table(level)
+            if not table.ids:
+                continue
+            n = len(table.ids)
+            slots = rng.integers(0, n, size=len(rows))
+            accept = rng.random(len(rows)) < np.asarray(table.prob)[slots]
+            picks = np.where(accept, slots, np.asarray(table.alias)[slots]).tolist()
+            for row, pick in zip(rows, picks):
+                equipment_ids[row] = table.ids[pick]
+        
+        results = []
+        for row, level in enumerate(enemy_levels):
+            loot = [{"type": "gold", "amount": gold[row]}]
+            if potion[row]:
+                loot.append({"type": "item", "name": "血瓶"})
+            if equipment_ids[row] is not None:
+                loot.append({"type": "equipment", "id": equipment_ids[row]})
+            guaranteed = LootSystem.get_loot_table(level).guaranteed
+            if guaranteed:
+                loot.extend(dict(item) for item in guaranteed)
+            results.append(loot)
+        return results
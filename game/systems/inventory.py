@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from systems.equipment import EquipmentSystem
+from ui.text_cache import render_text
 
 class InventoryUI:
     """背包界面类"""
@@ -50,55 +51,59 @@ class InventoryUI:
         self.slot_size = 50
         self.slots_per_row = 8  # 减少每行物品数量
         self.inventory_rows = 4
+        
+        # 显示列表及显示索引与实际索引的映射，背包内容变化（版本号改变）时才重新计算
+        self._layout_inventory = None
+        self._layout_version = -1
+        self._display_items = []
+        self._display_to_actual = []  # 显示索引 -> 该槽位第一个物品在背包中的索引
+        self._actual_to_display = []  # 背包索引 -> 显示索引
     
+    def _layout(self, player):
+        """显示列表和索引映射（按背包版本号缓存）"""
+        inventory = player.inventory
+        if inventory is not self._layout_inventory or inventory.version != self._layout_version:
+            display_items, display_to_actual, actual_to_display = [], [], []
+            # 旧列表视图按槽位顺序展开，每个槽位占连续的一段
+            for _, name, count in inventory.slot_items():
+                display_to_actual.append(len(actual_to_display))
+                actual_to_display.extend([len(display_items)] * count)
+                display_items.append(name)
+            self._display_items = display_items
+            self._display_to_actual = display_to_actual
+            self._actual_to_display = actual_to_display
+            self._layout_inventory = inventory
+            self._layout_version = inventory.version
+        return self._display_items
+
     def _get_display_items(self, player):
-        """获取显示物品列表（装备不叠加，消耗品叠加）"""
-        display_items = []
-        seen_items = set()
-        for item in player.inventory:
-            # 装备类物品不叠加，每个都显示
-            if item.startswith("装备_"):
-                display_items.append(item)
-            # 消耗品叠加显示
-            elif item not in seen_items:
-                display_items.append(item)
-                seen_items.add(item)
-        return display_items
+        """获取显示物品列表（装备不叠加，消耗品叠加），返回的列表不能修改"""
+        return self._layout(player)
 
     def _get_actual_index(self, player, display_index):
         """根据显示索引获取实际背包索引（考虑装备不叠加）"""
-        display_items = self._get_display_items(player)
-        if display_index < 0 or display_index >= len(display_items):
+        self._layout(player)
+        if display_index < 0 or display_index >= len(self._display_to_actual):
             return 0
-        
-        # 直接返回显示列表中对应位置的物品在原始背包中的索引
-        target_item = display_items[display_index]
-        
-        # 统计在显示列表中该位置之前有多少个相同的装备
-        same_item_count = 0
-        for i in range(display_index):
-            if display_items[i] == target_item:
-                same_item_count += 1
-        
-        # 在原始背包中找到第 (same_item_count + 1) 个匹配的物品
-        found_count = 0
-        for i, item in enumerate(player.inventory):
-            if item == target_item:
-                if found_count == same_item_count:
-                    return i
-                found_count += 1
-        return 0
+        return self._display_to_actual[display_index]
 
     def _get_display_index(self, player, actual_index):
         """根据实际索引获取显示索引"""
-        if actual_index < 0 or actual_index >= len(player.inventory):
+        self._layout(player)
+        if actual_index < 0 or actual_index >= len(self._actual_to_display):
             return 0
-        target_item = player.inventory[actual_index]
-        display_items = self._get_display_items(player)
-        for i, item in enumerate(display_items):
-            if item == target_item:
-                return i
-        return 0
+        return self._actual_to_display[actual_index]
+
+    def _slot_at(self, mx, my):
+        """鼠标位置所在的背包格子（显示索引），不在格子上时返回None"""
+        stride = self.slot_size + 5
+        column, offset_x = divmod(mx - self.inventory_start_x, stride)
+        row, offset_y = divmod(my - self.inventory_start_y, stride)
+        if (0 <= column < self.slots_per_row and 0 <= row < self.inventory_rows
+                and offset_x <= self.slot_size and offset_y <= self.slot_size):
+            return row * self.slots_per_row + column
+        return None
+
     def toggle(self):
         """切换背包开关状态"""
         self.is_open = not self.is_open
@@ -115,13 +120,11 @@ class InventoryUI:
                 self.toggle()
                 return "close"
             elif event.key == pygame.K_LEFT:
-                display_items = self._get_display_items(player)
                 self.selected_slot = max(0, self.selected_slot - 1)
             elif event.key == pygame.K_RIGHT:
                 display_items = self._get_display_items(player)
                 self.selected_slot = min(len(display_items) - 1, self.selected_slot + 1)
             elif event.key == pygame.K_UP:
-                display_items = self._get_display_items(player)
                 self.selected_slot = max(0, self.selected_slot - self.slots_per_row)
             elif event.key == pygame.K_DOWN:
                 display_items = self._get_display_items(player)
@@ -152,7 +155,7 @@ class InventoryUI:
                 self.selected_equipment_slot = slot_type
                 self.selected_slot = -1  # 取消背包物品选中
                 # 检查槽位是否有装备
-                if hasattr(player, 'equipped') and slot_type in player.equipped and player.equipped[slot_type]:
+                if player.equipped.get(slot_type):
                     equipment_id = player.equipped[slot_type]
                     if equipment_id in self.equipment_list:
                         equipment = self.equipment_list[equipment_id]
@@ -161,29 +164,21 @@ class InventoryUI:
         
         # 检查是否点击背包物品（使用统一的显示列表）
         display_items = self._get_display_items(player)
-        item_counts = {}
-        
-        for item in player.inventory:
-            item_counts[item] = item_counts.get(item, 0) + 1
-        
-        for i, item in enumerate(display_items):
-            slot_x = self.inventory_start_x + (i % self.slots_per_row) * (self.slot_size + 5)
-            slot_y = self.inventory_start_y + (i // self.slots_per_row) * (self.slot_size + 5)
+        i = self._slot_at(mx, my)
+        if i is not None and i < len(display_items):
+            item = display_items[i]
+            self.selected_slot = i  # 直接使用显示列表索引
+            self.selected_equipment_slot = None  # 取消装备槽选择
             
-            if (slot_x <= mx <= slot_x + self.slot_size and 
-                slot_y <= my <= slot_y + self.slot_size):
-                self.selected_slot = i  # 直接使用显示列表索引
-                self.selected_equipment_slot = None  # 取消装备槽选择
-                
-                # 装备不显示数量，消耗品显示数量
-                if item.startswith("装备_"):
-                    return f"选中了 {item}"
+            # 装备不显示数量，消耗品显示数量
+            if item.startswith("装备_"):
+                return f"选中了 {item}"
+            else:
+                count = player.inventory.count(item)
+                if count > 1:
+                    return f"选中了 {item} x{count}"
                 else:
-                    count = item_counts[item]
-                    if count > 1:
-                        return f"选中了 {item} x{count}"
-                    else:
-                        return f"选中了 {item}"
+                    return f"选中了 {item}"
         
         return None
     
@@ -231,20 +226,11 @@ class InventoryUI:
         item_to_equip = player.inventory.pop(inventory_index)
         
         # 卸下当前装备（如果有）
-        if hasattr(player, 'equipped') and equipment.type in player.equipped:
-            if player.equipped[equipment.type]:  # 如果有装备
-                self.unequip_item(player, equipment.type)
+        if player.equipped.get(equipment.type):
+            self.unequip_item(player, equipment.type)
         
-        # 装备新装备
-        if not hasattr(player, 'equipped'):
-            player.equipped = {}
-        
-        # 找到装备ID
-        equipment_id = None
-        for eq_id, eq_obj in self.equipment_list.items():
-            if eq_obj == equipment:
-                equipment_id = eq_id
-                break
+        # 装备ID
+        equipment_id = equipment.id
         
         if equipment_id:
             player.equipped[equipment.type] = equipment_id  # 存储装备ID而不是对象
@@ -264,7 +250,7 @@ class InventoryUI:
     
     def unequip_item(self, player, equipment_type):
         """卸下装备"""
-        if not hasattr(player, 'equipped') or equipment_type not in player.equipped:
+        if equipment_type not in player.equipped:
             return None
         
         equipment_id = player.equipped[equipment_type]
@@ -291,19 +277,15 @@ class InventoryUI:
     
     def apply_equipment_stats(self, player, equipment, equip=True):
         """应用或移除装备属性"""
-        if not equipment or not hasattr(equipment, 'stats'):
+        if not equipment:
             return  # 如果装备无效，直接返回
         
         multiplier = 1 if equip else -1
         
         if "attack" in equipment.stats:
-            if not hasattr(player, 'base_attack'):
-                player.base_attack = getattr(player, 'attack', 20)
             player.attack = player.base_attack + (equipment.stats["attack"] * multiplier)
         
         if "defense" in equipment.stats:
-            if not hasattr(player, 'base_defense'):
-                player.base_defense = getattr(player, 'defense', 5)
             player.defense = player.base_defense + (equipment.stats["defense"] * multiplier)
         
         if "hp" in equipment.stats:
@@ -334,7 +316,7 @@ class InventoryUI:
         pygame.draw.rect(self.screen, self.border_color, (self.x, self.y, self.width, self.height), 3)
         
         # 标题栏
-        title = self.font.render("背包 (TAB关闭) | 左键:选中 | 空格:使用 | D:丢弃 | X:摧毁", True, self.text_color)
+        title = render_text(self.font, "背包 (TAB关闭) | 左键:选中 | 空格:使用 | D:丢弃 | X:摧毁", True, self.text_color)
         self.screen.blit(title, (self.x + 20, self.y + 10))
         
         # 绘制装备槽
@@ -356,59 +338,45 @@ class InventoryUI:
             pygame.draw.rect(self.screen, border_color, (sx, sy, sw, sh), 2)
             
             # 绘制标签
-            label = self.font.render(slot_labels[slot_type], True, self.text_color)
+            label = render_text(self.font, slot_labels[slot_type], True, self.text_color)
             self.screen.blit(label, (sx, sy - 25))
             
             # 绘制已装备的装备
-            if hasattr(player, 'equipped') and slot_type in player.equipped:
+            if slot_type in player.equipped:
                 equipment_id = player.equipped[slot_type]
                 if equipment_id and equipment_id in self.equipment_list:
                     equipment = self.equipment_list[equipment_id]
                     # 绘制装备图标
                     icon = self.equipment_icons.get(slot_type, "⚡")
-                    icon_surface = self.font.render(icon, True, (255, 215, 0))
+                    icon_surface = render_text(self.font, icon, True, (255, 215, 0))
                     icon_rect = icon_surface.get_rect(center=(sx + sw//2, sy + sh//2 - 10))
                     self.screen.blit(icon_surface, icon_rect)
                     
                     # 绘制装备名称
-                    name_surface = self.font.render(equipment.name[:4], True, self.text_color)
+                    name_surface = render_text(self.font, equipment.name[:4], True, self.text_color)
                     name_rect = name_surface.get_rect(center=(sx + sw//2, sy + sh//2 + 15))
                     self.screen.blit(name_surface, name_rect)
                 else:
                     # 装备无效，显示空槽图标
                     icon = self.equipment_icons.get(slot_type, "⚡")
-                    icon_surface = self.font.render(icon, True, (128, 128, 128))
+                    icon_surface = render_text(self.font, icon, True, (128, 128, 128))
                     icon_rect = icon_surface.get_rect(center=(sx + sw//2, sy + sh//2))
                     self.screen.blit(icon_surface, icon_rect)
             else:
                 # 绘制空槽图标
                 icon = self.equipment_icons.get(slot_type, "⚡")
-                icon_surface = self.font.render(icon, True, (128, 128, 128))
+                icon_surface = render_text(self.font, icon, True, (128, 128, 128))
                 icon_rect = icon_surface.get_rect(center=(sx + sw//2, sy + sh//2))
                 self.screen.blit(icon_surface, icon_rect)
     
     def draw_inventory_items(self, player):
         """绘制背包物品"""
         # 背包标题
-        inv_title = self.font.render("物品:", True, self.text_color)
+        inv_title = render_text(self.font, "物品:", True, self.text_color)
         self.screen.blit(inv_title, (self.inventory_start_x, self.inventory_start_y - 30))
         
-        # 获取物品计数（用于叠加显示）
-        item_counts = {}
-        for item in player.inventory:
-            item_counts[item] = item_counts.get(item, 0) + 1
-        
-        # 创建显示列表，装备不叠加，消耗品叠加
-        display_items = []
-        seen_items = set()
-        for item in player.inventory:
-            # 装备类物品不叠加，每个都显示
-            if item.startswith("装备_"):
-                display_items.append(item)
-            # 消耗品叠加显示
-            elif item not in seen_items:
-                display_items.append(item)
-                seen_items.add(item)
+        # 显示列表，装备不叠加，消耗品叠加
+        display_items = self._get_display_items(player)
         
         for i, item in enumerate(display_items):
             slot_x = self.inventory_start_x + (i % self.slots_per_row) * (self.slot_size + 5)
@@ -448,21 +416,21 @@ class InventoryUI:
                 text_color = self.text_color
             
             # 绘制物品图标
-            text_surface = self.font.render(item_text, True, text_color)
+            text_surface = render_text(self.font, item_text, True, text_color)
             text_rect = text_surface.get_rect(center=(slot_x + self.slot_size//2, slot_y + self.slot_size//2 - 5))
             self.screen.blit(text_surface, text_rect)
             
             # 绘制数量（只对消耗品显示）
-            count = item_counts[item]
+            count = player.inventory.count(item)
             if count > 1 and not item.startswith("装备_"):
-                count_text = self.font.render(f"x{count}", True, (255, 255, 255))
+                count_text = render_text(self.font, f"x{count}", True, (255, 255, 255))
                 count_rect = count_text.get_rect(bottomright=(slot_x + self.slot_size - 2, slot_y + self.slot_size - 2))
                 self.screen.blit(count_text, count_rect)
     
     def draw_item_info(self, player):
         """绘制物品信息"""
         # 处理装备槽选中的情况
-        if self.selected_equipment_slot is not None and hasattr(player, 'equipped'):
+        if self.selected_equipment_slot is not None:
             if (self.selected_equipment_slot in player.equipped and 
                 player.equipped[self.selected_equipment_slot]):
                 equipment_id = player.equipped[self.selected_equipment_slot]
@@ -495,7 +463,7 @@ class InventoryUI:
             equipment_id = item_name[3:]  # 去掉 "装备_" 前缀
             if equipment_id in self.equipment_list:
                 equipment = self.equipment_list[equipment_id]
-                if equipment and hasattr(equipment, 'name'):  # 检查装备是否有效
+                if equipment:  # 检查装备是否有效
                     info_lines.append(equipment.name)
                     info_lines.append(f"类型: {equipment.type}")
                     info_lines.append(f"等级: {equipment.level_requirement}")
@@ -523,7 +491,7 @@ class InventoryUI:
         # 绘制信息文本
         for i, line in enumerate(info_lines):
             if line:  # 跳过空行
-                text_surface = self.font.render(line, True, self.text_color)
+                text_surface = render_text(self.font, line, True, self.text_color)
                 self.screen.blit(text_surface, (info_x + 5, info_y + 10 + i * 20))
     
     def drop_selected_item(self, player):
@@ -568,18 +536,11 @@ class InventoryUI:
                             self.selected_equipment_slot = slot_type
                             return
                     
-                    # 检查是否在背包物品区域
-                    for i in range(self.inventory_rows * self.slots_per_row):
-                        display_index = i  # 默认显示索引
-                        actual_index = self._get_actual_index(player, display_index)  # 获取实际索引
-                        
-                        slot_x = self.inventory_start_x + (i % self.slots_per_row) * (self.slot_size + 5)
-                        slot_y = self.inventory_start_y + (i // self.slots_per_row) * (self.slot_size + 5)
-                        
-                        if (slot_x <= mx <= slot_x + self.slot_size and 
-                            slot_y <= my <= slot_y + self.slot_size):
-                            self.selected_slot = actual_index  # 更新实际索引
-                            return
+                    # 检查是否在背包物品区域（按格子大小直接算出所在格子）
+                    display_index = self._slot_at(mx, my)
+                    if display_index is not None:
+                        self.selected_slot = self._get_actual_index(player, display_index)  # 更新实际索引
+                        return
                 else:
                     # 鼠标不在背包区域，取消所有选中
                     self.selected_slot = 0
@@ -595,12 +556,11 @@ class InventoryUI:
             self.selected_slot = len(player.inventory) - 1
         
         # 更新装备槽的状态
-        if hasattr(player, 'equipped'):
-            for slot_type in self.equipment_slots.keys():
-                equipment_id = player.equipped.get(slot_type)
-                if equipment_id is None or equipment_id not in self.equipment_list:
-                    # 如果装备无效，自动卸下
-                    self.unequip_item(player, slot_type)
+        for slot_type in self.equipment_slots.keys():
+            equipment_id = player.equipped.get(slot_type)
+            if equipment_id is None or equipment_id not in self.equipment_list:
+                # 如果装备无效，自动卸下
+                self.unequip_item(player, slot_type)
         
         # 自动选择第一个有效物品
         if len(player.inventory) > 0 and self.selected_slot == -1:
@@ -608,14 +568,11 @@ class InventoryUI:
         
         # 确保背包物品的选中状态正确
         display_items = self._get_display_items(player)
-        for i, item in enumerate(display_items):
-            actual_index = self._get_actual_index(player, i)
-            if actual_index != i:
-                # 如果实际索引和显示索引不一致，说明有叠加物品
-                if i == self.selected_slot:
-                    # 如果当前选中的是叠加的物品，更新为实际索引
-                    self.selected_slot = actual_index
-                    break
+        if 0 <= self.selected_slot < len(display_items):
+            actual_index = self._get_actual_index(player, self.selected_slot)
+            if actual_index != self.selected_slot:
+                # 如果实际索引和显示索引不一致，说明有叠加物品，更新为实际索引
+                self.selected_slot = actual_index
         
         # 更新物品信息框
         if self.selected_slot >= 0 and self.selected_slot < len(player.inventory):
@@ -625,7 +582,7 @@ class InventoryUI:
                 if equipment_id in self.equipment_list:
                     equipment = self.equipment_list[equipment_id]
                     # 确保装备的状态是有效的
-                    if not hasattr(equipment, 'name') or equipment.name == "":
+                    if not equipment.name:
                         # 装备无效，自动卸下
                         self.unequip_item(player, equipment.type)
                         self.selected_slot = 0  # 重置选中槽位
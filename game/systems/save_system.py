@@ -1,7 +1,13 @@
 import json
 import os
+import sys
 import pygame
 
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.text_cache import render_text
+
 class SaveSystem:
     """存档系统"""
     SAVE_FILE = "save_data.json"
@@ -21,9 +27,9 @@ class SaveSystem:
                 "exp": player.exp,
                 "gold": player.gold,
                 "attack_power": player.attack_power,
-                "inventory": player.inventory,
-                "equipped": getattr(player, 'equipped', {"weapon": None, "armor": None, "accessory": None}),
-                "base_defense": getattr(player, 'base_defense', 0)
+                "inventory": player.inventory.to_list(),
+                "equipped": player.equipped,
+                "base_defense": player.base_defense
             },
             "game_state": {
                 "wave_number": game_state.wave_number,
@@ -74,7 +80,7 @@ class SaveSystem:
             player.exp = player_data["exp"]
             player.gold = player_data["gold"]
             player.attack_power = player_data["attack_power"]
-            player.inventory = player_data["inventory"]
+            player.inventory.load(player_data["inventory"])
             player.equipped = player_data["equipped"]
             player.base_defense = player_data["base_defense"]
             
@@ -127,7 +133,7 @@ class GameMenu:
         self.screen.fill((0, 0, 0))
         
         # 标题
-        title = self.font.render("艾诺迪亚风格 RPG", True, (255, 255, 255))
+        title = render_text(self.font, "艾诺迪亚风格 RPG", True, (255, 255, 255))
         title_rect = title.get_rect(center=(400, 150))
         self.screen.blit(title, title_rect)
         
@@ -141,12 +147,12 @@ class GameMenu:
             if i == 1 and not SaveSystem.has_save():
                 color = (100, 100, 100)  # 灰色表示不可选
             
-            text = self.font.render(option, True, color)
+            text = render_text(self.font, option, True, color)
             text_rect = text.get_rect(center=(400, 250 + i * 50))
             self.screen.blit(text, text_rect)
         
         # 控制提示
-        help_text = self.font.render("使用上下键选择，回车键确认", True, (200, 200, 200))
+        help_text = render_text(self.font, "使用上下键选择，回车键确认", True, (200, 200, 200))
         help_rect = help_text.get_rect(center=(400, 450))
         self.screen.blit(help_text, help_rect)
         
@@ -167,7 +173,7 @@ class GameMenu:
         self.screen.blit(overlay, (0, 0))
         
         # 暂停标题
-        title = self.font.render("游戏暂停", True, (255, 255, 255))
+        title = render_text(self.font, "游戏暂停", True, (255, 255, 255))
         title_rect = title.get_rect(center=(400, 200))
         self.screen.blit(title, title_rect)
         
@@ -176,7 +182,7 @@ class GameMenu:
         
         for i, option in enumerate(options):
             color = (255, 255, 0) if i == self.selected_option else (255, 255, 255)
-            text = self.font.render(option, True, color)
+            text = render_text(self.font, option, True, color)
             text_rect = text.get_rect(center=(400, 280 + i * 50))
             self.screen.blit(text, text_rect)
         
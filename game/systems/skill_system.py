@@ -34,6 +34,18 @@ class SkillSystem:
             }
         }
     
+    @staticmethod
+    def cooldown_remaining(player, skill_name):
+        """技能剩余冷却时间（毫秒），由时钟的计时器直接查询"""
+        return player.clock.timers.remaining((player, "skill", skill_name))
+    
+    @staticmethod
+    def reset_cooldowns(player):
+        """清除玩家所有技能的冷却"""
+        for skill_name in player.skill_cooldowns:
+            player.clock.timers.cancel((player, "skill", skill_name))
+        player.skill_cooldowns.clear()
+    
     @staticmethod
     def cast_skill(player, skill_name, target_pos=None):
         """释放技能"""
@@ -42,23 +54,20 @@ class SkillSystem:
             return False
             
         skill = skills[skill_name]
-        current_time = pygame.time.get_ticks()
+        current_time = player.clock.get_ticks()
         
         # 检查魔法值
         if player.mp < skill["cost"]:
             return False
             
         # 检查冷却时间
-        if hasattr(player, 'skill_cooldowns'):
-            if skill_name in player.skill_cooldowns:
-                if current_time - player.skill_cooldowns[skill_name] < skill["cooldown"]:
-                    return False
-        else:
-            player.skill_cooldowns = {}
+        if SkillSystem.cooldown_remaining(player, skill_name) > 0:
+            return False
             
-        # 消耗魔法值
+        # 消耗魔法值，记录释放时间并开始冷却计时
         player.mp -= skill["cost"]
         player.skill_cooldowns[skill_name] = current_time
+        player.clock.timers.schedule((player, "skill", skill_name), skill["cooldown"])
         
         # 执行技能效果
         if skill_name == "fireball":
@@ -74,16 +83,15 @@ class SkillSystem:
     def _cast_fireball(player, skill, target_pos):
         """火球术效果"""
         # 创建火球投射物
-        if hasattr(player, 'projectiles'):
-            player.projectiles.append({
-                "type": "fireball",
-                "x": player.x,
-                "y": player.y,
-                "target_x": target_pos[0] if target_pos else player.x + 50,
-                "target_y": target_pos[1] if target_pos else player.y,
-                "damage": skill["damage"],
-                "speed": 5
-            })
+        player.projectiles.spawn(
+            "fireball",
+            player.x,
+            player.y,
+            target_pos[0] if target_pos else player.x + 50,
+            target_pos[1] if target_pos else player.y,
+            speed=5,
+            damage=skill["damage"]
+        )
         return True
     
     @staticmethod
@@ -96,11 +104,9 @@ class SkillSystem:
     @staticmethod
     def _cast_shield(player, skill):
         """护盾术效果"""
-        current_time = pygame.time.get_ticks()
-        if not hasattr(player, 'buffs'):
-            player.buffs = {}
-        player.buffs['shield'] = {
+        current_time = player.clock.get_ticks()
+        player.add_buff('shield', {
             "defense": skill["defense"],
             "end_time": current_time + skill["duration"]
-        }
+        })
         return True
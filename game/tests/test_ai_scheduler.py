@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI细节层次调度测试
+验证远处敌人按轮转隔步更新、外推不穿墙、近处敌人每步更新以及更新预算
+"""
+
+import sys
+import os
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.map import GameMap
+from entities.player import Player
+from entities.enemy import Enemy, PATROL_RADIUS
+from systems.ai_scheduler import AIScheduler
+from core.game_enhanced import Game
+
+
+def far_enemies(game_map, player, count):
+    """在远离玩家的空地上生成敌人"""
+    cells = [(x, y) for x, y in game_map.get_spawn_cells()
+             if (x - player.x) ** 2 + (y - player.y) ** 2 > 300 ** 2]
+    return [Enemy(*random.choice(cells)) for _ in range(count)]
+
+
+def test_round_robin():
+    """测试远处敌人的轮转更新和外推"""
+    print("=== AI调度轮转测试 ===")
+    random.seed(21)
+    game_map = GameMap()
+    player = Player(60, 60)
+    enemies = far_enemies(game_map, player, 200)
+    scheduler = AIScheduler(interval=4)
+
+    ticks = 40
+    for _ in range(ticks):
+        scheduler.update(enemies, player, game_map)
+        for enemy in enemies:
+            assert game_map.can_move_to(enemy.x, enemy.y, enemy.width, enemy.height), "外推不应让敌人进入墙体"
+            center_x, center_y = enemy.patrol_center
+            assert max(abs(enemy.x - center_x), abs(enemy.y - center_y)) < PATROL_RADIUS, "外推不应离开巡逻范围"
+    totals = scheduler.totals
+    assert totals["near_updates"] == 0
+    assert totals["far_updates"] == len(enemies) * ticks // 4, totals
+    assert totals["skipped"] == len(enemies) * ticks * 3 // 4
+    assert 0 < totals["extrapolated"] <= totals["skipped"]
+    print(f"✓ {len(enemies)} 个远处敌人每4步更新一次：{totals}")
+
+    # 错开分组：每一步更新的远处敌人数量相同
+    assert scheduler.last["far_updates"] == len(enemies) // 4
+    print("✓ 远处敌人的更新平均分布在各步")
+
+    # 外推终点离开巡逻范围时不外推，已在范围外时只朝巡逻中心外推
+    enemy = Enemy(400, 300)
+    enemy.x = 400 + PATROL_RADIUS - 5
+    assert scheduler._safe_steps(enemy, enemy.SPEED, 0, None) == 0
+    assert scheduler._safe_steps(enemy, -enemy.SPEED, 0, None) == 3
+    enemy.x = 400 + PATROL_RADIUS + 20
+    assert scheduler._safe_steps(enemy, 0, enemy.SPEED, None) == 0
+    assert scheduler._safe_steps(enemy, -enemy.SPEED, 0, None) == 3
+    print("✓ 外推不会离开巡逻范围")
+
+
+def test_near_and_budget():
+    """测试近处敌人每步更新以及更新预算"""
+    print("=== AI调度预算测试 ===")
+    random.seed(22)
+    game_map = GameMap()
+    player = Player(60, 60)
+    near = Enemy(player.x + 80, player.y)
+    enemies = [near] + far_enemies(game_map, player, 100)
+    scheduler = AIScheduler(interval=4, max_far_updates=5)
+
+    for _ in range(20):
+        scheduler.update(enemies, player, game_map)
+        assert scheduler.last["near_updates"] >= 1, "视野内的敌人每步都应更新"
+        assert scheduler.last["far_updates"] <= 5, "远处敌人的更新不应超出预算"
+    assert scheduler.totals["deferred"] > 0
+    print(f"✓ 近处敌人每步更新，远处敌人每步最多更新5个，推迟 {scheduler.totals['deferred']} 次")
+
+    # interval=1 时与逐个调用 update 完全相同
+    random.seed(23)
+    direct = far_enemies(game_map, player, 30)
+    random.seed(23)
+    scheduled = far_enemies(game_map, player, 30)
+    scheduler = AIScheduler(interval=1)
+    state = random.getstate()
+    for _ in range(10):
+        for enemy in direct:
+            enemy.update(player, game_map)
+    random.setstate(state)
+    for _ in range(10):
+        scheduler.update(scheduled, player, game_map)
+    assert [(e.x, e.y) for e in direct] == [(e.x, e.y) for e in scheduled]
+    print("✓ interval=1 时每步完整更新所有敌人")
+
+
+def test_game_lod():
+    """测试逐个更新敌人时游戏使用调度器"""
+    print("=== 游戏AI调度测试 ===")
+    random.seed(24)
+    assert Game(headless=True).enemy_store is None, "敌人列存储默认关闭，使用调度器"
+    game = Game(headless=True, use_enemy_store=False)
+    game.initialize_game()
+    game.add_enemies(far_enemies(game.game_map, game.player, 50))
+    game.run_headless(60, lambda g, tick: setattr(g.player, "hp", 10 ** 6))
+    totals = game.ai_scheduler.totals
+    assert totals["far_updates"] > 0 and totals["skipped"] > 0, totals
+    assert len(game.ai_scheduler.slots) == len(game.enemies)
+    print(f"✓ 60步内跳过 {totals['skipped']} 次远处敌人的完整更新")
+
+
+if __name__ == "__main__":
+    test_round_robin()
+    test_near_and_budget()
+    test_game_lod()
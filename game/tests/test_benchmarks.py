@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试的冒烟测试
+用很少的步数跑几个场景，验证场景准备和JSON结果格式
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import main
+
+
+def test_benchmark_smoke():
+    """测试基准测试脚本"""
+    print("=== 性能基准冒烟测试 ===")
+    path = os.path.join(tempfile.mkdtemp(), "bench.json")
+    main(["enemies_10", "fireball_spam", "inventory_full", "wave_50", "--ticks", "5", "--output", path])
+
+    with open(path, encoding="utf-8") as f:
+        results = json.load(f)
+    scenarios = results["scenarios"]
+    assert set(scenarios) == {"enemies_10", "fireball_spam", "inventory_full", "wave_50"}
+    for name, result in scenarios.items():
+        assert result["ms_per_tick"]["samples"] == 5 and result["ms_per_frame"]["samples"] == 5, f"{name} 样本数错误"
+    assert scenarios["enemies_10"]["enemies"] == 10, "应生成10个敌人"
+    assert scenarios["fireball_spam"]["projectiles"] > 0, "应有火球在飞行"
+    assert scenarios["wave_50"]["enemies"] == 52, "第50波应有52个敌人"
+    assert "inventory_ui" in scenarios["inventory_full"]["stages"], "应统计背包界面耗时"
+    print("✓ 场景运行并写出JSON")
+
+
+if __name__ == "__main__":
+    test_benchmark_smoke()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+游戏时钟测试
+验证虚拟时间、实时时间、暂停和时间倍率，以及冷却计时读取注入的时钟
+"""
+
+import sys
+import os
+import time
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from core.clock import GameClock
+from entities.player import Player
+from entities.enemy import Enemy
+from systems.skill_system import SkillSystem
+
+
+def test_virtual_clock():
+    """测试虚拟时钟"""
+    print("=== 虚拟时钟测试 ===")
+    clock = GameClock(virtual=True)
+    clock.advance(100)
+    assert clock.get_ticks() == 100
+
+    clock.time_scale = 2.0
+    clock.advance(100)
+    assert clock.get_ticks() == 300, "时间倍率应作用于推进的时间"
+
+    clock.pause()
+    clock.advance(1000)
+    assert clock.get_ticks() == 300, "暂停时时间不应前进"
+    clock.resume()
+    clock.advance(50)
+    assert clock.get_ticks() == 400
+    print("✓ 虚拟时间、倍率、暂停正确")
+
+
+def test_real_clock():
+    """测试实时时钟"""
+    print("=== 实时时钟测试 ===")
+    pygame.init()
+    clock = GameClock()
+    time.sleep(0.05)
+    assert clock.get_ticks() >= 40, "实时时钟应随真实时间流逝"
+
+    clock.pause()
+    paused_at = clock.get_ticks()
+    time.sleep(0.05)
+    assert clock.get_ticks() == paused_at, "暂停期间时间不应流逝"
+    clock.resume()
+
+    clock.time_scale = 0
+    frozen_at = clock.get_ticks()
+    time.sleep(0.05)
+    assert clock.get_ticks() == frozen_at, "倍率为0时时间不应流逝"
+    print("✓ 实时时间、暂停、倍率正确")
+
+
+def test_cooldowns_use_injected_clock():
+    """测试冷却计时读取注入的时钟"""
+    print("=== 冷却计时测试 ===")
+    clock = GameClock(virtual=True)
+    player = Player(x=100, y=100, clock=clock)
+    enemy = Enemy(x=120, y=100, clock=clock)
+
+    clock.advance(2000)
+    assert enemy.can_attack()
+    assert not enemy.can_attack(), "攻击后应进入冷却"
+    clock.advance(1501)
+    assert enemy.can_attack(), "冷却时间过后应能再次攻击"
+
+    assert SkillSystem.cast_skill(player, "shield")
+    assert "shield" in player.buffs
+    clock.pause()
+    clock.advance(20000)
+    player.update_buffs()
+    assert "shield" in player.buffs, "暂停期间增益不应过期"
+    clock.resume()
+    clock.advance(10001)
+    player.update_buffs()
+    assert "shield" not in player.buffs, "持续时间过后增益应过期"
+    print("✓ 攻击冷却和增益按注入的时钟计时")
+
+
+if __name__ == "__main__":
+    test_virtual_clock()
+    test_real_clock()
+    test_cooldowns_use_injected_clock()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+碰撞网格测试
+验证可走性网格、单点检测和批量检测的结果与逐角检测一致
+"""
+
+import sys
+import os
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.map import GameMap
+
+
+def corners_can_move(game_map, x, y, width, height):
+    """参考实现：逐个检查实体四个角"""
+    corners = [
+        (x - width//2, y - height//2),
+        (x + width//2, y - height//2),
+        (x - width//2, y + height//2),
+        (x + width//2, y + height//2),
+    ]
+    return not any(game_map.is_wall(cx, cy) for cx, cy in corners)
+
+
+def test_collision_grid():
+    """测试碰撞网格"""
+    print("=== 碰撞网格测试 ===")
+    random.seed(1)
+    game_map = GameMap()
+
+    for size in (20, 28, 35):
+        xs = [random.uniform(-40, 840) for _ in range(500)]
+        ys = [random.uniform(-40, 640) for _ in range(500)]
+        expected = [corners_can_move(game_map, x, y, size, size) for x, y in zip(xs, ys)]
+        single = [game_map.can_move_to(x, y, size, size) for x, y in zip(xs, ys)]
+        batch = game_map.can_move_to_many(xs, ys, size, size)
+        assert single == expected, f"尺寸{size}的单点检测结果不一致"
+        assert batch == expected, f"尺寸{size}的批量检测结果不一致"
+        print(f"✓ 尺寸{size}: 单点与批量检测一致")
+
+    # 修改地块后可走性网格同步更新
+    game_map.set_tile(5, 5, 1)
+    assert game_map.is_wall(5 * GameMap.TILE_SIZE + 1, 5 * GameMap.TILE_SIZE + 1)
+    game_map.set_tile(5, 5, 0)
+    assert not game_map.is_wall(5 * GameMap.TILE_SIZE + 1, 5 * GameMap.TILE_SIZE + 1)
+    print("✓ 地块修改同步到可走性网格")
+
+
+if __name__ == "__main__":
+    test_collision_grid()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+脏矩形渲染测试
+验证脏矩形渲染的画面与整屏重绘逐像素相同，且静止画面只提交很小的区域
+"""
+
+import sys
+import os
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from core.game_enhanced import Game
+from systems.skill_system import SkillSystem
+
+
+def render_full_reference(game, surface):
+    """在另一个Surface上整屏重绘当前画面，不影响脏矩形渲染的状态"""
+    saved = (game.screen, game.needs_full_redraw, game.entity_draws)
+    game.screen = surface
+    game.dirty_rendering = False
+    game.render_game()
+    game.screen, game.needs_full_redraw, game.entity_draws = saved
+    game.dirty_rendering = True
+
+
+def test_dirty_render():
+    """测试脏矩形渲染"""
+    print("=== 脏矩形渲染测试 ===")
+    random.seed(5)
+    game = Game(headless=True)
+    game.initialize_game()
+    game.game_state_mode = "playing"
+    reference = pygame.Surface(game.screen.get_size())
+
+    mismatches = 0
+    for tick in range(400):
+        player = game.player
+        player.hp = max(player.hp, 50)
+        if tick % 20 == 0:
+            player.mp = player.max_mp
+            SkillSystem.reset_cooldowns(player)
+            SkillSystem.cast_skill(player, "fireball", (random.randint(0, 800), random.randint(0, 600)))
+        if tick == 100:
+            SkillSystem.cast_skill(player, "shield")
+        if tick == 200:
+            game.game_map.set_tile(3, 3, 1 - game.game_map.grid[3][3])  # 地图改变后整屏重绘
+        game.inventory_ui.is_open = 300 <= tick < 310  # 背包打开期间整屏重绘
+
+        game.step()
+        game.render_game()
+        if game.inventory_ui.is_open:
+            continue  # 背包绘制在游戏窗口上，参考画面里没有
+        render_full_reference(game, reference)
+        if pygame.image.tobytes(game.screen, "RGB") != pygame.image.tobytes(reference, "RGB"):
+            mismatches += 1
+    assert mismatches == 0, f"{mismatches} 帧与整屏重绘不一致"
+    print("✓ 脏矩形渲染与整屏重绘逐像素相同")
+
+    # 画面静止时只提交实体所在的小块区域
+    for enemy in game.enemies[:]:
+        game.remove_enemy(enemy)
+    game.player.projectiles.clear()
+    game.render_game()
+    rects = game.render_game_dirty()
+    area = sum(rect.width * rect.height for rect in rects)
+    assert area * 10 < 800 * 600, f"静止画面的脏区域过大: {area}"
+    print(f"✓ 静止画面只更新 {area} 像素")
+
+
+if __name__ == "__main__":
+    test_dirty_render()
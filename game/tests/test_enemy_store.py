@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+敌人列存储测试
+验证向量化的状态切换和追击移动与逐个敌人计算一致，以及视图的读写和移除
+"""
+
+import sys
+import os
+import copy
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.map import GameMap
+from entities.player import Player
+from entities.enemy import Enemy
+from entities.enemy_store import EnemyStore, EnemyView, np
+
+
+def make_enemies(game_map, count):
+    """在空地上随机生成各种类型的敌人，部分带有玩家最后出现的位置"""
+    cells = game_map.get_spawn_cells(35, 35)
+    enemies = []
+    for _ in range(count):
+        x, y = random.choice(cells)
+        enemy = Enemy(x, y, random.choice(["basic", "elite", "boss"]))
+        if random.random() < 0.5:
+            enemy.player_last_seen = (random.randint(0, 800), random.randint(0, 600))
+        enemies.append(enemy)
+    return enemies
+
+
+def snapshot(enemy):
+    return (enemy.x, enemy.y, enemy.hp, enemy.ai_state, enemy.direction,
+            enemy.player_last_seen, enemy.patrol_center, enemy.last_attack_time)
+
+
+def test_vectorized_ai():
+    """测试向量化的状态切换和追击"""
+    print("=== 敌人列存储AI测试 ===")
+    if np is None:
+        print("✓ 未安装NumPy，跳过向量化测试")
+        return
+    random.seed(11)
+    game_map = GameMap()
+    player = Player(400, 300)
+    scalar = make_enemies(game_map, 300)
+    store = EnemyStore()
+    views = [store.add(copy.copy(enemy)) for enemy in scalar]
+    assert [snapshot(v) for v in views] == [snapshot(e) for e in scalar], "视图应保留原敌人的属性"
+
+    for step in range(40):
+        player.x, player.y = random.choice(game_map.get_spawn_cells())
+        store.update_states(player)
+        for enemy in scalar:
+            enemy.update_ai_state(player, enemy.distance_to_player(player))
+        assert [snapshot(v) for v in views] == [snapshot(e) for e in scalar], f"第{step}步状态切换不一致"
+
+        # 追击移动与 Enemy.chase_player 逐个计算的结果相同
+        store.move_chasers(player, game_map)
+        for enemy in scalar:
+            if enemy.ai_state == "chase":
+                enemy.chase_player(player, game_map)
+        for view, enemy in zip(views, scalar):
+            assert abs(view.x - enemy.x) < 1e-9 and abs(view.y - enemy.y) < 1e-9, f"第{step}步追击位置不一致"
+    print(f"✓ 40步内 {len(views)} 个敌人的状态切换和追击与逐个计算一致")
+
+    # 巡逻使用存储自己的随机数，只检查移动合法：原本不在墙里的敌人不会走进墙体
+    for view in views:
+        view.ai_state = "patrol"
+        view.player_last_seen = None
+    free = [view for view in views if game_map.can_move_to(view.x, view.y, view.width, view.height)]
+    for _ in range(30):
+        store.move_patrollers(game_map)
+    for view in free:
+        assert game_map.can_move_to(view.x, view.y, view.width, view.height), "巡逻的敌人不应进入墙体"
+    print("✓ 向量化巡逻不会让敌人进入墙体")
+
+
+def test_views():
+    """测试视图读写、移除和无NumPy时的回退"""
+    print("=== 敌人视图测试 ===")
+    random.seed(12)
+    game_map = GameMap()
+    player = Player(400, 300)
+    for use_numpy in ([False, True] if np is not None else [False]):
+        store = EnemyStore(use_numpy=use_numpy)
+        views = [store.add(enemy) for enemy in make_enemies(game_map, 10)]
+        assert all(isinstance(view, EnemyView) for view in views)
+
+        views[3].hp -= 15
+        views[3].ai_state = "attack"
+        views[3].patrol_center = (64, 96)
+        assert views[3].hp == store.hp[3] and views[3].ai_state == "attack" and views[3].patrol_center == (64, 96)
+
+        # 移除后最后一行补到空位，被移除的视图仍可读写
+        removed, last = views[3], views[-1]
+        before = snapshot(removed)
+        store.remove(removed)
+        assert len(store) == 9 and last._index == 3 and store.views[3] is last
+        assert snapshot(removed) == before, "移除后的视图应保留属性"
+        removed.hp -= 5
+        removed.x += 3
+        assert removed.hp == before[2] - 5 and removed.get_rect().centerx == int(before[0] + 3)
+
+        # 已死亡的敌人不参与状态切换
+        dead = store.views[0]
+        dead.x, dead.y, dead.hp = player.x + 10, player.y, 0
+        dead.ai_state, dead.player_last_seen = "patrol", None
+        store.update_states(player)
+        assert dead.ai_state == "patrol" and dead.player_last_seen is None, "死亡的敌人不应切换状态"
+        dead.hp = 1
+        store.update_states(player)
+        assert dead.ai_state == "attack"
+
+        # 无论是否使用NumPy，update 都能驱动所有敌人
+        for _ in range(20):
+            store.update(player, game_map)
+        distances = store.distances_to(player.x, player.y)
+        for view in store.views:
+            assert abs(distances[view._index] - view.distance_to_player(player)) < 1e-9
+        store.clear()
+        assert len(store) == 0
+        print(f"✓ use_numpy={use_numpy}: 视图读写、移除和更新正常")
+
+
+if __name__ == "__main__":
+    test_vectorized_ai()
+    test_views()
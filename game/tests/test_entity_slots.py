@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+实体属性测试
+验证玩家、敌人和物品使用 __slots__，可选属性在创建时就有默认值
+"""
+
+import sys
+import os
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.player import Player
+from entities.enemy import Enemy
+from entities.item import Item
+from systems.equipment import EquipmentSystem
+
+
+def test_entity_slots():
+    """测试实体属性"""
+    print("=== 实体属性测试 ===")
+    player = Player(100, 100)
+    entities = [player, Enemy(50, 50), Enemy(50, 50, "boss"), Item("Gold", 10, 10)]
+    for entity in entities:
+        assert not hasattr(entity, "__dict__"), f"{type(entity).__name__} 不应有 __dict__"
+    try:
+        player.unknown_attribute = 1
+        assert False, "不应能添加未声明的属性"
+    except AttributeError:
+        pass
+    print("✓ 实体没有 __dict__，不能随意添加属性")
+
+    # 可选属性的默认值
+    assert player.equipped == {"weapon": None, "armor": None, "accessory": None}
+    assert player.base_defense == 0 and player.get_effective_defense() == 0
+    assert entities[1].SPEED == 2 and entities[2].SPEED == 2.5 and entities[2].COLOR == (100, 0, 0)
+    assert entities[3].equipment_id is None
+    print("✓ 可选属性有默认值，敌人类型的速度和颜色正确")
+
+    # 装备掉落物拾取后进入背包，再装备到身上
+    equipment_id, equipment = next((eid, eq) for eid, eq in EquipmentSystem.get_all_equipment().items()
+                                    if eq.level_requirement <= 1 and "defense" in eq.stats)
+    message = player.pick_up(Item(f"装备_{equipment_id}", 0, 0, equipment_id=equipment_id))
+    assert player.inventory.to_list() == [f"装备_{equipment_id}"], message
+    assert EquipmentSystem.equip_item(player, equipment_id)
+    assert player.equipped[equipment.type] == equipment_id
+    assert player.get_effective_defense() == equipment.stats["defense"]
+    assert EquipmentSystem.unequip_item(player, equipment.type) and player.base_defense == 0
+    print("✓ 装备的拾取、装备和卸下正常")
+
+
+if __name__ == "__main__":
+    test_entity_slots()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+装备表测试
+验证装备只创建一次、ID和类型/等级索引，以及背包界面按装备自带的ID装备
+"""
+
+import sys
+import os
+
+import pygame
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from systems.equipment import EquipmentSystem, EQUIPMENT_REGISTRY
+from systems.inventory import InventoryUI
+from entities.player import Player
+
+
+def test_registry_indexes():
+    """测试装备表和索引"""
+    print("=== 装备表测试 ===")
+    all_equipment = EquipmentSystem.get_all_equipment()
+    assert EquipmentSystem.get_all_equipment() is all_equipment, "装备表只创建一次"
+    assert len(EQUIPMENT_REGISTRY) == len(all_equipment) == 17
+    for equipment_id, equipment in all_equipment.items():
+        assert equipment.id == equipment_id and EquipmentSystem.get_equipment(equipment_id) is equipment
+    assert EquipmentSystem.get_equipment("missing") is None
+    print("✓ 每件装备记录自己的ID，按ID直接查询")
+
+    by_type = {t: sorted(EQUIPMENT_REGISTRY.of_type(t)) for t in ("weapon", "armor", "accessory")}
+    for equipment_type, ids in by_type.items():
+        assert ids == sorted(i for i, e in all_equipment.items() if e.type == equipment_type)
+    assert sum(map(len, by_type.values())) == len(all_equipment)
+    for level in range(0, 20):
+        expected = {i for i, e in all_equipment.items() if e.level_requirement <= level}
+        assert set(EQUIPMENT_REGISTRY.usable_at(level)) == expected
+    print("✓ 按槽位类型和等级要求的索引正确")
+
+
+def test_equip_by_id():
+    """测试装备和卸下"""
+    print("=== 装备查询测试 ===")
+    pygame.init()
+    ui = InventoryUI(pygame.Surface((800, 600)), pygame.font.Font(None, 20))
+    player = Player(100, 100)
+    player.inventory.extend(["装备_iron_sword", "装备_leather_armor"])
+    assert ui.use_item(player, 0) == "装备了 铁剑"
+    assert player.equipped["weapon"] == "iron_sword" and player.inventory.to_list() == ["装备_leather_armor"]
+    assert ui.unequip_item(player, "weapon") == "卸下了 铁剑"
+
+    attack = player.attack_power
+    assert EquipmentSystem.equip_item(player, "steel_sword") is False, "等级不足时不能装备"
+    player.level = 3
+    assert EquipmentSystem.equip_item(player, "steel_sword") and player.attack_power == attack + 25
+    assert EquipmentSystem.unequip_item(player, "weapon") and player.attack_power == attack
+    print("✓ 背包界面和装备系统通过ID装备、卸下")
+
+
+if __name__ == "__main__":
+    test_registry_indexes()
+    test_equip_by_id()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字体缓存测试
+验证字体按 (字体文件, 字号) 缓存、字体路径写入磁盘缓存后不再扫描系统字体
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+import pygame
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.font_manager import FontManager
+
+
+def test_font_cache():
+    """测试进程内字体缓存和磁盘缓存"""
+    print("=== 字体缓存测试 ===")
+    original = FontManager.CACHE_FILE
+    assert os.path.isabs(original), "缓存文件路径不应依赖当前工作目录"
+    FontManager.CACHE_FILE = os.path.join(tempfile.mkdtemp(), "font_cache.json")
+    try:
+        pygame.init()
+        FontManager.clear_cache()
+        font = FontManager.get_chinese_font(20)
+        assert FontManager.get_chinese_font(20) is font, "同一字号应返回同一个字体对象"
+        assert FontManager.get_chinese_font(16) is not font
+        expected = {"path": FontManager._face} if FontManager._face is not None else None
+        assert FontManager.load_cache() == expected, "找到的字体写入缓存，没有可用字体时不写"
+        print("✓ 字体按字号缓存，字体路径写入缓存文件")
+
+        # 再次启动时直接使用缓存的路径，不扫描系统字体
+        default_face = os.path.join(os.path.dirname(pygame.__file__), pygame.font.get_default_font())
+        scans = []
+        scan = FontManager.find_chinese_face
+
+        def counting_scan():
+            scans.append(1)
+            return scan()
+        FontManager.find_chinese_face = staticmethod(counting_scan)
+        try:
+            FontManager.save_cache(default_face)
+            FontManager._resolved = False
+            FontManager._fonts.clear()
+            FontManager.get_chinese_font(20).render("测试", True, (255, 255, 255))
+            assert not scans and FontManager._face == default_face, "有缓存时不应扫描系统字体"
+            print("✓ 有缓存时跳过系统字体扫描")
+
+            # 缓存记录的字体文件不存在或为空时重新扫描
+            for stale in ("/missing/font.ttf", None):
+                with open(FontManager.CACHE_FILE, 'w', encoding='utf-8') as f:
+                    json.dump({"path": stale}, f)
+                assert FontManager.load_cache() is None
+                FontManager._resolved = False
+                FontManager.get_chinese_font(20)
+                assert scans.pop() and not scans
+        finally:
+            FontManager.find_chinese_face = scan
+        print("✓ 缓存失效或没有记录字体时重新扫描")
+
+        # pygame.quit() 后重新加载字体
+        pygame.quit()
+        assert not FontManager._fonts
+        pygame.init()
+        FontManager.get_chinese_font(20).render("测试", True, (255, 255, 255))
+        print("✓ pygame.quit() 后清空进程内的字体缓存")
+    finally:
+        FontManager.clear_cache()
+        FontManager.CACHE_FILE = original
+
+
+if __name__ == "__main__":
+    test_font_cache()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无头模拟测试
+验证无头模式下由虚拟时钟和脚本输入驱动游戏，且远快于实时
+"""
+
+import sys
+import os
+import time
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from core.game_enhanced import Game
+from systems.skill_system import SkillSystem
+
+
+def test_headless_simulation():
+    """测试无头模拟"""
+    print("=== 无头模拟测试 ===")
+    random.seed(9)
+    game = Game(headless=True)
+    game.initialize_game()
+    start_x = game.player.x
+
+    def hold_right(game, tick):
+        """前60步按住D键向右移动，之后松开"""
+        if tick == 0:
+            game.input.press(pygame.K_d)
+        elif tick == 60:
+            game.input.release(pygame.K_d)
+
+    started = time.perf_counter()
+    ticks = game.run_headless(600, controller=hold_right)
+    elapsed = time.perf_counter() - started
+
+    assert game.player.x != start_x or not game.game_map.can_move_to(start_x + 4, game.player.y), "脚本输入应能移动玩家"
+    assert game.sim_clock.get_ticks() == round(ticks * game.timestep.step_ms), "虚拟时钟应按模拟步推进"
+    print(f"✓ 模拟 {ticks} 步（虚拟 {game.sim_clock.get_ticks() / 1000:.1f} 秒）用时 {elapsed:.3f} 秒")
+    assert elapsed < ticks / 60, "无头模拟应快于实时"
+
+    # 技能冷却按虚拟时间计算：护盾术冷却8秒
+    game.player.hp = game.player.max_hp = 10 ** 6  # 避免测试中途死亡
+    game.player.mp = game.player.max_mp
+    assert SkillSystem.cast_skill(game.player, "shield")
+    game.player.mp = game.player.max_mp
+    assert not SkillSystem.cast_skill(game.player, "shield"), "冷却中不能释放"
+    game.run_headless(int(8000 / game.timestep.step_ms) + 2)
+    game.player.mp = game.player.max_mp
+    assert SkillSystem.cast_skill(game.player, "shield"), "虚拟时间过去8秒后冷却应结束"
+    print("✓ 技能冷却按虚拟时间计算")
+
+
+if __name__ == "__main__":
+    test_headless_simulation()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+背包容器测试
+验证叠加计数、装备槽位、旧列表视图、拾取容量检查以及存档读写
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.inventory import Inventory, MAX_SLOTS
+from entities.player import Player
+from entities.item import Item
+from core.game_state import GameState
+from systems.save_system import SaveSystem
+
+
+def test_counts_and_slots():
+    """测试叠加计数和槽位顺序"""
+    print("=== 背包容器测试 ===")
+    inventory = Inventory(["血瓶", "装备_iron_sword", "血瓶", "装备_iron_sword", "Gold"])
+    assert len(inventory) == 5 and inventory.count("血瓶") == 2 and inventory.count("装备_iron_sword") == 2
+    assert inventory.slot_count() == 4, "血瓶叠加在一个槽位，每件装备单独占一个槽位"
+    assert [name for _, name, _ in inventory.slot_items()] == ["血瓶", "装备_iron_sword", "装备_iron_sword", "Gold"]
+    assert inventory.to_list() == ["血瓶", "血瓶", "装备_iron_sword", "装备_iron_sword", "Gold"]
+    assert inventory.stack_items() == (("血瓶", 2), ("Gold", 1))
+    print("✓ 叠加物品记数量，装备按加入顺序各占一个槽位")
+
+    version = inventory.version
+    inventory.remove("血瓶")
+    assert inventory.count("血瓶") == 1 and inventory.slot_count() == 4 and inventory.version > version
+    assert inventory.pop(1) == "装备_iron_sword" and inventory.count("装备_iron_sword") == 1
+    inventory.remove("血瓶")
+    assert "血瓶" not in inventory and inventory.to_list() == ["装备_iron_sword", "Gold"]
+    assert inventory[0] == "装备_iron_sword" and list(inventory) == inventory.to_list()
+    try:
+        inventory.remove("血瓶")
+        assert False, "移除不存在的物品应抛出 ValueError"
+    except ValueError:
+        pass
+    print("✓ 移除、弹出和旧列表视图正确，每次修改递增版本号")
+
+    # 随机操作后数量与普通列表一致
+    random.seed(51)
+    names = ["血瓶", "Gold", "装备_iron_sword", "装备_magic_ring"]
+    inventory, plain = Inventory(), []
+    for _ in range(2000):
+        name = random.choice(names)
+        if random.random() < 0.6:
+            inventory.add(name)
+            plain.append(name)
+        elif name in plain:
+            inventory.remove(name)
+            plain.remove(name)
+        for check in names:
+            assert inventory.count(check) == plain.count(check)
+    assert sorted(inventory.to_list()) == sorted(plain)
+    print("✓ 随机增删后各物品数量与列表一致")
+
+
+def test_pick_up_capacity():
+    """测试拾取时的容量检查"""
+    print("=== 拾取容量测试 ===")
+    player = Player(100, 100)
+    player.inventory.add("血瓶", 10)
+    assert player.pick_up(Item("血瓶", 0, 0)) == "血瓶已满！(最多10个)"
+    for i in range(MAX_SLOTS - 1):
+        assert "已放入背包" in player.pick_up(Item("装备_iron_sword", 0, 0, equipment_id="iron_sword"))
+    assert player.inventory.slot_count() == MAX_SLOTS
+    assert player.pick_up(Item("装备_iron_sword", 0, 0, equipment_id="iron_sword")) == "背包已满！"
+    player.inventory.remove("血瓶")
+    assert player.pick_up(Item("血瓶", 0, 0)) == "拾取了血瓶！", "已有的叠加物品不占新槽位"
+    print("✓ 槽位满时不能拾取新物品，已有的叠加物品仍可拾取")
+
+    # 旧脚本直接给背包赋值字符串列表
+    player = Player(100, 100)
+    player.inventory = ["血瓶", "装备_iron_sword", "血瓶"]
+    assert isinstance(player.inventory, Inventory) and player.inventory.count("血瓶") == 2
+    assert player.pick_up(Item("钥匙", 0, 0)) == "拾取了 钥匙！"
+    assert [name for _, name, _ in player.inventory.slot_items()] == ["血瓶", "装备_iron_sword", "钥匙"]
+    print("✓ 赋值旧格式列表时包装为背包容器")
+
+
+def test_save_round_trip():
+    """测试存档读写背包"""
+    print("=== 背包存档测试 ===")
+    original = SaveSystem.SAVE_FILE
+    SaveSystem.SAVE_FILE = os.path.join(tempfile.mkdtemp(), "save_data.json")
+    try:
+        player = Player(100, 100)
+        player.inventory.extend(["装备_magic_ring", "血瓶", "血瓶", "装备_iron_sword"])
+        assert SaveSystem.save_game(player, GameState())
+        loaded = Player(0, 0)
+        assert SaveSystem.apply_save_data(loaded, GameState(), SaveSystem.load_game())
+        assert isinstance(loaded.inventory, Inventory)
+        assert loaded.inventory.to_list() == player.inventory.to_list()
+        assert loaded.inventory.slot_items() == player.inventory.slot_items()
+    finally:
+        SaveSystem.SAVE_FILE = original
+    print("✓ 存档保存旧格式列表，读档后槽位和数量不变")
+
+
+if __name__ == "__main__":
+    test_counts_and_slots()
+    test_pick_up_capacity()
+    test_save_round_trip()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+背包界面索引映射测试
+验证显示列表和索引映射按背包版本号缓存、结果与原来的逐项扫描一致，以及格子命中计算
+"""
+
+import sys
+import os
+import random
+
+import pygame
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.player import Player
+from systems.inventory import InventoryUI
+
+
+def old_display_items(inventory):
+    """原来逐项去重的显示列表"""
+    display_items, seen_items = [], set()
+    for item in inventory:
+        if item.startswith("装备_"):
+            display_items.append(item)
+        elif item not in seen_items:
+            display_items.append(item)
+            seen_items.add(item)
+    return display_items
+
+
+def old_actual_index(inventory, display_index):
+    """原来两次线性扫描求实际索引"""
+    display_items = old_display_items(inventory)
+    if display_index < 0 or display_index >= len(display_items):
+        return 0
+    target_item = display_items[display_index]
+    same_item_count = display_items[:display_index].count(target_item)
+    found_count = 0
+    for i, item in enumerate(inventory):
+        if item == target_item:
+            if found_count == same_item_count:
+                return i
+            found_count += 1
+    return 0
+
+
+def make_ui():
+    pygame.init()
+    return InventoryUI(pygame.Surface((800, 600)), pygame.font.Font(None, 20))
+
+
+def test_cached_mapping():
+    """测试映射结果和缓存"""
+    print("=== 背包索引映射测试 ===")
+    ui = make_ui()
+    player = Player(100, 100)
+    random.seed(61)
+    names = ["血瓶", "Gold", "装备_iron_sword", "装备_magic_ring", "装备_leather_armor"]
+    for _ in range(300):
+        if random.random() < 0.7 or not len(player.inventory):
+            player.inventory.add(random.choice(names))
+        else:
+            player.inventory.pop(random.randrange(len(player.inventory)))
+        legacy = player.inventory.to_list()
+        display_items = ui._get_display_items(player)
+        assert display_items == old_display_items(legacy)
+        for i in range(-1, len(display_items) + 2):
+            assert ui._get_actual_index(player, i) == old_actual_index(legacy, i)
+        for actual in range(len(legacy)):
+            display_index = ui._get_display_index(player, actual)
+            assert ui._get_actual_index(player, display_index) <= actual
+            assert display_items[display_index] == legacy[actual]
+    print("✓ 显示列表和索引映射与逐项扫描一致")
+
+    version = player.inventory.version
+    display_items = ui._get_display_items(player)
+    for i in range(32):
+        ui._get_actual_index(player, i)
+    assert ui._get_display_items(player) is display_items and ui._layout_version == version
+    player.inventory.add("血瓶")
+    assert ui._get_display_items(player) is not display_items, "背包修改后应重新计算"
+    print("✓ 背包未修改时重复查询使用缓存")
+
+
+def test_slot_hit_testing():
+    """测试格子命中计算与逐格检查一致"""
+    print("=== 背包格子命中测试 ===")
+    ui = make_ui()
+    stride = ui.slot_size + 5
+    for my in range(ui.inventory_start_y - 10, ui.inventory_start_y + 4 * stride + 10, 3):
+        for mx in range(ui.inventory_start_x - 10, ui.inventory_start_x + 8 * stride + 10, 3):
+            expected = None
+            for i in range(ui.inventory_rows * ui.slots_per_row):
+                slot_x = ui.inventory_start_x + (i % ui.slots_per_row) * stride
+                slot_y = ui.inventory_start_y + (i // ui.slots_per_row) * stride
+                if slot_x <= mx <= slot_x + ui.slot_size and slot_y <= my <= slot_y + ui.slot_size:
+                    expected = i
+                    break
+            assert ui._slot_at(mx, my) == expected, (mx, my)
+    print("✓ 直接计算的格子与逐格检查一致")
+
+    # 鼠标移动和点击使用同一套格子计算
+    player = Player(100, 100)
+    player.inventory.extend(["血瓶", "血瓶", "装备_iron_sword"])
+    ui.is_open = True
+    center = (ui.inventory_start_x + stride + 10, ui.inventory_start_y + 10)
+    ui.handle_event(pygame.event.Event(pygame.MOUSEMOTION, pos=center), player)
+    assert ui.selected_slot == 2, "鼠标移动时选中第2格物品的实际索引"
+    assert ui.handle_mouse_click(center, player) == "选中了 装备_iron_sword" and ui.selected_slot == 1
+    assert ui.handle_mouse_click((ui.inventory_start_x + 10, ui.inventory_start_y + 10), player) == "选中了 血瓶 x2"
+    print("✓ 鼠标移动和点击选中正确的格子")
+
+
+if __name__ == "__main__":
+    test_cached_mapping()
+    test_slot_hit_testing()
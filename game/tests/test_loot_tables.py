@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+掉落表测试
+验证编译后的掉落表与原来的掉落结果一致、按权重抽样、必定掉落以及批量生成
+"""
+
+import sys
+import os
+import random
+from collections import Counter
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import systems.equipment as equipment_module
+from systems.equipment import LootSystem, LootTable, ITEM_WEIGHTS, GUARANTEED_DROPS
+
+
+def old_generate_loot(enemy_level):
+    """原来每次拼接可掉落列表的实现"""
+    loot = [{"type": "gold", "amount": random.randint(5, 20) * enemy_level}]
+    if random.random() < 0.15:
+        loot.append({"type": "item", "name": "血瓶"})
+    if random.random() < 0.2 + (enemy_level * 0.05):
+        available = []
+        if enemy_level >= 1:
+            available.extend(["iron_sword", "leather_armor", "basic_ring"])
+        if enemy_level >= 3:
+            available.extend(["steel_sword", "chain_armor", "magic_ring"])
+        if enemy_level >= 5:
+            available.extend(["silver_sword", "plate_armor", "power_ring"])
+        if enemy_level >= 7:
+            available.extend(["magic_sword", "magic_armor", "wisdom_ring", "health_amulet"])
+        if enemy_level >= 9:
+            available.extend(["dragon_sword", "dragon_armor", "master_ring"])
+        if enemy_level >= 15:
+            available.append("dragon_amulet")
+        loot.append({"type": "equipment", "id": random.choice(available)})
+    return loot
+
+
+def test_same_as_before():
+    """测试默认掉落表与原来的结果一致"""
+    print("=== 掉落表兼容测试 ===")
+    LootSystem.reset_loot_tables()
+    levels = list(range(1, 21)) * 50
+    random.seed(72)
+    expected = [old_generate_loot(level) for level in levels]
+    random.seed(72)
+    assert [LootSystem.generate_loot(level) for level in levels] == expected
+    assert LootSystem.get_loot_table(3) is LootSystem.get_loot_table(3), "每个等级只编译一次"
+    assert LootSystem.get_loot_table(40) is LootSystem.get_loot_table(15)
+    print("✓ 相同随机种子下掉落结果与原来一致")
+
+
+def test_weights_and_guaranteed():
+    """测试权重抽样和必定掉落"""
+    print("=== 掉落权重测试 ===")
+    table = LootTable([("a", 1), ("b", 3), ("c", 6)])
+    random.seed(73)
+    counts = Counter(table.sample() for _ in range(20000))
+    for equipment_id, weight in (("a", 0.1), ("b", 0.3), ("c", 0.6)):
+        assert abs(counts[equipment_id] / 20000 - weight) < 0.02, counts
+    assert LootTable([]).sample() is None
+    print(f"✓ 别名法按权重抽样：{dict(counts)}")
+
+    ITEM_WEIGHTS["iron_sword"] = 0
+    GUARANTEED_DROPS.append((5, {"type": "item", "name": "血瓶"}))
+    LootSystem.reset_loot_tables()
+    try:
+        assert "iron_sword" not in LootSystem.get_loot_table(3).ids, "权重为0的装备不掉落"
+        random.seed(74)
+        for _ in range(200):
+            loot = LootSystem.generate_loot(6)
+            assert loot[-1] == {"type": "item", "name": "血瓶"}
+            assert all(item.get("id") != "iron_sword" for item in loot)
+
+        # 高于最高分档的必定掉落也要生效
+        GUARANTEED_DROPS.append((20, {"type": "item", "name": "龙鳞"}))
+        LootSystem.reset_loot_tables()
+        assert LootSystem.get_loot_table(19).guaranteed == [{"type": "item", "name": "血瓶"}]
+        assert LootSystem.get_loot_table(25).guaranteed[-1] == {"type": "item", "name": "龙鳞"}
+        assert LootSystem.generate_loot(20)[-1] == {"type": "item", "name": "龙鳞"}
+    finally:
+        ITEM_WEIGHTS.clear()
+        GUARANTEED_DROPS.clear()
+        LootSystem.reset_loot_tables()
+    print("✓ 单件权重和必定掉落生效")
+
+
+def test_generate_many():
+    """测试批量生成战利品"""
+    print("=== 批量掉落测试 ===")
+    random.seed(75)
+    levels = [random.randint(1, 20) for _ in range(20000)]
+    for numpy in (equipment_module.np, None):
+        original = equipment_module.np
+        equipment_module.np = numpy
+        try:
+            results = LootSystem.generate_loot_many(levels)
+        finally:
+            equipment_module.np = original
+        assert len(results) == len(levels)
+        drops = 0
+        for level, loot in zip(levels, results):
+            assert loot[0]["type"] == "gold" and 5 * level <= loot[0]["amount"] <= 20 * level
+            for item in loot[1:]:
+                if item["type"] == "equipment":
+                    drops += 1
+                    assert item["id"] in LootSystem.get_loot_table(level).ids
+        expected = sum(min(1.0, 0.2 + level * 0.05) for level in levels)
+        assert abs(drops - expected) / expected < 0.05, (drops, expected)
+        print(f"✓ use_numpy={numpy is not None}: 批量生成 {len(levels)} 份战利品，装备掉落率符合预期")
+
+
+if __name__ == "__main__":
+    test_same_as_before()
+    test_weights_and_guaranteed()
+    test_generate_many()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+地图缓存测试
+验证预渲染地图层与逐格绘制结果一致，并在地块改变后失效
+"""
+
+import sys
+import os
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from utils.map import GameMap
+
+
+def render_reference(game_map):
+    """逐格绘制一张参考地图"""
+    surface = pygame.Surface((GameMap.WIDTH * GameMap.TILE_SIZE, GameMap.HEIGHT * GameMap.TILE_SIZE))
+    game_map._render_tiles(surface)
+    return surface
+
+
+def test_map_cache():
+    """测试预渲染地图层"""
+    print("=== 地图缓存测试 ===")
+    game_map = GameMap()
+    screen = pygame.Surface((800, 600))
+
+    game_map.draw(screen)
+    cached = game_map.get_map_surface()
+    assert game_map.get_map_surface() is cached, "重复绘制不应重新生成地图层"
+
+    reference = render_reference(game_map)
+    assert pygame.image.tostring(screen.subsurface(reference.get_rect()), "RGB") == \
+        pygame.image.tostring(reference, "RGB"), "缓存绘制结果应与逐格绘制一致"
+    print("✓ 缓存绘制结果正确")
+
+    # 修改一个地块后缓存应失效
+    game_map.set_tile(1, 1, 1 - game_map.grid[1][1])
+    assert game_map.get_map_surface() is not cached, "地块改变后应重新生成地图层"
+    print("✓ 地块改变后缓存失效")
+
+
+if __name__ == "__main__":
+    test_map_cache()
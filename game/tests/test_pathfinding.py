@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+寻路测试
+验证流场的每一步都通往目标，以及追击的敌人能绕过房间墙体
+"""
+
+import sys
+import os
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.map import GameMap
+from entities.player import Player
+from entities.enemy import Enemy
+
+
+def test_flow_field():
+    """测试流场"""
+    print("=== 流场测试 ===")
+    random.seed(5)
+    game_map = GameMap()
+    tile = GameMap.TILE_SIZE
+    field = game_map.flow_field
+
+    # 目标放在左上角房间里
+    target = (5 * tile + tile // 2, 4 * tile + tile // 2)
+    assert field.update(*target), "首次更新应计算流场"
+    assert not field.update(target[0] + 3, target[1] + 3), "目标没换格子时不应重新计算"
+
+    # 从每个可达格子沿流场前进，步数应等于BFS距离且不经过墙体
+    for cell, dist in enumerate(field.distance):
+        if dist <= 0:
+            continue
+        x = (cell % GameMap.WIDTH) * tile + tile // 2
+        y = (cell // GameMap.WIDTH) * tile + tile // 2
+        steps = 0
+        while True:
+            waypoint = field.next_step(x, y)
+            if waypoint is None:
+                break
+            x, y = waypoint
+            assert not game_map.is_wall(x, y)
+            steps += 1
+        assert steps == dist and (x, y) == target
+    print("✓ 所有可达格子都沿最短路径到达目标")
+
+    # 地块改变后流场重新计算
+    game_map.set_tile(10, 10, 1 - game_map.grid[10][10])
+    assert field.update(*target), "地图改变后应重新计算流场"
+    print("✓ 地图改变后流场重新计算")
+
+
+def test_chase_through_door():
+    """追击的敌人应能从门口进入房间"""
+    print("=== 追击绕墙测试 ===")
+    random.seed(6)
+    game_map = GameMap()
+    tile = GameMap.TILE_SIZE
+    field = game_map.flow_field
+
+    player = Player(x=5 * tile + tile // 2, y=4 * tile + tile // 2)
+    field.update(player.x, player.y)
+
+    # 选一个与玩家相距较远但可达的格子放置敌人
+    start = max((c for c, d in enumerate(field.distance) if 0 < d <= 15), key=lambda c: field.distance[c])
+    enemy = Enemy(x=(start % GameMap.WIDTH) * tile + tile // 2, y=(start // GameMap.WIDTH) * tile + tile // 2)
+    enemy.sight_range = enemy.chase_range = 10000  # 始终处于追击状态
+
+    for _ in range(600):
+        enemy.update(player, game_map)
+        if enemy.distance_to_player(player) <= 40:
+            break
+    assert enemy.distance_to_player(player) <= 40, f"敌人未能到达玩家附近: ({enemy.x}, {enemy.y})"
+    print("✓ 敌人沿流场到达玩家附近")
+
+
+def test_chase_last_seen():
+    """看不到玩家的追击敌人走向玩家最后出现的位置，而不是玩家的实际位置"""
+    print("=== 追击最后位置测试 ===")
+    from entities.enemy_store import EnemyStore, np
+    game_map = GameMap()
+    game_map.grid = [[0] * GameMap.WIDTH for _ in range(GameMap.HEIGHT)]
+    game_map.rebuild_walkability()
+    player = Player(x=520, y=300)  # 在追击范围内但超出视野
+    last_seen = (400, 420)
+
+    enemy = Enemy(x=400, y=300)
+    enemy.player_last_seen = last_seen
+    enemies = [enemy]
+    if np is not None:
+        store = EnemyStore()
+        enemies.append(store.add(Enemy(x=400, y=300)))
+        enemies[1].player_last_seen = last_seen
+    for chaser in enemies:
+        assert chaser.sight_range < chaser.distance_to_player(player) <= chaser.chase_range
+    enemy.update(player, game_map)
+    if np is not None:
+        store.update(player, game_map)
+    for chaser in enemies:
+        assert chaser.ai_state == "chase" and chaser.x == 400 and chaser.y > 300, (chaser.x, chaser.y)
+    print("✓ 看不到玩家时走向最后出现的位置")
+
+
+def test_astar_path_cache():
+    """测试A*寻路和路径缓存"""
+    print("=== A*寻路测试 ===")
+    random.seed(7)
+    game_map = GameMap()
+    tile = GameMap.TILE_SIZE
+    pathfinder = game_map.pathfinder
+
+    # 与流场的BFS距离比较，A*路径应同样最短
+    goal = (5, 4)
+    game_map.flow_field.update(goal[0] * tile, goal[1] * tile)
+    for cell, dist in enumerate(game_map.flow_field.distance):
+        start = (cell % GameMap.WIDTH, cell // GameMap.WIDTH)
+        path = pathfinder.find_path(start, goal)
+        if dist < 0:
+            assert path is None or game_map.walls[cell], f"{start} 应不可达"
+            continue
+        assert len(path) == dist, f"{start} 的路径长度 {len(path)} 不等于最短距离 {dist}"
+        previous = start
+        for step in path:
+            assert abs(step[0] - previous[0]) + abs(step[1] - previous[1]) == 1
+            assert game_map.grid[step[1]][step[0]] == 0
+            previous = step
+    print("✓ A*路径均为最短且不穿墙")
+
+    # 相同查询命中缓存，地图改变后缓存失效
+    start = next(c for c, d in enumerate(game_map.flow_field.distance) if d > 5)
+    start = (start % GameMap.WIDTH, start // GameMap.WIDTH)
+    path = pathfinder.find_path(start, goal)
+    hits = pathfinder.hits
+    assert pathfinder.find_path(start, goal) is path and pathfinder.hits == hits + 1
+    game_map.set_tile(path[0][0], path[0][1], 1)
+    assert pathfinder.find_path(start, goal) != path, "地图改变后应重新寻路"
+    print("✓ 路径缓存命中与失效正确")
+
+
+def test_return_to_post():
+    """巡逻的敌人应能绕过房间墙体返回巡逻中心"""
+    print("=== 返回巡逻中心测试 ===")
+    random.seed(8)
+    game_map = GameMap()
+    tile = GameMap.TILE_SIZE
+
+    # 巡逻中心设在左上角房间里，敌人从房间外出发
+    post = (5 * tile + tile // 2, 4 * tile + tile // 2)
+    game_map.flow_field.update(*post)
+    start = max((c for c, d in enumerate(game_map.flow_field.distance) if 0 < d <= 15),
+                key=lambda c: game_map.flow_field.distance[c])
+    enemy = Enemy(x=(start % GameMap.WIDTH) * tile + tile // 2, y=(start // GameMap.WIDTH) * tile + tile // 2)
+    enemy.patrol_center = post
+
+    for _ in range(600):
+        enemy.return_to_post(game_map)
+    assert abs(enemy.x - post[0]) < tile and abs(enemy.y - post[1]) < tile, \
+        f"敌人未能返回巡逻中心: ({enemy.x}, {enemy.y})"
+    print("✓ 敌人沿缓存路径返回巡逻中心")
+
+
+if __name__ == "__main__":
+    test_flow_field()
+    test_chase_through_door()
+    test_chase_last_seen()
+    test_astar_path_cache()
+    test_return_to_post()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+对象池测试
+验证对象池复用、交换删除，以及敌人和地面物品回收后列表位置保持一致
+"""
+
+import sys
+import os
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pool import ObjectPool, swap_remove
+from entities.enemy import Enemy, ENEMY_POOL
+from entities.item import Item, ITEM_POOL
+from entities.enemy_spawner import EnemySpawner
+from core.game_enhanced import Game
+
+
+def test_object_pool():
+    """测试对象池和交换删除"""
+    print("=== 对象池测试 ===")
+    pool = ObjectPool(Enemy)
+    first = pool.acquire(10, 20, "elite")
+    first.hp = 1
+    pool.release(first)
+    second = pool.acquire(30, 40, "boss")
+    assert second is first, "释放的对象应被复用"
+    assert (second.x, second.y, second.enemy_type, second.width) == (30, 40, "boss", 35)
+    assert second.hp == second.max_hp, "复用的对象应重新初始化"
+    assert pool.created == 1 and pool.reused == 1 and len(pool) == 0
+
+    records = ObjectPool(dict, dict.update)
+    record = records.acquire({"x": 1})
+    records.release(record)
+    assert records.acquire({"y": 2}) is record and record["y"] == 2
+    print("✓ 对象池复用并重新初始化对象")
+
+    items = list(range(5))
+    assert swap_remove(items, 1) == 4 and items == [0, 4, 2, 3]
+    assert swap_remove(items, 3) is None and items == [0, 4, 2]
+    print("✓ 交换删除用最后一个元素补位")
+
+
+def test_game_recycling():
+    """测试游戏中敌人和地面物品的回收"""
+    print("=== 游戏对象回收测试 ===")
+    assert not hasattr(EnemySpawner, "temp_enemy")
+    for use_store in (True, False):
+        random.seed(31)
+        game = Game(headless=True, use_enemy_store=use_store)
+        game.initialize_game()
+        ENEMY_POOL.clear()
+        ITEM_POOL.clear()
+
+        for _ in range(30):
+            enemy = game.enemies[len(game.enemies) // 2]
+            game.remove_enemy(enemy)
+            game.add_enemies([EnemySpawner.spawn_enemy(game.game_map, clock=game.sim_clock)])
+            item = Item.create_safe_item("生命药水", game.game_map, game.items)
+            game.add_item(item)
+            if len(game.items) > 3:
+                game.remove_item(game.items[0])
+            assert all(e.list_index == i for i, e in enumerate(game.enemies))
+            assert all(it.list_index == i for i, it in enumerate(game.items))
+        assert len(set(map(id, game.enemies))) == len(game.enemies)
+        if use_store:
+            assert game.enemy_store.free_views or len(game.enemy_store) == len(game.enemies)
+        assert ENEMY_POOL.reused > 0 and ITEM_POOL.reused > 0, (ENEMY_POOL.reused, ITEM_POOL.reused)
+        print(f"✓ use_enemy_store={use_store}: 复用敌人 {ENEMY_POOL.reused} 次、物品 {ITEM_POOL.reused} 次")
+
+
+if __name__ == "__main__":
+    test_object_pool()
+    test_game_recycling()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+帧性能分析器测试
+验证分段计时、百分位统计、关闭时的空区段和CSV导出
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from utils.profiler import FrameProfiler
+
+
+def test_frame_profiler():
+    """测试帧性能分析器"""
+    print("=== 帧性能分析器测试 ===")
+
+    # 关闭时不记录样本
+    profiler = FrameProfiler()
+    with profiler.section("update_game"):
+        pass
+    assert profiler.samples == {}, "关闭时不应记录样本"
+    assert not profiler.dump_csv(os.path.join(tempfile.gettempdir(), "unused.csv")), "没有样本时不应导出"
+    print("✓ 关闭时不计时")
+
+    # 百分位按最近秩计算，只保留最近window个样本
+    profiler = FrameProfiler(enabled=True, window=100)
+    for ms in range(1, 201):
+        profiler.record("render", ms * 1000000)
+    name, count, mean, p50, p95, p99 = profiler.stats()[0]
+    assert name == "render" and count == 100, f"样本窗口错误: {count}"
+    assert (p50, p95, p99) == (150, 195, 199), f"百分位错误: {p50}, {p95}, {p99}"
+    assert abs(mean - 150.5) < 1e-9, f"平均值错误: {mean}"
+    print("✓ 滚动百分位正确")
+
+    with profiler.section("events"):
+        sum(range(1000))
+    assert len(profiler.samples["events"]) == 1 and profiler.samples["events"][0] > 0, "区段未计时"
+    print("✓ 区段计时")
+
+    # 叠加层和CSV
+    pygame.font.init()
+    profiler.toggle()
+    profiler.toggle()
+    assert profiler.enabled and profiler.overlay_visible, "F3切换应同时开启叠加层"
+    profiler.draw_overlay(pygame.Surface((800, 600)), pygame.font.Font(None, 20))
+
+    path = os.path.join(tempfile.mkdtemp(), "profile.csv")
+    assert profiler.dump_csv(path), "CSV未导出"
+    with open(path, encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][0] == "stage" and {row[0] for row in rows[1:]} == {"render", "events"}, f"CSV内容错误: {rows}"
+    print("✓ 叠加层绘制和CSV导出")
+
+    print("帧性能分析器测试通过！")
+
+
+if __name__ == "__main__":
+    test_frame_profiler()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+投射物测试
+验证列存储投射物的移动与原来逐个更新一致、命中检测、敌人的投射物和新类型
+"""
+
+import sys
+import os
+import random
+
+import pygame
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities.projectiles import (ProjectileSystem, OWNER_ENEMY, PROJECTILE_TYPES,
+                                  register_projectile_type, np)
+from entities.enemy import Enemy
+from core.game_enhanced import Game
+
+MODES = (False, True) if np is not None else (False,)
+
+
+def old_update(projectiles):
+    """原来逐个更新投射物字典的算法"""
+    for projectile in projectiles[:]:
+        dx = projectile["target_x"] - projectile["x"]
+        dy = projectile["target_y"] - projectile["y"]
+        distance = (dx**2 + dy**2)**0.5
+        if distance > 0:
+            projectile["x"] += (dx / distance) * projectile["speed"]
+            projectile["y"] += (dy / distance) * projectile["speed"]
+        if distance < 10 or projectile["x"] < 0 or projectile["x"] > 800 or projectile["y"] < 0 or projectile["y"] > 600:
+            projectiles.remove(projectile)
+
+
+def test_movement():
+    """测试移动和移除与原来的算法一致"""
+    print("=== 投射物移动测试 ===")
+    for use_numpy in MODES:
+        random.seed(41)
+        system = ProjectileSystem(use_numpy=use_numpy)
+        reference = []
+        for _ in range(300):
+            x, y = random.uniform(0, 800), random.uniform(0, 600)
+            target = (random.uniform(-100, 900), random.uniform(-100, 700))
+            speed = random.choice((3, 5, 8))
+            system.spawn("fireball", x, y, target[0], target[1], speed, 30)
+            reference.append({"x": x, "y": y, "target_x": target[0], "target_y": target[1], "speed": speed})
+
+        for step in range(400):
+            system.update()
+            old_update(reference)
+            assert len(system) == len(reference), f"第{step}步投射物数量不同"
+            for row, projectile in enumerate(reference):
+                assert abs(system.x[row] - projectile["x"]) < 1e-6 and abs(system.y[row] - projectile["y"]) < 1e-6
+        assert len(system) == 0
+        print(f"✓ use_numpy={use_numpy}: 移动和移除与逐个更新一致，顺序保持不变")
+
+
+def test_collisions():
+    """测试命中检测"""
+    print("=== 投射物命中测试 ===")
+    for use_numpy in MODES:
+        # 有NumPy时同时使用敌人列存储
+        game = Game(headless=True, use_enemy_store=use_numpy)
+        game.initialize_game()
+        for enemy in game.enemies[:]:
+            game.remove_enemy(enemy)
+        game.player.x, game.player.y = 100, 100
+        game.add_enemies([Enemy(400, 300)])
+        target = game.enemies[-1]
+        target.hp = 50
+        projectiles = game.player.projectiles = ProjectileSystem(use_numpy=use_numpy)
+
+        # 两个火球同时命中：第一个击杀敌人，第二个继续飞行
+        projectiles.spawn("fireball", 400, 300, 700, 300, 5, 30)
+        projectiles.spawn("fireball", 401, 300, 700, 300, 5, 30)
+        projectiles.spawn("fireball", 402, 300, 700, 300, 5, 30)
+        game.handle_projectile_hits()
+        assert target not in game.enemies and len(projectiles) == 1, len(projectiles)
+        assert projectiles.x[0] == 402
+        assert "火球术击中敌人，造成30点伤害！" in game.game_state.battle_messages
+
+        # 敌人的投射物只命中玩家
+        hp = game.player.hp
+        projectiles.spawn("fireball", 100, 100, 0, 100, 5, 7, owner=OWNER_ENEMY)
+        projectiles.spawn("fireball", 300, 300, 0, 100, 5, 7, owner=OWNER_ENEMY)
+        game.handle_projectile_hits()
+        assert game.player.hp == hp - 7 and len(projectiles) == 2
+
+        # 一个投射物只命中重叠敌人中列表靠前的一个
+        game.add_enemies([Enemy(200, 200), Enemy(205, 200)])
+        first, second = game.enemies[-2:]  # 启用列存储时是存储中的视图
+        first.hp = second.hp = 50
+        projectiles.clear()
+        projectiles.spawn("fireball", 203, 200, 700, 200, 5, 10)
+        game.handle_projectile_hits()
+        assert (first.hp, second.hp) == (40, 50) and len(projectiles) == 0, (first.hp, second.hp)
+        print(f"✓ use_numpy={use_numpy}: 命中敌人和玩家的投射物被移除，每个投射物只命中一个敌人")
+
+
+def test_types_and_draw():
+    """测试登记新类型和绘制"""
+    print("=== 投射物类型测试 ===")
+    register_projectile_type("arrow", (200, 200, 200), 3, "箭矢击中{name}，造成{damage}点伤害！")
+    assert "arrow" in PROJECTILE_TYPES
+    system = ProjectileSystem()
+    system.spawn("arrow", 50, 50, 300, 50, 12, 15)
+    system.spawn("fireball", 60, 60, 300, 60, 5, 30)
+    assert system.kind_name(0) == "arrow" and system.hit_message(0) == "箭矢击中arrow，造成15点伤害！"
+    surface = pygame.Surface((800, 600))
+    rects = system.draw(surface)
+    assert len(rects) == 2 and rects[0].width < rects[1].width
+    print("✓ 新类型按登记的参数绘制")
+
+
+if __name__ == "__main__":
+    test_movement()
+    test_collisions()
+    test_types_and_draw()
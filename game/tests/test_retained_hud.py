@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+保留模式HUD测试
+验证画面与即时模式的 draw_hud / draw_game_info 一致，且控件只在数值变化时重绘
+"""
+
+import sys
+import os
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from core.game_enhanced import Game
+from ui.hud import HUD, HudWidget, ConsumablesWidget, draw_hud, draw_game_info
+from systems.skill_system import SkillSystem
+
+
+def same_pixels(a, b):
+    """两个Surface像素完全相同"""
+    return pygame.image.tobytes(a, "RGB") == pygame.image.tobytes(b, "RGB")
+
+
+def test_retained_hud():
+    """测试保留模式HUD"""
+    print("=== 保留模式HUD测试 ===")
+    random.seed(3)
+    game = Game(headless=True)
+    game.initialize_game()
+    player = game.player
+    player.hp = 57
+    player.inventory.append("Gold")
+    game.game_state.add_battle_message("敌人被击败！")
+    SkillSystem.cast_skill(player, "fireball", (300, 300))
+
+    hud = HUD(game.font)
+    immediate = pygame.Surface((800, 600))
+    retained = pygame.Surface((800, 600))
+    draw_hud(immediate, player, game.font)
+    draw_game_info(immediate, game.game_state, game.font)
+    hud.draw(retained, player, game.game_state)
+    assert same_pixels(immediate, retained), "保留模式HUD画面应与即时模式一致"
+    print("✓ 画面与即时模式一致")
+
+    # 数值不变时不重绘
+    redraws = [widget.redraws for widget in hud.widgets]
+    for _ in range(10):
+        hud.draw(retained, player, game.game_state)
+    assert [widget.redraws for widget in hud.widgets] == redraws, "数值不变时不应重绘"
+    print("✓ 数值不变时只贴缓存画面")
+
+    # 只有绑定了变化值的控件重绘
+    player.gold += 10
+    hud.draw(retained, player, game.game_state)
+    changed = [widget for widget, before in zip(hud.widgets, redraws) if widget.redraws != before]
+    assert len(changed) == 1 and changed[0].state == f"金币: {player.gold}", "只有金币控件应重绘"
+    print("✓ 只重绘变化的控件")
+
+    # 技能冷却每秒重绘一次
+    fireball = hud.player_widgets[5]
+    before = fireball.redraws
+    for _ in range(60):
+        game.sim_clock.advance(1000 / 60)
+        hud.draw(retained, player, game.game_state)
+    assert 1 <= fireball.redraws - before <= 2, f"冷却一秒内应只重绘一两次: {fireball.redraws - before}"
+    print("✓ 冷却倒计时按秒重绘")
+
+    # 消耗品控件只在背包版本号变化时重绘，替换背包后也重绘
+    consumables = next(w for w in hud.widgets if isinstance(w, ConsumablesWidget))
+    before = consumables.redraws
+    hud.draw(retained, player, game.game_state)
+    assert consumables.redraws == before
+    player.inventory.append("血瓶")
+    hud.draw(retained, player, game.game_state)
+    player.inventory = ["Gold"]
+    hud.draw(retained, player, game.game_state)
+    assert consumables.redraws == before + 2
+    print("✓ 消耗品控件按背包版本号重绘")
+
+    # 控件基类是抽象类，子类必须实现 bind 和 render
+    try:
+        HudWidget((0, 0))
+        assert False, "HudWidget 不应能直接创建"
+    except TypeError:
+        pass
+    print("✓ 控件基类不能直接使用")
+
+
+if __name__ == "__main__":
+    test_retained_hud()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+空间索引测试
+验证矩形、点和半径查询的结果与逐个比较一致
+"""
+
+import sys
+import os
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from utils.spatial_hash import SpatialHash
+
+
+class Box:
+    """测试用的移动对象"""
+    def __init__(self, x, y, size):
+        self.rect = pygame.Rect(x, y, size, size)
+
+
+def test_spatial_hash():
+    """测试空间索引"""
+    print("=== 空间索引测试 ===")
+    random.seed(4)
+    index = SpatialHash()
+    boxes = [Box(random.randint(0, 780), random.randint(0, 580), random.choice([1, 20, 28, 35])) for _ in range(300)]
+    for box in boxes:
+        index.insert(box, box.rect)
+
+    # 移动一部分对象，再删除一部分
+    for box in boxes[:100]:
+        box.rect.move_ip(random.randint(-40, 40), random.randint(-40, 40))
+        index.update(box, box.rect)
+    for box in boxes[250:]:
+        index.remove(box)
+    boxes = boxes[:250]
+    assert len(index) == 250
+
+    for _ in range(200):
+        query = pygame.Rect(random.randint(0, 780), random.randint(0, 580), random.randint(1, 60), random.randint(1, 60))
+        expected = {id(b) for b in boxes if b.rect.colliderect(query)}
+        assert {id(b) for b in index.query_rect(query)} == expected, "矩形查询结果不一致"
+
+        px, py = random.randint(0, 799), random.randint(0, 599)
+        expected = {id(b) for b in boxes if b.rect.collidepoint(px, py)}
+        assert {id(b) for b in index.query_point(px, py)} == expected, "点查询结果不一致"
+
+        radius = random.randint(1, 100)
+        expected = set()
+        for b in boxes:
+            nx = min(max(px, b.rect.left), b.rect.right)
+            ny = min(max(py, b.rect.top), b.rect.bottom)
+            if (nx - px) ** 2 + (ny - py) ** 2 <= radius * radius:
+                expected.add(id(b))
+        assert {id(b) for b in index.query_radius(px, py, radius)} == expected, "半径查询结果不一致"
+        assert index.any_within(px, py, radius) == bool(expected), "提前返回的半径查询结果不一致"
+        small = radius // 10
+        assert index.any_within(px, py, small) == bool(index.query_radius(px, py, small))
+    print("✓ 矩形、点、半径查询结果与逐个比较一致")
+
+
+if __name__ == "__main__":
+    test_spatial_hash()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可放置位置索引测试
+验证敌人和物品的生成位置直接取自索引，且不会落在墙里
+"""
+
+import sys
+import os
+import random
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.map import GameMap
+from entities.enemy_spawner import EnemySpawner
+from entities.item import Item
+
+
+def test_spawn_index():
+    """测试可放置位置索引"""
+    print("=== 可放置位置索引测试 ===")
+    random.seed(2)
+    game_map = GameMap()
+
+    cells = game_map.get_spawn_cells(28, 28)
+    assert cells, "地图上应有可放置位置"
+    assert game_map.get_spawn_cells(28, 28) is cells, "同一尺寸的索引应被缓存"
+    assert all(game_map.can_move_to(x, y, 28, 28) for x, y in cells)
+    print(f"✓ 28x28 可放置位置: {len(cells)} 个")
+
+    # 各类敌人都不应生成在墙里
+    for enemy_type in ("basic", "elite", "boss"):
+        for _ in range(50):
+            enemy = EnemySpawner.spawn_enemy(game_map, enemy_type)
+            assert game_map.can_move_to(enemy.x, enemy.y, enemy.width, enemy.height), \
+                f"{enemy_type} 生成在墙里: ({enemy.x}, {enemy.y})"
+    print("✓ 敌人生成位置全部有效")
+
+    # 物品远离墙体且彼此不重叠
+    items = []
+    for _ in range(5):
+        item = Item.create_safe_item("Gold", game_map, items)
+        assert game_map.can_move_to(item.x, item.y, item.size, item.size)
+        items.append(item)
+    print("✓ 物品生成位置全部有效")
+
+    # 格子内的偏移范围都可放置，拥挤时生成的敌人不会叠在同一点
+    for size in ((28, 28), (35, 35)):
+        for (cx, cy), (left, right, up, down) in zip(game_map.get_spawn_cells(*size), game_map.get_spawn_offsets(*size)):
+            assert cx // GameMap.TILE_SIZE == (cx - left) // GameMap.TILE_SIZE == (cx + right) // GameMap.TILE_SIZE
+            for dx in (-left, right):
+                for dy in (-up, down):
+                    assert game_map.can_move_to(cx + dx, cy + dy, *size)
+    enemies = EnemySpawner.spawn_enemies(game_map, 2 * len(cells))
+    positions = {(enemy.x, enemy.y) for enemy in enemies}
+    assert len(positions) > len(cells), "生成位置应在格子内随机偏移"
+    assert all(game_map.can_move_to(enemy.x, enemy.y, enemy.width, enemy.height) for enemy in enemies)
+    print("✓ 拥挤时生成位置在格子内随机偏移")
+
+    # 地块改变后索引失效
+    x, y = cells[0]
+    game_map.set_tile(x // GameMap.TILE_SIZE, y // GameMap.TILE_SIZE, 1)
+    assert (x, y) not in game_map.get_spawn_cells(28, 28), "地块改变后索引应重建"
+    print("✓ 地块改变后索引重建")
+
+
+if __name__ == "__main__":
+    test_spawn_index()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字渲染缓存测试
+验证相同文字命中缓存、不同颜色分开缓存，以及按内存上限LRU淘汰
+"""
+
+import sys
+import os
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from ui.text_cache import TextCache
+
+
+def test_text_cache():
+    """测试文字渲染缓存"""
+    print("=== 文字渲染缓存测试 ===")
+    pygame.font.init()
+    font = pygame.font.Font(None, 20)
+
+    cache = TextCache()
+    first = cache.render(font, "HP: 100/100", True, (255, 255, 255))
+    second = cache.render(font, "HP: 100/100", True, [255, 255, 255])
+    assert first is second, "相同文字应返回同一个Surface"
+    assert (cache.hits, cache.misses) == (1, 1), f"命中统计错误: {cache.hits}, {cache.misses}"
+    assert first.get_size() == font.render("HP: 100/100", True, (255, 255, 255)).get_size()
+    print("✓ 相同文字命中缓存")
+
+    yellow = cache.render(font, "HP: 100/100", True, (255, 255, 0))
+    assert yellow is not first and len(cache) == 2, "不同颜色应分开缓存"
+    expected = sum(s.get_width() * s.get_height() * s.get_bytesize() for s in (first, yellow))
+    assert cache.memory == expected, f"内存统计错误: {cache.memory} != {expected}"
+    print("✓ 不同颜色分开缓存，内存统计正确")
+
+    # 条目上限为2时，淘汰最久未使用的
+    cache = TextCache(max_entries=2)
+    a = cache.render(font, "aaaa", True, (255, 255, 255))
+    cache.render(font, "bbbb", True, (255, 255, 255))
+    cache.render(font, "aaaa", True, (255, 255, 255))  # a变为最近使用
+    cache.render(font, "cccc", True, (255, 255, 255))
+    keys = [key[1] for key in cache.entries]
+    assert keys == ["aaaa", "cccc"], f"应淘汰最久未使用的条目: {keys}"
+    assert cache.render(font, "aaaa", True, (255, 255, 255)) is a
+    print("✓ 按条目上限LRU淘汰")
+
+    # 内存上限只够放一条时，只保留最新的一条
+    cache = TextCache(max_bytes=1)
+    cache.render(font, "aaaa", True, (255, 255, 255))
+    latest = cache.render(font, "bbbb", True, (255, 255, 255))
+    assert len(cache) == 1 and cache.memory == latest.get_width() * latest.get_height() * latest.get_bytesize()
+    print("✓ 按内存上限淘汰")
+
+    cache.clear()
+    assert len(cache) == 0 and cache.memory == 0
+    print("文字渲染缓存测试通过！")
+
+
+if __name__ == "__main__":
+    test_text_cache()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+计时器测试
+验证计时器堆的到期、替换和取消，以及技能冷却、增益和魔法恢复的计时
+"""
+
+import sys
+import os
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.clock import GameClock
+from entities.player import Player
+from entities.enemy import Enemy, ATTACK_COOLDOWNS
+from systems.skill_system import SkillSystem
+
+
+def test_timer_heap():
+    """测试计时器堆"""
+    print("=== 计时器堆测试 ===")
+    clock = GameClock(virtual=True)
+    timers = clock.timers
+    fired = []
+    for i in range(100):
+        timers.schedule(("t", i), 10 * (i + 1), lambda i=i: fired.append(i))
+    timers.schedule(("t", 5), 2000, lambda: fired.append("late"))  # 替换原来的计时器
+    assert timers.cancel(("t", 6)) and not timers.cancel(("t", 6))
+    assert timers.remaining(("t", 0)) == 10 and timers.remaining("missing") == 0
+
+    clock.advance(50)
+    assert fired == [0, 1, 2, 3, 4], fired
+    assert timers.remaining(("t", 7)) == 30
+    clock.advance(1950)
+    assert len(fired) == 99 and fired[-1] == "late" and 6 not in fired, "取消的计时器不应触发"
+    assert len(timers) == 0 and timers.fired == 99
+    print("✓ 计时器按到期时间触发，替换和取消生效")
+
+    # 每步只处理到期的计时器
+    for i in range(1000):
+        timers.schedule(("far", i), 60000)
+    clock.advance(16)
+    assert timers.run_due() == 0 and len(timers) == 1000
+    print("✓ 没有到期的计时器时不触发任何回调")
+
+
+def test_player_timers():
+    """测试技能冷却、增益和魔法恢复"""
+    print("=== 玩家计时测试 ===")
+    clock = GameClock(virtual=True)
+    player = Player(100, 100, clock=clock)
+    clock.advance(5000)
+
+    assert SkillSystem.cast_skill(player, "fireball", (200, 100))
+    assert SkillSystem.cooldown_remaining(player, "fireball") == 3000
+    clock.advance(2999)
+    assert not SkillSystem.cast_skill(player, "fireball", (200, 100)), "冷却中不能释放"
+    clock.advance(1)
+    assert SkillSystem.cast_skill(player, "fireball", (200, 100)), "冷却结束后能再次释放"
+    SkillSystem.reset_cooldowns(player)
+    assert SkillSystem.cooldown_remaining(player, "fireball") == 0 and SkillSystem.cast_skill(player, "fireball")
+    print("✓ 技能冷却由计时器查询，重置后立即可用")
+
+    # 护盾持续到 end_time 这一毫秒
+    assert SkillSystem.cast_skill(player, "shield")
+    end_time = player.buffs["shield"]["end_time"]
+    clock.advance(end_time - clock.get_ticks())
+    assert "shield" in player.buffs
+    clock.advance(1)
+    assert "shield" not in player.buffs, "持续时间过后增益应由计时器移除"
+    print("✓ 增益到期后自动移除")
+
+    # 魔法恢复与原来逐帧判断的结果相同
+    def old_regen(state, now):
+        if now - state["last"] > 1000 and state["mp"] < 100:
+            state["mp"] = min(100, state["mp"] + 1)
+            state["last"] = now
+
+    player.mp, player.last_mp_regen = 40, clock.get_ticks()
+    state = {"mp": 40, "last": clock.get_ticks()}
+    for step in range(6000):
+        if step % 700 == 0:
+            player.mp -= 5
+            state["mp"] -= 5
+        clock.advance(16.667)
+        player.update_mp_regen()
+        old_regen(state, clock.get_ticks())
+        assert player.mp == state["mp"], f"第{step}步魔法值不同"
+    print("✓ 魔法恢复计时与逐帧判断一致")
+
+
+def test_enemy_cooldowns():
+    """测试各类型敌人的攻击冷却"""
+    print("=== 敌人攻击冷却测试 ===")
+    clock = GameClock(virtual=True)
+    clock.advance(5000)
+    for enemy_type, cooldown in ATTACK_COOLDOWNS.items():
+        enemy = Enemy(0, 0, enemy_type, clock=clock)
+        assert enemy.attack_cooldown == cooldown and enemy.can_attack()
+        clock.advance(cooldown)
+        assert not enemy.can_attack() and enemy.time_since_attack() == cooldown
+        clock.advance(1)
+        assert enemy.can_attack()
+    print("✓ 攻击冷却按类型查表，超过冷却时间才能再次攻击")
+
+
+if __name__ == "__main__":
+    test_timer_heap()
+    test_player_timers()
+    test_enemy_cooldowns()
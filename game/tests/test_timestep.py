@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+固定步长测试
+验证帧率波动不改变模拟步数，以及时间倍率和卡顿保护
+"""
+
+import sys
+import os
+
+# 添加上级目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.timestep import FixedTimestep
+
+
+def test_fixed_timestep():
+    """测试固定步长累加器"""
+    print("=== 固定步长测试 ===")
+
+    # 60帧/秒和20帧/秒跑一秒，模拟步数相同
+    fast = FixedTimestep(60)
+    slow = FixedTimestep(60)
+    fast_steps = sum(fast.advance(1000 / 60) for _ in range(60))
+    slow_steps = sum(slow.advance(50) for _ in range(20))
+    assert fast_steps == slow_steps == 60, f"模拟步数应为60: {fast_steps}, {slow_steps}"
+    print("✓ 帧率不同，模拟步数相同")
+
+    # 插值比例为剩余时间占一步的比例
+    timestep = FixedTimestep(50)
+    assert timestep.advance(30) == 1
+    assert abs(timestep.alpha - 0.5) < 1e-9
+    print("✓ 插值比例正确")
+
+    # 时间倍率
+    timestep = FixedTimestep(60, time_scale=2.0)
+    assert sum(timestep.advance(1000 / 60) for _ in range(60)) == 120
+    timestep.time_scale = 0
+    assert timestep.advance(1000) == 0
+    print("✓ 时间倍率生效")
+
+    # 严重卡顿时最多模拟max_steps步，并丢弃多余时间
+    timestep = FixedTimestep(60, max_steps=5)
+    assert timestep.advance(2000) == 5
+    assert timestep.accumulator < timestep.step_ms
+    print("✓ 卡顿保护生效")
+
+
+if __name__ == "__main__":
+    test_fixed_timestep()
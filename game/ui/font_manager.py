@@ -1,49 +1,128 @@
 import pygame
+import json
 import os
 
 class FontManager:
-    """字体管理器，处理中文字体加载"""
-    
+    """字体管理器，处理中文字体加载
+
+    第一次需要中文字体时查找可用的字体文件，找到的路径写入 CACHE_FILE（本模块所在目录，
+    与当前工作目录无关），之后启动时直接加载该文件，不再扫描系统字体目录。没有可用的
+    中文字体时不写缓存，下次启动重新扫描。同一进程内加载过的字体按 (字体文件, 字号)
+    缓存，Game、InventoryUI 和测试重复获取时不再重新加载。更换字体后删除缓存文件
+    （或调用 clear_cache()）即可重新扫描。
+    """
+
+    CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "font_cache.json")
+
+    # Windows系统常见中文字体
+    FONT_NAMES = [
+        'microsoftyahei',    # 微软雅黑
+        'simsun',           # 宋体
+        'simhei',           # 黑体
+        'kaiti',            # 楷体
+        'dengxian',         # 等线
+        'fangsong'          # 仿宋
+    ]
+
+    # 如果系统字体都不可用，尝试加载字体文件
+    FONT_PATHS = [
+        "C:/Windows/Fonts/msyh.ttc",      # 微软雅黑
+        "C:/Windows/Fonts/simsun.ttc",    # 宋体
+        "C:/Windows/Fonts/simhei.ttf",    # 黑体
+    ]
+
+    _fonts = {}  # (字体文件, 字号) -> Font，字体文件为None时是默认字体，pygame.quit() 时清空
+    _resolved = False  # 本进程是否已经确定中文字体文件
+    _face = None  # 确定的中文字体文件，None为默认字体
+
+    @staticmethod
+    def get_font(face, size):
+        """获取指定字体文件和字号的字体（进程内缓存），face为None时使用默认字体"""
+        key = (face, size)
+        font = FontManager._fonts.get(key)
+        if font is None:
+            if not FontManager._fonts:
+                # pygame.quit() 后旧的 Font 对象不能再使用
+                pygame.register_quit(FontManager._fonts.clear)
+            font = FontManager._fonts[key] = pygame.font.Font(face, size)
+        return font
+
     @staticmethod
     def get_chinese_font(size=20):
         """获取支持中文的字体"""
-        # Windows系统常见中文字体
-        font_names = [
-            'microsoftyahei',    # 微软雅黑
-            'simsun',           # 宋体
-            'simhei',           # 黑体
-            'kaiti',            # 楷体
-            'dengxian',         # 等线
-            'fangsong'          # 仿宋
-        ]
-        
-        for font_name in font_names:
+        if not FontManager._resolved:
+            FontManager._face = FontManager.resolve_chinese_face()
+            FontManager._resolved = True
+        return FontManager.get_font(FontManager._face, size)
+
+    @staticmethod
+    def resolve_chinese_face():
+        """确定中文字体文件：优先使用缓存文件中的路径，否则扫描系统字体并写入缓存"""
+        cached = FontManager.load_cache()
+        if cached is not None:
+            return cached["path"]
+
+        face = FontManager.find_chinese_face()
+        if face is not None:
+            FontManager.save_cache(face)
+        return face
+
+    @staticmethod
+    def find_chinese_face():
+        """扫描系统字体，返回第一个能渲染中文的字体文件，都不可用时返回None"""
+        candidates = []
+        for font_name in FontManager.FONT_NAMES:
             try:
-                font = pygame.font.SysFont(font_name, size)
+                candidates.append((font_name, pygame.font.match_font(font_name)))
+            except Exception:
+                continue
+        candidates.extend((font_path, font_path) for font_path in FontManager.FONT_PATHS)
+
+        for label, font_path in candidates:
+            if not font_path or not os.path.exists(font_path):
+                continue
+            try:
+                font = pygame.font.Font(font_path, 20)
                 # 测试字体是否能正确渲染中文
                 test_surface = font.render("测试", True, (255, 255, 255))
                 if test_surface.get_width() > 0:
-                    print(f"使用字体: {font_name}")
-                    return font
+                    print(f"使用字体: {label}")
+                    return font_path
             except Exception:
                 continue
-        
-        # 如果系统字体都不可用，尝试加载字体文件
-        font_paths = [
-            "C:/Windows/Fonts/msyh.ttc",      # 微软雅黑
-            "C:/Windows/Fonts/simsun.ttc",    # 宋体
-            "C:/Windows/Fonts/simhei.ttf",    # 黑体
-        ]
-        
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                try:
-                    font = pygame.font.Font(font_path, size)
-                    print(f"使用字体文件: {font_path}")
-                    return font
-                except Exception:
-                    continue
-        
+
         # 最后使用默认字体
         print("使用默认字体")
-        return pygame.font.Font(None, size)
+        return None
+
+    @staticmethod
+    def load_cache():
+        """读取字体缓存，文件不存在、损坏、没有记录字体文件或字体文件已被删除时返回None"""
+        try:
+            with open(FontManager.CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or not isinstance(cached.get("path"), str):
+            return None
+        if not os.path.exists(cached["path"]):
+            return None
+        return cached
+
+    @staticmethod
+    def save_cache(face):
+        """写入字体缓存"""
+        try:
+            with open(FontManager.CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({"path": face}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"写入字体缓存失败: {e}")
+
+    @staticmethod
+    def clear_cache():
+        """清除进程内和磁盘上的字体缓存，下次获取时重新扫描"""
+        FontManager._fonts.clear()
+        FontManager._resolved = False
+        FontManager._face = None
+        if os.path.exists(FontManager.CACHE_FILE):
+            os.remove(FontManager.CACHE_FILE)
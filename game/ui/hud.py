@@ -1,11 +1,13 @@
 import pygame
 import sys
 import os
+from abc import ABC, abstractmethod
 
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from systems.skill_system import SkillSystem
+from ui.text_cache import render_text
 
 
 def draw_hud(surface, player, font):
@@ -23,7 +25,7 @@ def draw_hud(surface, player, font):
     pygame.draw.rect(surface, (255, 255, 255), (10, 10, hp_bar_width, hp_bar_height), 2)
     
     # 绘制HP文字
-    hp_text = font.render(f"HP: {player.hp}/{player.max_hp}", True, (255, 255, 255))
+    hp_text = render_text(font, f"HP: {player.hp}/{player.max_hp}", True, (255, 255, 255))
     surface.blit(hp_text, (220, 12))
     
     # 绘制魔法值条
@@ -38,26 +40,23 @@ def draw_hud(surface, player, font):
     pygame.draw.rect(surface, (255, 255, 255), (10, mp_bar_y, hp_bar_width, hp_bar_height), 2)
     
     # 绘制MP文字
-    mp_text = font.render(f"MP: {player.mp}/{player.max_mp}", True, (255, 255, 255))
+    mp_text = render_text(font, f"MP: {player.mp}/{player.max_mp}", True, (255, 255, 255))
     surface.blit(mp_text, (220, mp_bar_y + 2))
     
     # 绘制等级和经验
-    level_text = font.render(f"等级: {player.level}  经验: {player.exp}/{player.level * 100}", True, (255, 255, 255))
+    level_text = render_text(font, f"等级: {player.level}  经验: {player.exp}/{player.level * 100}", True, (255, 255, 255))
     surface.blit(level_text, (10, 60))
     
     # 绘制金币
-    gold_text = font.render(f"金币: {player.gold}", True, (255, 215, 0))
+    gold_text = render_text(font, f"金币: {player.gold}", True, (255, 215, 0))
     surface.blit(gold_text, (10, 80))
 
     # 绘制背包物品 - 只显示消耗品叠加信息
-    consumables = {}
-    for item in player.inventory:
-        if not item.startswith("装备_"):
-            consumables[item] = consumables.get(item, 0) + 1
+    consumables = player.inventory.stack_items()
     
     if consumables:
         consumable_strs = []
-        for item, count in consumables.items():
+        for item, count in consumables:
             if count > 1:
                 consumable_strs.append(f"{item}x{count}")
             else:
@@ -66,29 +65,28 @@ def draw_hud(surface, player, font):
     else:
         inv_str = "空"
     
-    inv_text = font.render(f"物品: {inv_str}", True, (255, 255, 255))
+    inv_text = render_text(font, f"物品: {inv_str}", True, (255, 255, 255))
     surface.blit(inv_text, (10, 100))
     
     # 绘制技能快捷键和冷却时间
     draw_skill_info(surface, player, font)
     
     # 绘制操作提示
-    help_text = font.render("操作: WASD移动, H键使用血瓶", True, (200, 200, 200))
+    help_text = render_text(font, "操作: WASD移动, H键使用血瓶", True, (200, 200, 200))
     surface.blit(help_text, (10, 520))
     
     # 绘制技能提示
-    skill_text = font.render("技能: Q火球术, E治疗术, R护盾术", True, (200, 200, 200))
+    skill_text = render_text(font, "技能: Q火球术, E治疗术, R护盾术", True, (200, 200, 200))
     surface.blit(skill_text, (10, 540))
     
     # 添加输入法提示
-    ime_text = font.render("提示: 如无法移动请关闭中文输入法", True, (255, 255, 100))
+    ime_text = render_text(font, "提示: 如无法移动请关闭中文输入法", True, (255, 255, 100))
     surface.blit(ime_text, (10, 560))
 
 def draw_skill_info(surface, player, font):
     """绘制技能信息"""
     skills = SkillSystem.get_available_skills()
     skill_keys = [("Q", "fireball"), ("E", "heal"), ("R", "shield")]
-    current_time = pygame.time.get_ticks()
     
     y_offset = 120
     for i, (key, skill_name) in enumerate(skill_keys):
@@ -102,11 +100,10 @@ def draw_skill_info(surface, player, font):
         is_on_cooldown = False
         cooldown_remaining = 0
         
-        if skill_name in player.skill_cooldowns:
-            time_since_cast = current_time - player.skill_cooldowns[skill_name]
-            if time_since_cast < skill["cooldown"]:
-                is_on_cooldown = True
-                cooldown_remaining = skill["cooldown"] - time_since_cast
+        remaining = SkillSystem.cooldown_remaining(player, skill_name)
+        if remaining > 0:
+            is_on_cooldown = True
+            cooldown_remaining = remaining
         
         # 检查魔法值是否足够
         has_enough_mp = player.mp >= skill["cost"]
@@ -127,34 +124,255 @@ def draw_skill_info(surface, player, font):
         pygame.draw.rect(surface, (255, 255, 255), icon_rect, 2)  # 边框
         
         # 绘制按键提示
-        key_text = font.render(key, True, (255, 255, 255))
+        key_text = render_text(font, key, True, (255, 255, 255))
         surface.blit(key_text, (x_pos + 10, y_offset + 5))
         
         # 绘制技能名称
-        name_text = font.render(skill["name"], True, (255, 255, 255))
+        name_text = render_text(font, skill["name"], True, (255, 255, 255))
         surface.blit(name_text, (x_pos + 35, y_offset))
         
         # 绘制魔法消耗
-        cost_text = font.render(f"MP:{skill['cost']}", True, (100, 150, 255))
+        cost_text = render_text(font, f"MP:{skill['cost']}", True, (100, 150, 255))
         surface.blit(cost_text, (x_pos + 35, y_offset + 15))
         
         # 绘制冷却时间
         if is_on_cooldown:
-            cooldown_text = font.render(f"{cooldown_remaining//1000 + 1}s", True, (255, 255, 0))
+            cooldown_text = render_text(font, f"{cooldown_remaining//1000 + 1}s", True, (255, 255, 0))
             surface.blit(cooldown_text, (x_pos + 5, y_offset + 35))
 
 
 def draw_game_info(surface, game_state, font):
     """绘制游戏信息（波次、击杀数等）"""
     # 绘制波次信息
-    wave_text = font.render(f"波次: {game_state.wave_number}", True, (255, 255, 255))
+    wave_text = render_text(font, f"波次: {game_state.wave_number}", True, (255, 255, 255))
     surface.blit(wave_text, (600, 10))
     
     # 绘制击杀数
-    kill_text = font.render(f"击杀: {game_state.enemies_killed}", True, (255, 255, 255))
+    kill_text = render_text(font, f"击杀: {game_state.enemies_killed}", True, (255, 255, 255))
     surface.blit(kill_text, (600, 30))
     
     # 绘制战斗消息
     for i, message in enumerate(game_state.battle_messages[-5:]):  # 最多显示5条消息
-        msg_text = font.render(message, True, (255, 255, 0))
+        msg_text = render_text(font, message, True, (255, 255, 0))
         surface.blit(msg_text, (400, 100 + i * 20))
+
+
+class HudWidget(ABC):
+    """HUD控件基类（保留模式）
+
+    bind() 从玩家和游戏状态中取出控件依赖的值，只有这些值变化时才调用 render()
+    重新生成控件的Surface，否则直接贴上次的结果。
+    """
+
+    def __init__(self, pos):
+        self.pos = pos
+        self.state = None  # 上次绘制时绑定的值
+        self.surface = None  # 缓存的控件画面
+        self.rect = None  # 上次贴到屏幕上的区域
+        self.redraws = 0  # 重绘次数
+
+    @abstractmethod
+    def bind(self, player, game_state):
+        """返回控件依赖的值（可比较），子类实现"""
+
+    @abstractmethod
+    def render(self, state, font):
+        """根据绑定的值生成控件画面，子类实现"""
+
+    def refresh(self, player, game_state, font):
+        """绑定值变化时重新生成画面（不贴到屏幕上），返回是否变化"""
+        state = self.bind(player, game_state)
+        if self.surface is None or state != self.state:
+            self.surface = self.render(state, font)
+            self.state = state
+            self.redraws += 1
+            return True
+        return False
+
+    def blit(self, surface):
+        """把缓存的画面贴到屏幕上，返回贴图区域"""
+        self.rect = surface.blit(self.surface, self.pos)
+        return self.rect
+
+    def draw(self, surface, player, game_state, font):
+        """绑定值变化时重绘，然后贴到屏幕上"""
+        self.refresh(player, game_state, font)
+        return self.blit(surface)
+
+    def invalidate(self):
+        """强制下一帧重绘"""
+        self.surface = None
+
+
+class BarWidget(HudWidget):
+    """数值条（HP、MP），右侧显示数值文字"""
+
+    def __init__(self, pos, label, attr, max_attr, back_color, fill_color, width=200, height=20):
+        super().__init__(pos)
+        self.label = label
+        self.attr = attr
+        self.max_attr = max_attr
+        self.back_color = back_color
+        self.fill_color = fill_color
+        self.width = width
+        self.height = height
+
+    def bind(self, player, game_state):
+        return getattr(player, self.attr), getattr(player, self.max_attr)
+
+    def render(self, state, font):
+        value, max_value = state
+        text = render_text(font, f"{self.label}: {value}/{max_value}", True, (255, 255, 255))
+        widget = pygame.Surface((self.width + 10 + text.get_width(), max(self.height, text.get_height() + 2)), pygame.SRCALPHA)
+        pygame.draw.rect(widget, self.back_color, (0, 0, self.width, self.height))
+        pygame.draw.rect(widget, self.fill_color, (0, 0, self.width * (value / max_value), self.height))
+        pygame.draw.rect(widget, (255, 255, 255), (0, 0, self.width, self.height), 2)
+        widget.blit(text, (self.width + 10, 2))
+        return widget
+
+
+class TextWidget(HudWidget):
+    """单行文字，text_func(player, game_state) 返回要显示的文字"""
+
+    def __init__(self, pos, text_func, color=(255, 255, 255)):
+        super().__init__(pos)
+        self.text_func = text_func
+        self.color = color
+
+    def bind(self, player, game_state):
+        return self.text_func(player, game_state)
+
+    def render(self, state, font):
+        return render_text(font, state, True, self.color)
+
+
+class ConsumablesWidget(TextWidget):
+    """消耗品叠加信息，只在背包内容变化时重新统计"""
+
+    def __init__(self, pos):
+        super().__init__(pos, None)
+        self.inventory = None  # 上次绑定的背包
+
+    def bind(self, player, game_state):
+        # 背包每次修改都会递增版本号，每帧只比较版本号，不统计叠加物品
+        self.inventory = player.inventory
+        return id(self.inventory), self.inventory.version
+
+    def render(self, state, font):
+        consumables = self.inventory.stack_items()
+        if consumables:
+            inv_str = ", ".join(f"{item}x{count}" if count > 1 else item for item, count in consumables)
+        else:
+            inv_str = "空"
+        return render_text(font, f"物品: {inv_str}", True, self.color)
+
+
+class SkillWidget(HudWidget):
+    """技能图标，冷却中每秒重绘一次"""
+
+    READY_COLORS = {
+        "fireball": (255, 100, 0),  # 火球术为橙色
+        "heal": (0, 255, 0),  # 治疗术为绿色
+        "shield": (0, 100, 255),  # 护盾术为蓝色
+    }
+
+    def __init__(self, pos, key, skill_name):
+        super().__init__(pos)
+        self.key = key
+        self.skill_name = skill_name
+        self.skill = SkillSystem.get_available_skills()[skill_name]
+
+    def bind(self, player, game_state):
+        remaining = SkillSystem.cooldown_remaining(player, self.skill_name)
+        if remaining > 0:
+            return "cooldown", remaining // 1000 + 1
+        return ("ready" if player.mp >= self.skill["cost"] else "no_mp"), 0
+
+    def render(self, state, font):
+        status, seconds = state
+        key_text = render_text(font, self.key, True, (255, 255, 255))
+        name_text = render_text(font, self.skill["name"], True, (255, 255, 255))
+        cost_text = render_text(font, f"MP:{self.skill['cost']}", True, (100, 150, 255))
+        cooldown_text = render_text(font, f"{seconds}s", True, (255, 255, 0)) if status == "cooldown" else None
+
+        width = max(30, 35 + name_text.get_width(), 35 + cost_text.get_width())
+        height = max(30, 15 + cost_text.get_height(), 35 + cooldown_text.get_height() if cooldown_text else 0)
+        widget = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        if status == "cooldown":
+            icon_color = (100, 100, 100)  # 冷却中为灰色
+        elif status == "no_mp":
+            icon_color = (100, 0, 0)  # 魔法不足为暗红色
+        else:
+            icon_color = self.READY_COLORS[self.skill_name]
+        pygame.draw.rect(widget, icon_color, (0, 0, 30, 30))
+        pygame.draw.rect(widget, (255, 255, 255), (0, 0, 30, 30), 2)  # 边框
+
+        widget.blit(key_text, (10, 5))
+        widget.blit(name_text, (35, 0))
+        widget.blit(cost_text, (35, 15))
+        if cooldown_text:
+            widget.blit(cooldown_text, (5, 35))
+        return widget
+
+
+class MessagesWidget(HudWidget):
+    """战斗消息（最多5条）"""
+
+    def bind(self, player, game_state):
+        return tuple(game_state.battle_messages[-5:])
+
+    def render(self, state, font):
+        lines = [render_text(font, message, True, (255, 255, 0)) for message in state]
+        width = max([line.get_width() for line in lines] + [1])
+        height = max([i * 20 + line.get_height() for i, line in enumerate(lines)] + [1])
+        widget = pygame.Surface((width, height), pygame.SRCALPHA)
+        for i, line in enumerate(lines):
+            widget.blit(line, (0, i * 20))
+        return widget
+
+
+class HUD:
+    """保留模式HUD
+
+    由若干控件组成，每个控件只在绑定的值变化时重绘，其余帧只贴缓存的画面，
+    HUD的开销随状态变化的频率增长，而不是随帧率增长。布局与 draw_hud / draw_game_info 相同。
+    """
+
+    def __init__(self, font):
+        self.font = font
+        self.player_widgets = [
+            BarWidget((10, 10), "HP", "hp", "max_hp", (100, 0, 0), (255, 0, 0)),
+            BarWidget((10, 35), "MP", "mp", "max_mp", (0, 0, 100), (0, 0, 255)),
+            TextWidget((10, 60), lambda player, _: f"等级: {player.level}  经验: {player.exp}/{player.level * 100}"),
+            TextWidget((10, 80), lambda player, _: f"金币: {player.gold}", (255, 215, 0)),
+            ConsumablesWidget((10, 100)),
+            SkillWidget((10, 120), "Q", "fireball"),
+            SkillWidget((130, 120), "E", "heal"),
+            SkillWidget((250, 120), "R", "shield"),
+            TextWidget((10, 520), lambda *_: "操作: WASD移动, H键使用血瓶", (200, 200, 200)),
+            TextWidget((10, 540), lambda *_: "技能: Q火球术, E治疗术, R护盾术", (200, 200, 200)),
+            TextWidget((10, 560), lambda *_: "提示: 如无法移动请关闭中文输入法", (255, 255, 100)),
+        ]
+        self.game_widgets = [
+            TextWidget((600, 10), lambda _, game_state: f"波次: {game_state.wave_number}"),
+            TextWidget((600, 30), lambda _, game_state: f"击杀: {game_state.enemies_killed}"),
+            MessagesWidget((400, 100)),
+        ]
+
+    @property
+    def widgets(self):
+        return self.player_widgets + self.game_widgets
+
+    def active_widgets(self, game_state):
+        """需要绘制的控件，game_state为None时只有玩家信息"""
+        return self.widgets if game_state is not None else self.player_widgets
+
+    def draw(self, surface, player, game_state=None):
+        """绘制HUD，返回各控件的贴图区域"""
+        return [widget.draw(surface, player, game_state, self.font) for widget in self.active_widgets(game_state)]
+
+    def invalidate(self):
+        """强制所有控件重绘（如更换字体后）"""
+        for widget in self.widgets:
+            widget.invalidate()
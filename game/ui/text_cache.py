@@ -0,0 +1,59 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """文字渲染缓存
+
+    按 (字体, 文字, 抗锯齿, 颜色, 背景色) 缓存 font.render 的结果，按LRU淘汰，
+    并统计缓存Surface占用的内存。界面上大部分文字每帧都一样，中文字形的光栅化
+    开销较大，命中缓存后只需一次字典查询。缓存的Surface是共享的，调用方不要修改它。
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, max_entries=2048):
+        self.max_bytes = max_bytes  # 缓存Surface总内存上限（字节）
+        self.max_entries = max_entries  # 缓存条目上限
+        self.entries = OrderedDict()  # 键 -> (Surface, 字节数)
+        self.memory = 0  # 当前缓存Surface占用的字节数
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def render(self, font, text, antialias, color, background=None):
+        """与 font.render 参数相同，返回缓存的文字Surface"""
+        key = (font, text, antialias, tuple(color), tuple(background) if background is not None else None)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        if background is None:
+            surface = font.render(text, antialias, color)
+        else:
+            surface = font.render(text, antialias, color, background)
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self.entries[key] = (surface, size)
+        self.memory += size
+
+        # 超出上限时淘汰最久未使用的条目（至少保留刚渲染的这一条）
+        while len(self.entries) > 1 and (self.memory > self.max_bytes or len(self.entries) > self.max_entries):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.memory -= evicted_size
+        return surface
+
+    def clear(self):
+        """清空缓存"""
+        self.entries.clear()
+        self.memory = 0
+
+
+# 所有界面绘制共用的文字缓存
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, antialias, color, background=None):
+    """通过共享缓存渲染文字，参数与 font.render 相同"""
+    return TEXT_CACHE.render(font, text, antialias, color, background)
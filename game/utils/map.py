@@ -1,4 +1,11 @@
 import pygame
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pathfinding import FlowField, PathFinder
 
 class GameMap:
     """带碰撞检测的游戏地图"""
@@ -7,8 +14,23 @@ class GameMap:
     HEIGHT = 18
 
     def __init__(self):
+        # 地图版本号，地块改变时递增，供寻路等缓存判断是否过期
+        self.version = 0
+        # 预渲染的静态地图层，首次绘制时生成，地图格子改变时失效
+        self._map_surface = None
+        # 可放置位置索引：(宽, 高, 是否远离墙体) -> 网格中心坐标列表
+        self._spawn_cells = {}
+        # 同样的键 -> 每个可放置位置可随机偏移的范围
+        self._spawn_offsets = {}
         # 创建地图: 0-可走，1-墙体
         self.grid = self.create_map()
+        # 连续的可走性网格（按行展开，1-墙体），供碰撞检测快速查询
+        self.walls = bytearray()
+        self.rebuild_walkability()
+        # 追击玩家共用的流场
+        self.flow_field = FlowField(self)
+        # 点到点寻路服务（巡逻、返回岗位）
+        self.pathfinder = PathFinder(self)
         
     def create_map(self):
         """创建地图布局"""
@@ -65,8 +87,39 @@ class GameMap:
         # 房间门口
         grid[self.HEIGHT-5][self.WIDTH-9] = 0
 
+    def set_tile(self, grid_x, grid_y, tile):
+        """修改指定网格的地块类型，并使缓存失效"""
+        if self.grid[grid_y][grid_x] == tile:
+            return
+        self.grid[grid_y][grid_x] = tile
+        self.walls[grid_y * self.WIDTH + grid_x] = 1 if tile == 1 else 0
+        self.invalidate_cache()
+
+    def rebuild_walkability(self):
+        """根据grid重建可走性网格"""
+        self.walls = bytearray(1 if tile == 1 else 0 for row in self.grid for tile in row)
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """使预渲染的地图层、可放置位置索引和寻路结果失效"""
+        self.version += 1
+        self._map_surface = None
+        self._spawn_cells.clear()
+        self._spawn_offsets.clear()
+
+    def get_map_surface(self):
+        """获取预渲染的地图层"""
+        if self._map_surface is None:
+            self._map_surface = pygame.Surface((self.WIDTH * self.TILE_SIZE, self.HEIGHT * self.TILE_SIZE))
+            self._render_tiles(self._map_surface)
+        return self._map_surface
+
     def draw(self, surface):
-        """绘制地图"""
+        """绘制地图（直接贴上预渲染的地图层）"""
+        surface.blit(self.get_map_surface(), (0, 0))
+
+    def _render_tiles(self, surface):
+        """逐格绘制地图，只在生成缓存时调用"""
         for y, row in enumerate(self.grid):
             for x, tile in enumerate(row):
                 rect = pygame.Rect(x*self.TILE_SIZE, y*self.TILE_SIZE, self.TILE_SIZE, self.TILE_SIZE)
@@ -86,23 +139,50 @@ class GameMap:
         if grid_x < 0 or grid_x >= self.WIDTH or grid_y < 0 or grid_y >= self.HEIGHT:
             return True  # 超出边界视为墙体
         
-        return self.grid[grid_y][grid_x] == 1
+        return self.walls[grid_y * self.WIDTH + grid_x] == 1
     
     def can_move_to(self, x, y, width=28, height=28):
         """检查实体是否可以移动到指定位置"""
-        # 检查实体四个角是否碰撞墙体
-        corners = [
-            (x - width//2, y - height//2),  # 左上
-            (x + width//2, y - height//2),  # 右上
-            (x - width//2, y + height//2),  # 左下
-            (x + width//2, y + height//2),  # 右下
-        ]
+        # 实体四个角所在的网格：左右两列、上下两行
+        tile = self.TILE_SIZE
+        left = int((x - width//2) // tile)
+        right = int((x + width//2) // tile)
+        top = int((y - height//2) // tile)
+        bottom = int((y + height//2) // tile)
         
-        for corner_x, corner_y in corners:
-            if self.is_wall(corner_x, corner_y):
-                return False
+        # 超出边界视为墙体
+        if left < 0 or top < 0 or right >= self.WIDTH or bottom >= self.HEIGHT:
+            return False
         
-        return True
+        walls = self.walls
+        top_row = top * self.WIDTH
+        bottom_row = bottom * self.WIDTH
+        return not (walls[top_row + left] or walls[top_row + right] or
+                    walls[bottom_row + left] or walls[bottom_row + right])
+    
+    def can_move_to_many(self, xs, ys, width=28, height=28):
+        """批量检查多个候选位置，返回与输入顺序对应的布尔值列表"""
+        tile = self.TILE_SIZE
+        map_width = self.WIDTH
+        map_height = self.HEIGHT
+        walls = self.walls
+        half_w = width // 2
+        half_h = height // 2
+        
+        results = []
+        for x, y in zip(xs, ys):
+            left = int((x - half_w) // tile)
+            right = int((x + half_w) // tile)
+            top = int((y - half_h) // tile)
+            bottom = int((y + half_h) // tile)
+            if left < 0 or top < 0 or right >= map_width or bottom >= map_height:
+                results.append(False)
+                continue
+            top_row = top * map_width
+            bottom_row = bottom * map_width
+            results.append(not (walls[top_row + left] or walls[top_row + right] or
+                                walls[bottom_row + left] or walls[bottom_row + right]))
+        return results
     
     def get_wall_rect(self, grid_x, grid_y):
         """获取指定网格坐标的墙体矩形"""
@@ -120,22 +200,78 @@ class GameMap:
                     wall_rects.append(self.get_wall_rect(x, y))
         return wall_rects
     
-    def find_safe_position(self, start_x, start_y, width=28, height=28):
-        """找到一个安全的生成位置（不与墙体碰撞）"""
+    def get_spawn_cells(self, width=28, height=28, avoid_walls=False):
+        """获取能容纳指定尺寸实体的所有网格中心坐标（按尺寸缓存）"""
+        key = (width, height, avoid_walls)
+        cells = self._spawn_cells.get(key)
+        if cells is None:
+            half = self.TILE_SIZE // 2
+            centers = [(x * self.TILE_SIZE + half, y * self.TILE_SIZE + half)
+                       for y in range(self.HEIGHT) for x in range(self.WIDTH)]
+            fits = self.can_move_to_many([c[0] for c in centers], [c[1] for c in centers], width, height)
+            cells = [center for center, ok in zip(centers, fits)
+                     if ok and not (avoid_walls and self.is_position_near_walls(*center))]
+            self._spawn_cells[key] = cells
+        return cells
+    
+    def get_spawn_offsets(self, width=28, height=28, avoid_walls=False):
+        """每个可放置位置（顺序与 get_spawn_cells 相同）可随机偏移的范围 (左, 右, 上, 下)
+
+        偏移后实体中心仍在同一格子内且不碰墙。先沿四个方向分别找到最远的偏移，
+        对角有墙时再收缩到四个角都可放置；墙体在偏移范围内不可能不碰到任何一个角，
+        所以四个角可放置时整个范围都可放置。
+        """
+        key = (width, height, avoid_walls)
+        offsets = self._spawn_offsets.get(key)
+        if offsets is None:
+            half = self.TILE_SIZE // 2
+            fits = self.can_move_to
+            offsets = []
+            for cx, cy in self.get_spawn_cells(width, height, avoid_walls):
+                extent = []
+                # 中心在格子内的偏移范围是 [-half, half - 1]
+                for step_x, step_y, limit in ((-1, 0, half), (1, 0, half - 1), (0, -1, half), (0, 1, half - 1)):
+                    d = 0
+                    while d < limit and fits(cx + (d + 1) * step_x, cy + (d + 1) * step_y, width, height):
+                        d += 1
+                    extent.append(d)
+                left, right, up, down = extent
+                while True:
+                    corner = next(((sx, sy) for sx in (-1, 1) for sy in (-1, 1)
+                                   if not fits(cx + (right if sx > 0 else -left), cy + (down if sy > 0 else -up),
+                                               width, height)), None)
+                    if corner is None:
+                        break
+                    # 收缩该角上较长的一边
+                    sx, sy = corner
+                    if (right if sx > 0 else left) >= (down if sy > 0 else up):
+                        if sx > 0:
+                            right -= 1
+                        else:
+                            left -= 1
+                    elif sy > 0:
+                        down -= 1
+                    else:
+                        up -= 1
+                offsets.append((left, right, up, down))
+            self._spawn_offsets[key] = offsets
+        return offsets
+
+    def find_safe_position(self, width=28, height=28, avoid_walls=False):
+        """随机找到一个安全的生成位置（不与墙体碰撞）
+
+        先随机选一个可放置的格子，再在格子内的空闲范围中随机偏移，
+        地图拥挤时生成的实体也不会完全重叠在格子中心。
+        """
         import random
         
-        # 尝试100次找到安全位置
-        for _ in range(100):
-            x = random.randint(width//2 + self.TILE_SIZE, 
-                             self.WIDTH * self.TILE_SIZE - width//2 - self.TILE_SIZE)
-            y = random.randint(height//2 + self.TILE_SIZE, 
-                             self.HEIGHT * self.TILE_SIZE - height//2 - self.TILE_SIZE)
-            
-            if self.can_move_to(x, y, width, height):
-                return x, y
-        
-        # 如果找不到安全位置，返回中心位置
-        return self.WIDTH * self.TILE_SIZE // 2, self.HEIGHT * self.TILE_SIZE // 2
+        cells = self.get_spawn_cells(width, height, avoid_walls)
+        if not cells:
+            raise ValueError(f"地图上没有可容纳 {width}x{height} 实体的位置")
+        index = random.randrange(len(cells))
+        x, y = cells[index]
+        left, right, up, down = self.get_spawn_offsets(width, height, avoid_walls)[index]
+        return x + random.randint(-left, right), y + random.randint(-up, down)
     
     def is_position_near_walls(self, x, y):
         """检查位置是否离墙体太近"""
@@ -0,0 +1,186 @@
+import heapq
+from collections import OrderedDict, deque
+
+
+class FlowField:
+    """流场寻路
+
+    以目标所在格子为起点在地图网格上做一次BFS，记录每个格子通往目标的下一格。
+    所有追击同一目标的敌人共用这一份结果，每个敌人查询下一步只需O(1)；
+    只有目标换了格子或地图改变时才重新计算。
+    """
+
+    def __init__(self, game_map):
+        self.game_map = game_map
+        self.target_cell = None  # 目标所在格子 (格子x, 格子y)
+        self.map_version = -1  # 计算时的地图版本
+        self.next_cell = []  # 格子索引 -> 通往目标的下一格索引，-1表示目标本身或不可达
+        self.distance = []  # 格子索引 -> 到目标的步数，-1表示不可达
+
+    def update(self, target_x, target_y):
+        """目标换格子或地图改变时重新计算，返回是否重新计算"""
+        tile = self.game_map.TILE_SIZE
+        target_cell = (int(target_x // tile), int(target_y // tile))
+        if target_cell == self.target_cell and self.map_version == self.game_map.version:
+            return False
+        self.target_cell = target_cell
+        self.map_version = self.game_map.version
+        self.compute()
+        return True
+
+    def compute(self):
+        """从目标格子出发做BFS（四方向）"""
+        game_map = self.game_map
+        width, height = game_map.WIDTH, game_map.HEIGHT
+        walls = game_map.walls
+        size = width * height
+        next_cell = [-1] * size
+        distance = [-1] * size
+        self.next_cell = next_cell
+        self.distance = distance
+
+        target_x, target_y = self.target_cell
+        if not (0 <= target_x < width and 0 <= target_y < height):
+            return
+        start = target_y * width + target_x
+        if walls[start]:
+            return
+
+        distance[start] = 0
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            step = distance[cell] + 1
+            cell_x = cell % width
+            neighbors = []
+            if cell_x > 0:
+                neighbors.append(cell - 1)
+            if cell_x < width - 1:
+                neighbors.append(cell + 1)
+            if cell >= width:
+                neighbors.append(cell - width)
+            if cell + width < size:
+                neighbors.append(cell + width)
+            for neighbor in neighbors:
+                if distance[neighbor] < 0 and not walls[neighbor]:
+                    distance[neighbor] = step
+                    next_cell[neighbor] = cell
+                    queue.append(neighbor)
+
+    def next_step(self, x, y):
+        """获取从像素坐标出发的下一个路点（下一格的中心），已在目标格或不可达时返回None"""
+        game_map = self.game_map
+        tile = game_map.TILE_SIZE
+        grid_x = int(x // tile)
+        grid_y = int(y // tile)
+        if not (0 <= grid_x < game_map.WIDTH and 0 <= grid_y < game_map.HEIGHT) or not self.next_cell:
+            return None
+        cell = self.next_cell[grid_y * game_map.WIDTH + grid_x]
+        if cell < 0:
+            return None
+        return ((cell % game_map.WIDTH) * tile + tile // 2, (cell // game_map.WIDTH) * tile + tile // 2)
+
+
+class PathFinder:
+    """A*寻路服务
+
+    在地图网格上做点到点寻路（四方向，曼哈顿距离启发），结果按
+    (起点格子, 终点格子) 缓存在LRU里；地图改变时整个缓存失效。
+    """
+
+    def __init__(self, game_map, cache_size=256):
+        self.game_map = game_map
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # (起点格子, 终点格子) -> 路径元组或None
+        self.map_version = game_map.version
+        self.hits = 0
+        self.misses = 0
+
+    def cell_of(self, x, y):
+        """像素坐标所在的格子"""
+        tile = self.game_map.TILE_SIZE
+        return int(x // tile), int(y // tile)
+
+    def cell_center(self, cell):
+        """格子中心的像素坐标"""
+        tile = self.game_map.TILE_SIZE
+        return cell[0] * tile + tile // 2, cell[1] * tile + tile // 2
+
+    def find_path(self, start, goal):
+        """查找从start格子到goal格子的路径
+
+        返回不含起点、含终点的格子元组；起点即终点时返回空元组，不可达时返回None。
+        """
+        if self.map_version != self.game_map.version:
+            self.cache.clear()
+            self.map_version = self.game_map.version
+
+        key = (start, goal)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        self.misses += 1
+        path = self._search(start, goal)
+        self.cache[key] = path
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return path
+
+    def _search(self, start, goal):
+        """A*搜索"""
+        game_map = self.game_map
+        width, height = game_map.WIDTH, game_map.HEIGHT
+        walls = game_map.walls
+
+        for cell_x, cell_y in (start, goal):
+            if not (0 <= cell_x < width and 0 <= cell_y < height):
+                return None
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        if walls[goal_index]:
+            return None
+        if start_index == goal_index:
+            return ()
+
+        goal_x, goal_y = goal
+        came_from = {start_index: -1}
+        cost = {start_index: 0}
+        open_heap = [(0, 0, start_index)]
+        while open_heap:
+            _, current_cost, cell = heapq.heappop(open_heap)
+            if cell == goal_index:
+                break
+            if current_cost > cost[cell]:
+                continue  # 已有更短的路径
+
+            cell_x = cell % width
+            neighbors = []
+            if cell_x > 0:
+                neighbors.append(cell - 1)
+            if cell_x < width - 1:
+                neighbors.append(cell + 1)
+            if cell >= width:
+                neighbors.append(cell - width)
+            if cell + width < width * height:
+                neighbors.append(cell + width)
+
+            next_cost = current_cost + 1
+            for neighbor in neighbors:
+                if walls[neighbor] or next_cost >= cost.get(neighbor, next_cost + 1):
+                    continue
+                cost[neighbor] = next_cost
+                came_from[neighbor] = cell
+                estimate = abs(neighbor % width - goal_x) + abs(neighbor // width - goal_y)
+                heapq.heappush(open_heap, (next_cost + estimate, next_cost, neighbor))
+        else:
+            return None
+
+        path = []
+        cell = goal_index
+        while cell != start_index:
+            path.append((cell % width, cell // width))
+            cell = came_from[cell]
+        path.reverse()
+        return tuple(path)
@@ -0,0 +1,50 @@
+class ObjectPool:
+    """对象池
+
+    释放的对象放入空闲列表，下次取用时重新初始化后复用，而不是新建对象。
+    默认通过再次调用 __init__ 重新初始化（使用 __slots__ 的实体会重设所有属性）；
+    字典等对象可以传入 reset，例如 ObjectPool(dict, dict.update)。
+    对象释放后调用方不能再持有或使用它。
+    """
+
+    def __init__(self, factory, reset=None, max_free=1024):
+        self.factory = factory  # 新建对象：factory(*args, **kwargs)
+        self.reset = reset  # 复用对象：reset(对象, *args, **kwargs)，None为调用 __init__
+        self.max_free = max_free  # 空闲列表最多保留的对象数
+        self.free = []
+        self.created = 0  # 新建的对象数
+        self.reused = 0  # 复用的对象数
+
+    def __len__(self):
+        return len(self.free)
+
+    def acquire(self, *args, **kwargs):
+        """取出一个对象并用参数初始化"""
+        if self.free:
+            obj = self.free.pop()
+            if self.reset is None:
+                obj.__init__(*args, **kwargs)
+            else:
+                self.reset(obj, *args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.factory(*args, **kwargs)
+
+    def release(self, obj):
+        """归还对象"""
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def clear(self):
+        """清空空闲列表"""
+        self.free.clear()
+
+
+def swap_remove(items, index):
+    """O(1) 删除列表中第index个元素：用最后一个元素填补空位，返回填补过来的元素（没有时为None）"""
+    last = items.pop()
+    if index < len(items):
+        items[index] = last
+        return last
+    return None
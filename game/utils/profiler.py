@@ -0,0 +1,138 @@
+import csv
+import os
+import sys
+import time
+from collections import deque
+
+import pygame
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.text_cache import render_text
+
+
+class _Section:
+    """计时区段，退出时把耗时记入分析器"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class _NullSection:
+    """分析器关闭时使用的空区段，不做任何计时"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class FrameProfiler:
+    """逐帧分段性能分析器
+
+    用 perf_counter_ns 记录每个阶段的耗时，保留最近 window 个样本计算滚动百分位
+    （p50/p95/p99），可以绘制成叠加层或导出为CSV。关闭时 section() 直接返回共享的
+    空区段，开销只有一次属性判断。
+    """
+
+    def __init__(self, enabled=False, window=300, refresh_frames=30):
+        self.enabled = enabled
+        self.window = window  # 每个阶段保留的样本数
+        self.refresh_frames = refresh_frames  # 叠加层统计的刷新间隔（帧）
+        self.samples = {}  # 阶段名 -> 最近的耗时样本（纳秒）
+        self.overlay_visible = False
+        self._overlay_stats = []
+        self._frames_since_refresh = refresh_frames
+
+    def section(self, name):
+        """计时一个阶段：with profiler.section("update_game"): ..."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def record(self, name, duration_ns):
+        """记录一个样本"""
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(duration_ns)
+
+    def toggle(self):
+        """开关分析器和叠加层"""
+        self.enabled = not self.enabled
+        self.overlay_visible = self.enabled
+        self._frames_since_refresh = self.refresh_frames
+
+    @staticmethod
+    def _percentile(sorted_samples, percent):
+        """最近秩法求百分位"""
+        index = max(0, min(len(sorted_samples) - 1, int(round(percent / 100 * len(sorted_samples))) - 1))
+        return sorted_samples[index]
+
+    def stats(self):
+        """各阶段统计：[(阶段名, 样本数, 平均, p50, p95, p99)]，单位毫秒"""
+        result = []
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            result.append((
+                name,
+                len(ordered),
+                sum(ordered) / len(ordered) / 1e6,
+                self._percentile(ordered, 50) / 1e6,
+                self._percentile(ordered, 95) / 1e6,
+                self._percentile(ordered, 99) / 1e6,
+            ))
+        return result
+
+    def draw_overlay(self, surface, font, x=560, y=380):
+        """绘制统计叠加层（每 refresh_frames 帧刷新一次统计）"""
+        if not self.overlay_visible:
+            return
+        self._frames_since_refresh += 1
+        if self._frames_since_refresh >= self.refresh_frames:
+            self._overlay_stats = self.stats()
+            self._frames_since_refresh = 0
+
+        lines = ["stage        p50   p95   p99 ms"]
+        for name, _, _, p50, p95, p99 in self._overlay_stats:
+            lines.append(f"{name[:12]:<12}{p50:6.2f}{p95:6.2f}{p99:6.2f}")
+
+        line_height = font.get_linesize()
+        background = pygame.Surface((235, line_height * len(lines) + 10))
+        background.set_alpha(180)
+        background.fill((0, 0, 0))
+        surface.blit(background, (x, y))
+        for i, line in enumerate(lines):
+            text = render_text(font, line, True, (0, 255, 0))
+            surface.blit(text, (x + 5, y + 5 + i * line_height))
+
+    def dump_csv(self, path):
+        """把统计写入CSV，没有样本时不写文件，返回是否写入"""
+        stats = self.stats()
+        if not stats:
+            return False
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "samples", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+            for name, count, mean, p50, p95, p99 in stats:
+                writer.writerow([name, count, f"{mean:.4f}", f"{p50:.4f}", f"{p95:.4f}", f"{p99:.4f}"])
+        return True
@@ -0,0 +1,163 @@
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.map import GameMap
+
+
+class SpatialHash:
+    """均匀网格空间索引
+
+    按地图格子大小把对象的矩形分到若干格子里，查询时只检查相关格子中的对象，
+    代价与局部密度相关，而不是与对象总数相关。矩形使用 (x, y, w, h) 或 pygame.Rect，
+    点状对象（如投射物）按 1x1 的矩形登记。
+    """
+
+    def __init__(self, cell_size=GameMap.TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (格子x, 格子y) -> {对象id: 对象}
+        self.entries = {}  # 对象id -> (对象, 左, 上, 右, 下, 格子范围)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, obj):
+        return id(obj) in self.entries
+
+    def _cell_range(self, left, top, right, bottom):
+        """计算矩形覆盖的格子范围"""
+        size = self.cell_size
+        return (int(left // size), int(top // size),
+                int((right - 1) // size), int((bottom - 1) // size))
+
+    def insert(self, obj, rect):
+        """登记对象"""
+        left, top = rect[0], rect[1]
+        right, bottom = left + rect[2], top + rect[3]
+        cell_range = self._cell_range(left, top, right, bottom)
+        key = id(obj)
+        self.entries[key] = (obj, left, top, right, bottom, cell_range)
+
+        cells = self.cells
+        x0, y0, x1, y1 = cell_range
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = {}
+                bucket[key] = obj
+
+    def remove(self, obj):
+        """移除对象（未登记的对象忽略）"""
+        entry = self.entries.pop(id(obj), None)
+        if entry is None:
+            return
+        self._unlink(id(obj), entry[5])
+
+    def _unlink(self, key, cell_range):
+        """从格子中移除对象"""
+        cells = self.cells
+        x0, y0, x1, y1 = cell_range
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(key, None)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def update(self, obj, rect):
+        """对象移动后更新位置，格子不变时只更新矩形"""
+        key = id(obj)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.insert(obj, rect)
+            return
+
+        left, top = rect[0], rect[1]
+        right, bottom = left + rect[2], top + rect[3]
+        cell_range = self._cell_range(left, top, right, bottom)
+        if cell_range == entry[5]:
+            self.entries[key] = (obj, left, top, right, bottom, cell_range)
+            return
+
+        self._unlink(key, entry[5])
+        self.insert(obj, rect)
+
+    def clear(self):
+        """清空索引"""
+        self.cells.clear()
+        self.entries.clear()
+
+    def _candidates(self, left, top, right, bottom):
+        """收集矩形覆盖格子中的所有登记项（去重）"""
+        found = {}
+        cells = self.cells
+        entries = self.entries
+        x0, y0, x1, y1 = self._cell_range(left, top, right, bottom)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for key in bucket:
+                        if key not in found:
+                            found[key] = entries[key]
+        return found.values()
+
+    def query_rect(self, rect):
+        """查询与矩形相交的对象"""
+        left, top = rect[0], rect[1]
+        right, bottom = left + rect[2], top + rect[3]
+        return [entry[0] for entry in self._candidates(left, top, right, bottom)
+                if entry[1] < right and left < entry[3] and entry[2] < bottom and top < entry[4]]
+
+    def query_point(self, x, y):
+        """查询包含指定点的对象"""
+        return [entry[0] for entry in self._candidates(x, y, x + 1, y + 1)
+                if entry[1] <= x < entry[3] and entry[2] <= y < entry[4]]
+
+    def query_radius(self, x, y, radius):
+        """查询矩形与圆（圆心x, y，半径radius）相交的对象"""
+        result = []
+        radius_sq = radius * radius
+        for obj, left, top, right, bottom, _ in self._candidates(x - radius, y - radius, x + radius + 1, y + radius + 1):
+            # 矩形上离圆心最近的点
+            nearest_x = min(max(x, left), right)
+            nearest_y = min(max(y, top), bottom)
+            if (nearest_x - x) ** 2 + (nearest_y - y) ** 2 <= radius_sq:
+                result.append(obj)
+        return result
+
+    def any_within(self, x, y, radius):
+        """是否有对象的矩形与圆（圆心x, y，半径radius）相交，找到第一个就返回
+
+        结果与 bool(query_radius(x, y, radius)) 相同，但不收集候选项；先检查圆心所在的
+        格子，密集区域通常在这里就能找到。
+        """
+        cells = self.cells
+        entries = self.entries
+        radius_sq = radius * radius
+        size = self.cell_size
+        center = (int(x // size), int(y // size))
+
+        def hit(bucket):
+            for key in bucket:
+                _, left, top, right, bottom, _ = entries[key]
+                nearest_x = min(max(x, left), right)
+                nearest_y = min(max(y, top), bottom)
+                if (nearest_x - x) ** 2 + (nearest_y - y) ** 2 <= radius_sq:
+                    return True
+            return False
+
+        bucket = cells.get(center)
+        if bucket and hit(bucket):
+            return True
+        x0, y0, x1, y1 = self._cell_range(x - radius, y - radius, x + radius + 1, y + radius + 1)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket and (cx, cy) != center and hit(bucket):
+                    return True
+        return False